@@ -1,4 +1,5 @@
 import os
+import sqlite3
 from database.setup import create_tables
 from models.article import Article
 from models.author import Author
@@ -11,6 +12,32 @@ def clear_terminal():
     """
     os.system('cls' if os.name == 'nt' else 'clear')
 
+def print_all_records():
+    """
+    Print every author, magazine and article, then the contributing authors
+    of each magazine, using a fixed number of queries.
+    """
+    print("\nAuthors:")
+    for author in Author.fetch_all():
+        print(author)
+
+    print("\nMagazines:")
+    magazines = Magazine.fetch_all()
+    for magazine in magazines:
+        print(magazine)
+
+    print("\nArticles:")
+    for article in Article.fetch_all(defer=("content",)):
+        print(article)
+
+    # Example of Aggregate Method: Contributing Authors
+    print("\nContributing Authors (Authors with more than 2 articles):")
+    names = {magazine.id: magazine.name for magazine in magazines}
+    for magazine_id, contributors in Magazine.contributing_authors_for_all(min_articles=3).items():
+        print(f"Magazine: {names[magazine_id]}")
+        for contributor in contributors:
+            print(contributor)
+
 def main():
     create_tables()
 
@@ -34,11 +61,8 @@ def main():
             article_title = input("Enter article title: ")
             article_content = input("Enter article content: ")
 
-            author = Author(None, author_name)
-            author.save_to_db()
-
-            magazine = Magazine(None, magazine_name, magazine_category)
-            magazine.save_to_db()
+            author = Author.get_or_create(author_name)
+            magazine = Magazine.get_or_create(magazine_name, magazine_category)
 
             article = Article(None, article_title, article_content, author.id, magazine.id)
             article.save_to_db()
@@ -86,8 +110,12 @@ def main():
                         new_category = input("Enter new category for the magazine: ")
                         magazine.name = new_name
                         magazine.category = new_category
-                    magazine.update_to_db()
-                    print("Magazine updated successfully.")
+                    try:
+                        magazine.update_to_db()
+                    except sqlite3.IntegrityError:
+                        print("A magazine with that name already exists.")
+                    else:
+                        print("Magazine updated successfully.")
                 else:
                     print("Magazine not found.")
 
@@ -118,7 +146,8 @@ def main():
                 record_id = int(input("Enter Author ID: "))
                 author = Author.fetch_by_id(record_id)
                 if author:
-                    author.delete_from_db()
+                    cascade = input("Also delete the author's articles? (y/n): ").strip().lower() == "y"
+                    author.delete_from_db(cascade=cascade)
                     print("Author deleted successfully.")
                 else:
                     print("Author not found.")
@@ -127,7 +156,8 @@ def main():
                 record_id = int(input("Enter Magazine ID: "))
                 magazine = Magazine.fetch_by_id(record_id)
                 if magazine:
-                    magazine.delete_from_db()
+                    cascade = input("Also delete the magazine's articles? (y/n): ").strip().lower() == "y"
+                    magazine.delete_from_db(cascade=cascade)
                     print("Magazine deleted successfully.")
                 else:
                     print("Magazine not found.")
@@ -144,27 +174,7 @@ def main():
 
         elif choice == "4":
             clear_terminal()
-            # View all records
-            print("\nAuthors:")
-            for author in Author.fetch_all():
-                print(author)
-
-            print("\nMagazines:")
-            for magazine in Magazine.fetch_all():
-                print(magazine)
-
-            print("\nArticles:")
-            for article in Article.fetch_all():
-                print(article)
-
-            # Example of Aggregate Method: Contributing Authors
-            print("\nContributing Authors (Authors with more than 2 articles):")
-            for magazine in Magazine.fetch_all():
-                contributors = magazine.contributing_authors()
-                if contributors:
-                    print(f"Magazine: {magazine.name}")
-                    for contributor in contributors:
-                        print(contributor)
+            print_all_records()
 
             input("Press Enter to continue...")
 
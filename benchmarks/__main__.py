@@ -0,0 +1,116 @@
+"""
+Generate a synthetic dataset, run the benchmark suite and write JSON results.
+
+Examples, from the repository root:
+
+    python -m benchmarks --articles 100000 --output results.json
+    python -m benchmarks --articles 100000 --compare results.json
+    python -m benchmarks --only "Magazine." --repeat 20
+"""
+import argparse
+import json
+import os
+import pathlib
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+
+import database.connection as db
+from benchmarks import suite
+from benchmarks.generator import generate
+from database.setup import create_tables
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=10000, help="articles to generate (default 10000)")
+    parser.add_argument("--authors", type=int, help="authors to generate (default scales with articles)")
+    parser.add_argument("--magazines", type=int, help="magazines to generate (default scales with articles)")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of authorship (default 1.1)")
+    parser.add_argument("--database",
+                        help="benchmark a copy of this database file instead of a generated one; the file is not modified")
+    parser.add_argument("--profile", default=db.PROFILE, choices=sorted(db.PROFILES))
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark (default 5)")
+    parser.add_argument("--only", help="run benchmarks whose name contains this text")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="print the change against a previous JSON results file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.database is not None and not os.path.isfile(args.database):
+        parser.error(f"--database: no such file: {args.database}")
+    return args
+
+def copy_database(source_path, target_path):
+    """
+    Copy a database, including pages still in its WAL, with the SQLite backup API.
+
+    The write benchmarks save, update and delete rows, so they run against
+    the copy and the original file is never modified.
+    """
+    source = sqlite3.connect(pathlib.Path(source_path).resolve().as_uri() + "?mode=ro", uri=True)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+def compare(results, baseline_path):
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)["results"]
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:45} {result['median_ms']:10.3f} ms   (new)")
+            continue
+        change = (result["median_ms"] - before["median_ms"]) / before["median_ms"] * 100 if before["median_ms"] else 0.0
+        print(f"{name:45} {before['median_ms']:10.3f} -> {result['median_ms']:10.3f} ms  {change:+7.1f}%")
+
+def main(argv=None):
+    args = parse_args(argv)
+    db.close_pool()
+    db.DATABASE_NAME = os.path.join(tempfile.mkdtemp(), "bench.db")
+    if args.database is not None:
+        copy_database(args.database, db.DATABASE_NAME)
+    db.PROFILE = args.profile
+    create_tables()
+
+    dataset = None
+    if args.database is None:
+        started = time.perf_counter()
+        dataset = generate(args.articles, args.authors, args.magazines, skew=args.skew, seed=args.seed)
+        elapsed = time.perf_counter() - started
+        print(f"Generated {dataset['articles']:,} articles in {elapsed:.1f}s ({dataset['articles'] / elapsed:,.0f} rows/s)")
+
+    names = [name for name in suite.BENCHMARKS if args.only is None or args.only in name]
+    results = suite.run(names, repeat=args.repeat, seed=args.seed)
+
+    if args.compare:
+        compare(results, args.compare)
+    else:
+        for name, result in results.items():
+            print(f"{name:45} median {result['median_ms']:10.3f} ms   min {result['min_ms']:10.3f} ms")
+
+    if args.output:
+        document = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "platform": platform.platform(),
+                "profile": args.profile,
+                "dataset": dataset,
+                "database": args.database,
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as handle:
+            json.dump(document, handle, indent=2)
+    db.close_pool()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Compare event-loop responsiveness of blocking model calls against the
+AsyncArticle facade while a 1 ms heartbeat task runs on the same loop.
+
+Run from the repository root: ``python -m benchmarks.async_concurrency``.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import database.connection as db
+from database.setup import create_tables
+from models.aio import AsyncArticle, shutdown
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+
+def seed(articles):
+    authors = Author.save_many([Author(None, f"Author {i}") for i in range(200)])
+    magazines = Magazine.save_many([Magazine(None, f"Mag {i}", "Tech") for i in range(50)])
+    body = " ".join(["lorem ipsum dolor"] * 20)
+    Article.save_many(
+        Article(None, f"Title {i}", f"{body} w{i % 1000}", authors[i % 200].id, magazines[i % 50].id)
+        for i in range(articles)
+    )
+
+async def heartbeat(stop, lags):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - started - 0.001)
+
+async def workload(calls, use_async):
+    stop = asyncio.Event()
+    lags = []
+    ticker = asyncio.create_task(heartbeat(stop, lags))
+    started = time.perf_counter()
+    if use_async:
+        await asyncio.gather(*(AsyncArticle.search("lorem AND ipsum", limit=5) for _ in range(calls)))
+    else:
+        for _ in range(calls):
+            Article.search("lorem AND ipsum", limit=5)
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    return elapsed, max(lags, default=0.0) * 1000, len(lags)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=100000)
+    parser.add_argument("--calls", type=int, default=40)
+    args = parser.parse_args()
+
+    db.DATABASE_NAME = os.path.join(tempfile.mkdtemp(), "bench.db")
+    create_tables()
+    seed(args.articles)
+    for use_async in (False, True):
+        elapsed, lag, ticks = asyncio.run(workload(args.calls, use_async))
+        print(
+            f"{'async' if use_async else 'sync ':5} {args.calls} searches: {elapsed:.2f}s, "
+            f"max loop lag {lag:.1f} ms, heartbeat ticks {ticks}"
+        )
+    shutdown()
+
+if __name__ == "__main__":
+    main()
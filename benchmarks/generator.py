@@ -0,0 +1,101 @@
+"""
+Synthetic authors, magazines and articles for benchmarks.
+
+Authors and magazines are picked with Zipf-like weights, so a few of each
+own most of the articles, as in real catalogues.
+"""
+import itertools
+import random
+
+from database.bulk import immediate_transaction
+from database.connection import db_connection
+
+CATEGORIES = ("Technology", "Science", "Art", "Politics", "Sports", "Travel", "Food", "Health")
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua python sqlite index cache query "
+    "magazine author article editor column review feature issue print digital"
+).split()
+CHUNK_SIZE = 50000
+
+def default_scale(articles):
+    """
+    Pick author and magazine counts that grow with the number of articles.
+
+    Returns:
+        tuple: ``(authors, magazines)``.
+    """
+    return max(10, articles // 20), max(5, min(5000, articles // 200))
+
+def zipf_weights(count, skew):
+    """
+    Cumulative weights for ``random.choices`` where rank ``r`` has weight ``1 / r ** skew``.
+    """
+    return list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, count + 1)))
+
+def generate(articles, authors=None, magazines=None, skew=1.1, content_words=60, seed=0):
+    """
+    Fill the current database with synthetic rows through bulk executemany.
+
+    Args:
+        articles (int): The number of articles to create (1k to 10M is typical).
+        authors (int): The number of authors; defaults to ``default_scale``.
+        magazines (int): The number of magazines; defaults to ``default_scale``.
+        skew (float): The Zipf exponent; 0 spreads articles evenly.
+        content_words (int): The mean number of words per article body.
+        seed (int): The random seed, so runs are reproducible.
+
+    Returns:
+        dict: The number of rows created per table.
+    """
+    default_authors, default_magazines = default_scale(articles)
+    authors = authors or default_authors
+    magazines = magazines or default_magazines
+    rng = random.Random(seed)
+    author_weights = zipf_weights(authors, skew)
+    magazine_weights = zipf_weights(magazines, skew)
+
+    with db_connection() as connection:
+        with immediate_transaction(connection):
+            # Names are unique; AUTOINCREMENT sequences never go back, so
+            # numbering from the highest one cannot reuse an earlier run's names.
+            offset = connection.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name IN ('authors', 'magazines')"
+            ).fetchone()[0]
+            connection.executemany(
+                "INSERT INTO authors (name) VALUES (?)",
+                ((f"Author {offset + i}",) for i in range(authors)),
+            )
+            first_author = _last_insert_id(connection) - authors + 1
+            connection.executemany(
+                "INSERT INTO magazines (name, category) VALUES (?, ?)",
+                ((f"Mag {offset + i}", CATEGORIES[i % len(CATEGORIES)]) for i in range(magazines)),
+            )
+            first_magazine = _last_insert_id(connection) - magazines + 1
+        created = 0
+        while created < articles:
+            size = min(CHUNK_SIZE, articles - created)
+            author_ids = rng.choices(range(first_author, first_author + authors), cum_weights=author_weights, k=size)
+            magazine_ids = rng.choices(
+                range(first_magazine, first_magazine + magazines), cum_weights=magazine_weights, k=size
+            )
+            rows = (
+                (
+                    f"Article {created + i} {rng.choice(WORDS)}",
+                    " ".join(rng.choices(WORDS, k=rng.randint(content_words // 2, content_words * 3 // 2))),
+                    author_ids[i],
+                    magazine_ids[i],
+                )
+                for i in range(size)
+            )
+            with immediate_transaction(connection):
+                connection.executemany(
+                    "INSERT INTO articles (title, content, author_id, magazine_id) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+            created += size
+    return {"authors": authors, "magazines": magazines, "articles": articles}
+
+def _last_insert_id(connection):
+    # Rows inserted inside one BEGIN IMMEDIATE transaction get contiguous ids.
+    return connection.execute("SELECT last_insert_rowid()").fetchone()[0]
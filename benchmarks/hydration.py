@@ -0,0 +1,83 @@
+"""
+Compare building model instances through ``__init__`` (with validation)
+against the ``from_row`` hydration path, on rows already in memory, and
+measure per-instance memory.
+
+Run from the repository root: ``python -m benchmarks.hydration``.
+"""
+import argparse
+import gc
+import sqlite3
+import time
+import tracemalloc
+
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+
+def article_rows(count):
+    """Build ``count`` article rows as ``sqlite3.Row`` objects, as a cursor returns them."""
+    connection = sqlite3.connect(":memory:")
+    connection.row_factory = sqlite3.Row
+    rows = connection.execute(
+        """
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        SELECT i AS id, 'Title ' || i AS title, 'Body of article ' || i AS content,
+               i % 500 + 1 AS author_id, i % 50 + 1 AS magazine_id
+        FROM n
+        """,
+        (count,),
+    ).fetchall()
+    connection.close()
+    return rows
+
+def timed(func, rows):
+    gc.collect()
+    started = time.perf_counter()
+    func(rows)
+    return time.perf_counter() - started
+
+def bytes_per_instance(func, rows):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = func(rows)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the instances is not part of their cost.
+    return (after - before - instances.__sizeof__()) / len(instances)
+
+def via_init(rows):
+    return [Article(row[0], row[1], row[2], row[3], row[4]) for row in rows]
+
+def via_from_row(rows):
+    return [Article.from_row(row) for row in rows]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="article rows to hydrate (default 1000000)")
+    parser.add_argument("--memory-rows", type=int, default=100_000,
+                        help="rows measured with tracemalloc (default 100000)")
+    args = parser.parse_args()
+
+    rows = article_rows(args.rows)
+    tuples = [tuple(row) for row in rows]
+    print(f"{args.rows:,} article rows")
+    for label, data in (("sqlite3.Row", rows), ("tuple", tuples)):
+        init = timed(via_init, data)
+        hydrated = timed(via_from_row, data)
+        print(
+            f"  {label:11}  Article(...) {init:6.2f}s   Article.from_row {hydrated:6.2f}s"
+            f"   ({(hydrated - init) / init * 100:+.0f}%)"
+        )
+    for label, func in (("Author", Author.from_row), ("Magazine", Magazine.from_row)):
+        data = [(i, f"Name {i}", "Technology") for i in range(1, args.rows + 1)]
+        print(f"  {label}.from_row {timed(lambda items: [func(item) for item in items], data):6.2f}s")
+
+    sample = rows[:args.memory_rows]
+    print(f"Memory per article over {len(sample):,} rows:")
+    print(f"  Article(...)      {bytes_per_instance(via_init, sample):7.0f} bytes")
+    print(f"  Article.from_row  {bytes_per_instance(via_from_row, sample):7.0f} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare the connection PRAGMA profiles on the model workloads: per-row
+inserts, bulk inserts, point reads and the View all records report.
+
+Run from the repository root: ``python -m benchmarks.profiles``.
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+import database.connection as db
+from app import print_all_records
+from database.setup import create_tables
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+
+def timed(func):
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+def use_profile(profile, path):
+    db.close_pool()
+    db.DATABASE_NAME = path
+    db.PROFILE = profile
+    for model in (Author, Magazine, Article):
+        model.identity_map.clear()
+
+def seed(articles):
+    """Create 500 authors, 50 magazines and ``articles`` articles."""
+    authors = Author.save_many([Author(None, f"Author {i}") for i in range(500)])
+    magazines = Magazine.save_many([Magazine(None, f"Mag {i}", "Tech") for i in range(50)])
+    Article.save_many(
+        Article(None, f"Title {i}", "lorem ipsum " * 40, authors[i % 500].id, magazines[i % 50].id)
+        for i in range(articles)
+    )
+
+def write_workloads(rows, author_id=1, magazine_id=1):
+    return {
+        "save_to_db rows/s": rows / timed(lambda: [
+            Article(None, f"Single {i}", "body", author_id, magazine_id).save_to_db()
+            for i in range(rows)
+        ]),
+        "save_many rows/s": rows * 20 / timed(lambda: Article.save_many(
+            Article(None, f"Bulk {i}", "body", author_id, magazine_id) for i in range(rows * 20)
+        )),
+    }
+
+def read_workloads(articles, reads):
+    ids = [random.randint(1, articles) for _ in range(reads)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = timed(print_all_records)
+    return {
+        "fetch_by_id reads/s": reads / timed(lambda: [Article.fetch_by_id(i) for i in ids]),
+        "report s": report,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=50000)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--reads", type=int, default=5000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    for profile in db.PROFILES:
+        path = os.path.join(workdir, f"{profile}.db")
+        use_profile("bulk-load", path)
+        create_tables()
+        seed(args.articles)
+        use_profile(profile, path)
+        results = {} if profile == "reporting" else write_workloads(args.rows)
+        use_profile(profile, path)
+        results.update(read_workloads(args.articles, args.reads))
+        print(f"{profile:10} " + "  ".join(f"{key}: {value:,.2f}" for key, value in results.items()))
+    db.close_pool()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+"""
+Benchmarks for every public model method and the View all records report.
+
+Each benchmark is a function taking a ``Context`` and doing one unit of
+work; ``run`` times it ``repeat`` times after a warm-up call.
+"""
+import contextlib
+import io
+import itertools
+import random
+import statistics
+import time
+from array import array
+
+from app import print_all_records
+from benchmarks.generator import CATEGORIES
+from database.change_log import changes_since, latest_seq
+from database.connection import db_connection
+from models.adjacency import AdjacencyIndex
+from models.analytics import ArticleSnapshot
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+
+BENCHMARKS = {}
+# Author and magazine names are unique, so every row a benchmark writes gets a fresh one.
+_serial = itertools.count()
+
+def benchmark(name):
+    """
+    Register a benchmark function under ``name``.
+    """
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+class Context:
+    """
+    Sampling helpers over the rows present when the suite starts.
+    """
+
+    def __init__(self, seed=0):
+        """
+        Read the IDs to sample from.
+
+        Raises:
+            ValueError: If the database has no authors, magazines or articles.
+        """
+        self.rng = random.Random(seed)
+        with db_connection() as connection:
+            self.author_ids = [row[0] for row in connection.execute("SELECT id FROM authors")]
+            self.magazine_ids = [row[0] for row in connection.execute("SELECT id FROM magazines")]
+            self.article_ids = array("q", (row[0] for row in connection.execute("SELECT id FROM articles")))
+        if not (self.author_ids and self.magazine_ids and self.article_ids):
+            raise ValueError("The benchmark database needs at least one author, magazine and article.")
+        # The generator gives the lowest ids the most articles.
+        self.hot_author = Author.fetch_by_id(self.author_ids[0])
+        self.hot_magazine = Magazine.fetch_by_id(self.magazine_ids[0])
+
+    def article_id(self):
+        return self.rng.choice(self.article_ids)
+
+    def author(self):
+        return Author.fetch_by_id(self.rng.choice(self.author_ids))
+
+    def magazine(self):
+        return Magazine.fetch_by_id(self.rng.choice(self.magazine_ids))
+
+    def article(self):
+        return Article.fetch_by_id(self.article_id())
+
+    def author_name(self):
+        return f"Benchmark Author {next(_serial)}"
+
+    def magazine_name(self):
+        return f"Bench {next(_serial)}"
+
+    def new_article(self):
+        return Article(None, "Benchmark article", "Benchmark body", self.hot_author.id, self.hot_magazine.id)
+
+
+def _cold(model):
+    model.identity_map.clear()
+
+def _author_with_articles(ctx, count):
+    author = Author(None, ctx.author_name())
+    author.save_to_db()
+    Article.save_many([
+        Article(None, "Benchmark article", "Benchmark body", author.id, ctx.hot_magazine.id) for _ in range(count)
+    ])
+    return author
+
+def _magazine_with_articles(ctx, count):
+    magazine = Magazine(None, ctx.magazine_name(), "Testing")
+    magazine.save_to_db()
+    Article.save_many([
+        Article(None, "Benchmark article", "Benchmark body", ctx.hot_author.id, magazine.id) for _ in range(count)
+    ])
+    return magazine
+
+# Author
+
+@benchmark("Author.save_to_db")
+def author_save(ctx):
+    Author(None, ctx.author_name()).save_to_db()
+
+@benchmark("Author.update_to_db (unchanged)")
+def author_update(ctx):
+    ctx.author().update_to_db()
+
+@benchmark("Author.fetch_all")
+def author_fetch_all(ctx):
+    Author.fetch_all()
+
+@benchmark("Author.iter_all")
+def author_iter_all(ctx):
+    for _ in Author.iter_all():
+        pass
+
+@benchmark("Author.fetch_page")
+def author_fetch_page(ctx):
+    Author.fetch_page(limit=50, order_by="name")
+
+@benchmark("Author.fetch_by_id (cold)")
+def author_fetch_by_id_cold(ctx):
+    _cold(Author)
+    Author.fetch_by_id(ctx.rng.choice(ctx.author_ids))
+
+@benchmark("Author.fetch_by_id (cached)")
+def author_fetch_by_id_cached(ctx):
+    Author.fetch_by_id(ctx.hot_author.id)
+
+@benchmark("Author.get_or_create (cached)")
+def author_get_or_create(ctx):
+    Author.get_or_create(ctx.hot_author.name)
+
+@benchmark("Author.fetch_many_by_ids")
+def author_fetch_many(ctx):
+    _cold(Author)
+    Author.fetch_many_by_ids(ctx.rng.sample(ctx.author_ids, min(100, len(ctx.author_ids))))
+
+@benchmark("Author.save_many/delete_many (100)")
+def author_save_delete_many(ctx):
+    authors = Author.save_many([Author(None, ctx.author_name()) for _ in range(100)])
+    Author.delete_many([author.id for author in authors])
+
+@benchmark("Author.update_many (100, unchanged)")
+def author_update_many(ctx):
+    _cold(Author)
+    Author.update_many(Author.fetch_many_by_ids(ctx.author_ids[:100]).values())
+
+@benchmark("Author.delete_from_db")
+def author_delete(ctx):
+    author = Author(None, ctx.author_name())
+    author.save_to_db()
+    author.delete_from_db()
+
+@benchmark("Author.delete_from_db (cascade, 10)")
+def author_delete_cascade(ctx):
+    _author_with_articles(ctx, 10).delete_from_db(cascade=True)
+
+@benchmark("Author.delete_many (100, cascade)")
+def author_delete_many_cascade(ctx):
+    authors = Author.save_many([Author(None, ctx.author_name()) for _ in range(100)])
+    Article.save_many([
+        Article(None, "Benchmark article", "Benchmark body", author.id, ctx.hot_magazine.id) for author in authors
+    ])
+    Author.delete_many([author.id for author in authors], cascade=True)
+
+@benchmark("Author.delete_where (cascade, 10)")
+def author_delete_where(ctx):
+    Author.delete_where(cascade=True, name=_author_with_articles(ctx, 10).name)
+
+@benchmark("Author.articles (hot)")
+def author_articles(ctx):
+    ctx.hot_author.articles(defer=("content",))
+
+@benchmark("Author.iter_articles (hot)")
+def author_iter_articles(ctx):
+    for _ in ctx.hot_author.iter_articles(defer=("content",)):
+        pass
+
+@benchmark("Author.articles_page (hot)")
+def author_articles_page(ctx):
+    ctx.hot_author.articles_page(limit=50)
+
+@benchmark("Author.article_count")
+def author_article_count(ctx):
+    ctx.author().article_count()
+
+@benchmark("Author.magazines")
+def author_magazines(ctx):
+    ctx.author().magazines()
+
+# Magazine
+
+@benchmark("Magazine.save_to_db")
+def magazine_save(ctx):
+    Magazine(None, ctx.magazine_name(), "Testing").save_to_db()
+
+@benchmark("Magazine.update_to_db")
+def magazine_update(ctx):
+    magazine = ctx.magazine()
+    magazine.category = ctx.rng.choice(CATEGORIES)
+    magazine.update_to_db()
+
+@benchmark("Magazine.fetch_all")
+def magazine_fetch_all(ctx):
+    Magazine.fetch_all()
+
+@benchmark("Magazine.iter_all")
+def magazine_iter_all(ctx):
+    for _ in Magazine.iter_all():
+        pass
+
+@benchmark("Magazine.fetch_page")
+def magazine_fetch_page(ctx):
+    Magazine.fetch_page(limit=50, order_by="name")
+
+@benchmark("Magazine.fetch_by_id (cold)")
+def magazine_fetch_by_id_cold(ctx):
+    _cold(Magazine)
+    Magazine.fetch_by_id(ctx.rng.choice(ctx.magazine_ids))
+
+@benchmark("Magazine.get_or_create (cached)")
+def magazine_get_or_create(ctx):
+    Magazine.get_or_create(ctx.hot_magazine.name, ctx.hot_magazine.category)
+
+@benchmark("Magazine.upsert")
+def magazine_upsert(ctx):
+    Magazine.upsert(ctx.hot_magazine.name, ctx.hot_magazine.category)
+
+@benchmark("Magazine.fetch_many_by_ids")
+def magazine_fetch_many(ctx):
+    _cold(Magazine)
+    Magazine.fetch_many_by_ids(ctx.magazine_ids[:100])
+
+@benchmark("Magazine.save_many/delete_many (100)")
+def magazine_save_delete_many(ctx):
+    magazines = Magazine.save_many([Magazine(None, ctx.magazine_name(), "Testing") for _ in range(100)])
+    Magazine.delete_many([magazine.id for magazine in magazines])
+
+@benchmark("Magazine.update_many (100)")
+def magazine_update_many(ctx):
+    _cold(Magazine)
+    magazines = Magazine.fetch_many_by_ids(ctx.magazine_ids[:100]).values()
+    for magazine in magazines:
+        magazine.category = ctx.rng.choice(CATEGORIES)
+    Magazine.update_many(magazines)
+
+@benchmark("Magazine.delete_from_db")
+def magazine_delete(ctx):
+    magazine = Magazine(None, ctx.magazine_name(), "Testing")
+    magazine.save_to_db()
+    magazine.delete_from_db()
+
+@benchmark("Magazine.delete_from_db (cascade, 10)")
+def magazine_delete_cascade(ctx):
+    _magazine_with_articles(ctx, 10).delete_from_db(cascade=True)
+
+@benchmark("Magazine.delete_many (100, cascade)")
+def magazine_delete_many_cascade(ctx):
+    magazines = Magazine.save_many([Magazine(None, ctx.magazine_name(), "Testing") for _ in range(100)])
+    Article.save_many([
+        Article(None, "Benchmark article", "Benchmark body", ctx.hot_author.id, magazine.id) for magazine in magazines
+    ])
+    Magazine.delete_many([magazine.id for magazine in magazines], cascade=True)
+
+@benchmark("Magazine.update_where (100)")
+def magazine_update_where(ctx):
+    Magazine.update_where({"category": ctx.rng.choice(CATEGORIES)}, id=ctx.magazine_ids[:100])
+
+@benchmark("Magazine.delete_where (cascade, 10)")
+def magazine_delete_where(ctx):
+    Magazine.delete_where(cascade=True, name=_magazine_with_articles(ctx, 10).name)
+
+@benchmark("Magazine.articles (hot)")
+def magazine_articles(ctx):
+    ctx.hot_magazine.articles(defer=("content",))
+
+@benchmark("Magazine.iter_articles (hot)")
+def magazine_iter_articles(ctx):
+    for _ in ctx.hot_magazine.iter_articles(defer=("content",)):
+        pass
+
+@benchmark("Magazine.articles_page (hot)")
+def magazine_articles_page(ctx):
+    ctx.hot_magazine.articles_page(limit=50, order_by="title")
+
+@benchmark("Magazine.article_count")
+def magazine_article_count(ctx):
+    ctx.magazine().article_count()
+
+@benchmark("Magazine.contributors (hot)")
+def magazine_contributors(ctx):
+    ctx.hot_magazine.contributors()
+
+@benchmark("Magazine.article_titles (hot)")
+def magazine_article_titles(ctx):
+    ctx.hot_magazine.article_titles()
+
+@benchmark("Magazine.contributing_authors (hot)")
+def magazine_contributing_authors(ctx):
+    ctx.hot_magazine.contributing_authors()
+
+@benchmark("Magazine.contributing_authors_for_all")
+def magazine_contributing_authors_for_all(ctx):
+    Magazine.contributing_authors_for_all(min_articles=3)
+
+# Article
+
+@benchmark("Article.save_to_db")
+def article_save(ctx):
+    ctx.new_article().save_to_db()
+
+@benchmark("Article.update_to_db (title)")
+def article_update(ctx):
+    article = ctx.article()
+    article.title = f"Benchmark title {next(_serial)}"
+    article.update_to_db()
+
+@benchmark("Article.update_to_db (unchanged)")
+def article_update_unchanged(ctx):
+    ctx.article().update_to_db()
+
+@benchmark("Article.delete_from_db")
+def article_delete(ctx):
+    article = ctx.new_article()
+    article.save_to_db()
+    article.delete_from_db()
+
+@benchmark("Article.fetch_all (defer content)")
+def article_fetch_all(ctx):
+    Article.fetch_all(defer=("content",))
+
+@benchmark("Article.iter_all")
+def article_iter_all(ctx):
+    for _ in Article.iter_all():
+        pass
+
+@benchmark("Article.fetch_page")
+def article_fetch_page(ctx):
+    Article.fetch_page(limit=50, order_by="title")
+
+@benchmark("Article.fetch_by_id (cold)")
+def article_fetch_by_id_cold(ctx):
+    _cold(Article)
+    Article.fetch_by_id(ctx.article_id())
+
+@benchmark("Article.save_many/delete_many (1000)")
+def article_save_delete_many(ctx):
+    articles = Article.save_many([ctx.new_article() for _ in range(1000)])
+    Article.delete_many([article.id for article in articles])
+
+@benchmark("Article.update_many (100)")
+def article_update_many(ctx):
+    _cold(Article)
+    articles = [ctx.article() for _ in range(100)]
+    for article in articles:
+        article.magazine_id = ctx.rng.choice(ctx.magazine_ids)
+    Article.update_many(articles)
+
+@benchmark("Article.update_where (one author's articles)")
+def article_update_where(ctx):
+    Article.update_where({"magazine_id": ctx.rng.choice(ctx.magazine_ids)}, author_id=ctx.rng.choice(ctx.author_ids))
+
+@benchmark("Article.delete_where (100)")
+def article_delete_where(ctx):
+    author = _author_with_articles(ctx, 100)
+    Article.delete_where(author_id=author.id)
+    author.delete_from_db()
+
+@benchmark("Article.search")
+def article_search(ctx):
+    Article.search("python AND sqlite", limit=20)
+
+@benchmark("Article.author/magazine")
+def article_relations(ctx):
+    article = ctx.article()
+    article.author
+    article.magazine
+
+@benchmark("Article.prefetch (page of 50)")
+def article_prefetch(ctx):
+    _cold(Author)
+    _cold(Magazine)
+    articles, _ = Article.fetch_page(limit=50)
+    Article.prefetch(articles, ("author", "magazine"))
+
+# Analytics
+
+@benchmark("ArticleSnapshot.load")
+def snapshot_load(ctx):
+    ArticleSnapshot.load()
+
+@benchmark("ArticleSnapshot contributor/magazine counts")
+def snapshot_counts(ctx):
+    snapshot = ArticleSnapshot.load()
+    snapshot.contributor_counts()
+    snapshot.magazine_counts()
+    snapshot.authors_with_more_than(2)
+
+@benchmark("AdjacencyIndex.load")
+def adjacency_load(ctx):
+    AdjacencyIndex.load()
+
+@benchmark("AdjacencyIndex.reachable (2 hops)")
+def adjacency_reachable(ctx):
+    AdjacencyIndex.load().reachable([ctx.author().id], hops=2)
+
+@benchmark("AdjacencyIndex.most_similar")
+def adjacency_most_similar(ctx):
+    AdjacencyIndex.load().most_similar([ctx.author().id], metric="cosine")
+
+@benchmark("change_log.changes_since (1000)")
+def change_log_read(ctx):
+    changes_since(max(latest_seq() - 1000, 0))
+
+# app.py
+
+@benchmark("app.print_all_records")
+def app_report(ctx):
+    with contextlib.redirect_stdout(io.StringIO()):
+        print_all_records()
+
+
+def run(names=None, repeat=5, seed=0):
+    """
+    Time the selected benchmarks.
+
+    Args:
+        names (iterable): Benchmark names to run, or None for all of them.
+        repeat (int): Timed calls per benchmark, after one warm-up call.
+        seed (int): The random seed for sampled ids.
+
+    Returns:
+        dict: A mapping of benchmark name to its timing summary in milliseconds.
+    """
+    ctx = Context(seed)
+    results = {}
+    for name in names or BENCHMARKS:
+        func = BENCHMARKS[name]
+        func(ctx)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func(ctx)
+            timings.append((time.perf_counter() - started) * 1000)
+        results[name] = {
+            "runs": repeat,
+            "min_ms": min(timings),
+            "median_ms": statistics.median(timings),
+            "mean_ms": statistics.mean(timings),
+        }
+    return results
@@ -0,0 +1,223 @@
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+
+from .connection import db_connection
+
+DEFAULT_CHUNK_SIZE = 500
+# SQLite builds before 3.32 cap bound parameters per statement at 999.
+MAX_VARIABLES = 999
+
+def chunked(iterable, size):
+    """
+    Split an iterable into lists of at most ``size`` items.
+
+    Args:
+        iterable: The items to split.
+        size (int): The maximum length of each chunk.
+
+    Yields:
+        list: The next chunk of items.
+    """
+    if not isinstance(size, int) or size < 1:
+        raise ValueError("Chunk size must be a positive integer.")
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def insert_many(table, columns, rows):
+    """
+    Insert rows with ``executemany`` inside a single transaction.
+
+    The transaction is opened with ``BEGIN IMMEDIATE`` so no other writer can
+    interleave, which makes the AUTOINCREMENT ids of the batch contiguous and
+    lets them be recovered from ``last_insert_rowid()``.
+
+    Args:
+        table (str): The table to insert into.
+        columns (tuple): The column names, in the order of each row.
+        rows (list): Tuples of column values.
+
+    Returns:
+        list: The new row ids, in input order.
+    """
+    if not rows:
+        return []
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        table, ", ".join(columns), ", ".join("?" for _ in columns)
+    )
+    with db_connection() as connection:
+        with immediate_transaction(connection):
+            connection.executemany(sql, rows)
+            last_id = connection.execute("SELECT last_insert_rowid()").fetchone()[0]
+    return list(range(last_id - len(rows) + 1, last_id + 1))
+
+def execute_many(sql, rows, cascade=False):
+    """
+    Run a parameterised UPDATE or DELETE with ``executemany`` inside a single transaction.
+
+    Args:
+        sql (str): The statement to run.
+        rows (list): Parameter tuples for the statement.
+        cascade (bool): Enforce foreign keys, so ``ON DELETE CASCADE`` removes child rows.
+
+    Returns:
+        int: The number of rows changed, not counting cascaded child rows.
+    """
+    if not rows:
+        return 0
+    with db_connection() as connection:
+        with foreign_keys(connection) if cascade else nullcontext():
+            with immediate_transaction(connection):
+                cursor = connection.executemany(sql, rows)
+    return cursor.rowcount
+
+def compile_where(columns, conditions):
+    """
+    Compile ``column=value`` conditions into an SQL ``WHERE`` clause, ANDed together.
+
+    A list, tuple or set matches any of its values, None matches NULL and
+    any other value matches by equality.
+
+    Args:
+        columns (tuple): The columns that may be filtered on.
+        conditions (dict): A mapping of column to the value to match.
+
+    Returns:
+        tuple: The clause and its parameters.
+
+    Raises:
+        ValueError: If there are no conditions, a column is unknown or a list is too long.
+    """
+    if not conditions:
+        raise ValueError("At least one condition is required.")
+    clauses = []
+    params = []
+    for column, value in conditions.items():
+        if column not in columns:
+            raise ValueError(f"Cannot filter on {column!r}; choose from {', '.join(columns)}.")
+        if value is None:
+            clauses.append(f"{column} IS NULL")
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            values = list(dict.fromkeys(value))
+            if len(values) > MAX_VARIABLES:
+                raise ValueError(f"At most {MAX_VARIABLES} values can be matched per column.")
+            clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    return " AND ".join(clauses), params
+
+def update_where(table, columns, values, conditions):
+    """
+    Set columns on every row matching the conditions with a single UPDATE.
+
+    Args:
+        table (str): The table to update.
+        columns (tuple): The table's columns; ``id`` may be filtered on but not set.
+        values (dict): A mapping of column to its new value.
+        conditions (dict): The filters, as for ``compile_where``.
+
+    Returns:
+        int: The number of rows updated.
+
+    Raises:
+        ValueError: If there is nothing to set, a column is unknown or the conditions are invalid.
+    """
+    if not values:
+        raise ValueError("At least one column must be set.")
+    for column in values:
+        if column not in columns or column == "id":
+            raise ValueError(f"Cannot set {column!r}; choose from {', '.join(columns[1:])}.")
+    where, params = compile_where(columns, conditions)
+    sql = "UPDATE {} SET {} WHERE {}".format(table, ", ".join(f"{column} = ?" for column in values), where)
+    with db_connection() as connection:
+        with immediate_transaction(connection):
+            cursor = connection.execute(sql, list(values.values()) + params)
+    return cursor.rowcount
+
+def delete_where(table, columns, conditions, cascade=False):
+    """
+    Delete every row matching the conditions with a single DELETE.
+
+    Args:
+        table (str): The table to delete from.
+        columns (tuple): The columns that may be filtered on.
+        conditions (dict): The filters, as for ``compile_where``.
+        cascade (bool): Enforce foreign keys, so ``ON DELETE CASCADE`` removes child rows.
+
+    Returns:
+        int: The number of rows deleted, not counting cascaded child rows.
+
+    Raises:
+        ValueError: If the conditions are invalid.
+    """
+    where, params = compile_where(columns, conditions)
+    with db_connection() as connection:
+        with foreign_keys(connection) if cascade else nullcontext():
+            with immediate_transaction(connection):
+                cursor = connection.execute(f"DELETE FROM {table} WHERE {where}", params)
+    return cursor.rowcount
+
+def select_in(sql, ids):
+    """
+    Run a SELECT with an ``IN (...)`` list, one query per parameter-limit chunk.
+
+    Args:
+        sql (str): A statement with a single ``{}`` placeholder for the ``IN`` list.
+        ids (iterable): The values to match; duplicates are sent once.
+
+    Returns:
+        list: The rows of every chunk.
+    """
+    rows = []
+    unique_ids = list(dict.fromkeys(ids))
+    with db_connection() as connection:
+        for chunk in chunked(unique_ids, MAX_VARIABLES):
+            placeholders = ", ".join("?" for _ in chunk)
+            rows.extend(connection.execute(sql.format(placeholders), chunk).fetchall())
+    return rows
+
+
+@contextmanager
+def immediate_transaction(connection):
+    """
+    Run a block inside ``BEGIN IMMEDIATE``; commit on success, roll back on error.
+
+    Args:
+        connection (sqlite3.Connection): The connection to write through.
+    """
+    if connection.in_transaction:
+        connection.commit()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield connection
+    except BaseException:
+        connection.rollback()
+        raise
+    connection.commit()
+
+@contextmanager
+def foreign_keys(connection):
+    """
+    Enforce foreign keys on a connection inside the block, then restore the previous setting.
+
+    SQLite ignores ``PRAGMA foreign_keys`` inside a transaction, so any open
+    transaction is committed first and the block must open its own.
+
+    Args:
+        connection (sqlite3.Connection): The connection to write through.
+    """
+    if connection.in_transaction:
+        connection.commit()
+    previous = connection.execute("PRAGMA foreign_keys").fetchone()[0]
+    connection.execute("PRAGMA foreign_keys = ON")
+    try:
+        yield connection
+    finally:
+        if connection.in_transaction:
+            connection.rollback()
+        connection.execute(f"PRAGMA foreign_keys = {int(previous)}")
@@ -0,0 +1,202 @@
+"""
+Read the trigger-filled ``change_log`` and track how far each consumer got.
+
+Every insert, update and delete on ``authors``, ``magazines`` and
+``articles`` appends a row with an increasing ``seq``. A cache, search index
+or report that mirrors the database registers as a named consumer, reads the
+changes after its committed offset and commits the last ``seq`` it handled,
+so catching up costs time proportional to the changes, not the tables.
+"""
+import json
+
+from .bulk import immediate_transaction
+from .connection import DEFAULT_BATCH_SIZE, db_connection
+
+OPERATIONS = ("insert", "update", "delete")
+
+
+def latest_seq(connection=None):
+    """
+    Return the ``seq`` of the newest change ever logged, compacted or not.
+
+    Args:
+        connection (sqlite3.Connection): The connection to read through; a
+            pooled one is used if omitted.
+
+    Returns:
+        int: The newest ``seq``, or 0 if nothing was logged yet.
+    """
+    if connection is None:
+        with db_connection() as connection:
+            return latest_seq(connection)
+    row = connection.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    return row[0] if row else 0
+
+def changes_since(seq, limit=DEFAULT_BATCH_SIZE, tables=None):
+    """
+    Read the changes logged after ``seq``, oldest first.
+
+    Args:
+        seq (int): The last ``seq`` already handled; 0 for the whole log.
+        limit (int): The maximum number of changes returned.
+        tables (iterable): Only changes to these tables, or None for all of them.
+
+    Returns:
+        list: Dicts with ``seq``, ``table``, ``row_id``, ``operation`` and the
+        ``old`` and ``new`` column values (None where they do not apply).
+
+    Raises:
+        ValueError: If changes after ``seq`` were already compacted away; the
+            consumer has to re-read the tables and restart from ``latest_seq``.
+    """
+    sql = """
+        SELECT seq, table_name, row_id, operation, old_values, new_values
+        FROM change_log
+        WHERE seq > ?
+    """
+    params = [seq]
+    if tables is not None:
+        tables = list(tables)
+        sql += " AND table_name IN ({})".format(", ".join("?" for _ in tables))
+        params.extend(tables)
+    sql += " ORDER BY seq LIMIT ?"
+    params.append(limit)
+    with db_connection() as connection:
+        _check_retained(connection, seq)
+        rows = connection.execute(sql, params).fetchall()
+    return [
+        {
+            "seq": row[0],
+            "table": row[1],
+            "row_id": row[2],
+            "operation": row[3],
+            "old": json.loads(row[4]) if row[4] is not None else None,
+            "new": json.loads(row[5]) if row[5] is not None else None,
+        }
+        for row in rows
+    ]
+
+def register_consumer(name, seq=None):
+    """
+    Create a durable consumer offset, or return the existing one.
+
+    A new consumer starts at ``latest_seq`` unless told otherwise: it is
+    expected to read the tables once and then follow the log.
+
+    Args:
+        name (str): The consumer name.
+        seq (int): The offset to start from; defaults to ``latest_seq``.
+
+    Returns:
+        int: The consumer's committed offset.
+    """
+    with db_connection() as connection:
+        with immediate_transaction(connection):
+            start = latest_seq(connection) if seq is None else seq
+            connection.execute(
+                "INSERT INTO change_consumers (name, seq) VALUES (?, ?) ON CONFLICT (name) DO NOTHING",
+                (name, start),
+            )
+            return connection.execute("SELECT seq FROM change_consumers WHERE name = ?", (name,)).fetchone()[0]
+
+def consumer_offset(name):
+    """
+    Return a consumer's committed offset.
+
+    Returns:
+        int: The last ``seq`` the consumer committed, or None if it is not registered.
+    """
+    with db_connection() as connection:
+        row = connection.execute("SELECT seq FROM change_consumers WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+def commit_offset(name, seq):
+    """
+    Record that a consumer handled every change up to ``seq``.
+
+    Raises:
+        ValueError: If the consumer is not registered.
+    """
+    with db_connection() as connection:
+        with immediate_transaction(connection):
+            cursor = connection.execute("UPDATE change_consumers SET seq = ? WHERE name = ?", (seq, name))
+    if cursor.rowcount == 0:
+        raise ValueError(f"Unknown change log consumer: {name}.")
+
+def drop_consumer(name):
+    """
+    Forget a consumer, so it no longer holds back compaction.
+
+    Returns:
+        bool: Whether the consumer existed.
+    """
+    with db_connection() as connection:
+        with immediate_transaction(connection):
+            cursor = connection.execute("DELETE FROM change_consumers WHERE name = ?", (name,))
+    return cursor.rowcount > 0
+
+def consume(name, handler, limit=DEFAULT_BATCH_SIZE, tables=None):
+    """
+    Pass a consumer every change after its offset, one batch at a time.
+
+    The offset is committed after each batch ``handler`` returns from, so a
+    crash replays at most the batch in progress: handlers should be
+    idempotent. Changes logged while this runs are left for the next call.
+
+    Args:
+        name (str): A registered consumer.
+        handler (callable): Called with each list of changes, as returned by ``changes_since``.
+        limit (int): The maximum number of changes per batch.
+        tables (iterable): Only changes to these tables, or None for all of them.
+
+    Returns:
+        int: The number of changes handled.
+
+    Raises:
+        ValueError: If the consumer is not registered, or its changes were compacted away.
+    """
+    seq = consumer_offset(name)
+    if seq is None:
+        raise ValueError(f"Unknown change log consumer: {name}.")
+    if tables is not None:
+        tables = list(tables)
+    # Filtered batches can skip changes, so the offset moves to where reading stopped.
+    end = latest_seq()
+    handled = 0
+    while seq < end:
+        changes = [change for change in changes_since(seq, limit, tables) if change["seq"] <= end]
+        if changes:
+            handler(changes)
+            handled += len(changes)
+        seq = changes[-1]["seq"] if len(changes) == limit else end
+        commit_offset(name, seq)
+    return handled
+
+def compact_changes(through=None):
+    """
+    Delete logged changes every consumer has already handled.
+
+    Args:
+        through (int): Delete changes up to this ``seq``; defaults to the
+            lowest committed consumer offset, or everything if there are no
+            consumers. Consumers behind it will get a ValueError and must resync.
+
+    Returns:
+        int: The number of changes deleted.
+    """
+    with db_connection() as connection:
+        with immediate_transaction(connection):
+            if through is None:
+                through = connection.execute("SELECT MIN(seq) FROM change_consumers").fetchone()[0]
+                if through is None:
+                    through = latest_seq(connection)
+            cursor = connection.execute("DELETE FROM change_log WHERE seq <= ?", (through,))
+    return cursor.rowcount
+
+def _check_retained(connection, seq):
+    # Sequence numbers are contiguous until compaction removes a prefix.
+    first = connection.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+    if first is None:
+        first = latest_seq(connection) + 1
+    if seq < first - 1:
+        raise ValueError(f"Changes after {seq} were compacted; resync from seq {first - 1}.")
@@ -1,8 +1,281 @@
+import atexit
+import os
+import queue
 import sqlite3
+import threading
+from contextlib import closing, contextmanager
+
+from . import instrumentation
 
 DATABASE_NAME = './database/magazine.db'
+POOL_SIZE = 5
+DEFAULT_BATCH_SIZE = 1000
+
+# Named PRAGMA settings applied to every new connection. cache_size is in
+# KiB when negative; mmap_size is in bytes; busy_timeout is in milliseconds.
+PROFILES = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+    "reporting": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -128000,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "query_only": "ON",
+    },
+}
+PROFILE = os.environ.get("MAGAZINE_DB_PROFILE", "balanced")
+
+def configure_connection(conn, profile=None):
+    """
+    Apply a named PRAGMA profile to a connection.
+
+    Args:
+        conn (sqlite3.Connection): The connection to configure.
+        profile (str): A key of ``PROFILES``; defaults to ``PROFILE``.
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    name = profile or PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown connection profile {name!r}; choose from {', '.join(PROFILES)}.")
+    for pragma, value in PROFILES[name].items():
+        conn.execute(f"PRAGMA {pragma} = {value}").fetchall()
+    return conn
 
-def get_db_connection():
+def get_db_connection(profile=None):
     conn = sqlite3.connect(DATABASE_NAME)
     conn.row_factory = sqlite3.Row
-    return conn
+    return configure_connection(conn, profile)
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    A connection owned by a ``ConnectionPool``; unlike the base class it can
+    be weakly referenced, which instrumentation relies on.
+    """
+
+
+class ConnectionPool:
+    def __init__(self, database, size=POOL_SIZE, profile=None):
+        """
+        Initialize a fixed-size pool of SQLite connections.
+
+        A thread keeps the connection it borrowed until its outermost
+        ``connection()`` block exits, so nested borrows inside one thread
+        reuse the same connection instead of draining the pool.
+
+        Args:
+            database (str): Path of the SQLite database file.
+            size (int): The maximum number of open connections.
+            profile (str): The PRAGMA profile for new connections; defaults to ``PROFILE``.
+        """
+        if not isinstance(size, int) or size < 1:
+            raise ValueError("Pool size must be a positive integer.")
+        self.database = database
+        self.size = size
+        self.profile = profile or PROFILE
+        if self.profile not in PROFILES:
+            raise ValueError(f"Unknown connection profile {self.profile!r}; choose from {', '.join(PROFILES)}.")
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._all = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+
+    def _open(self):
+        conn = sqlite3.connect(self.database, check_same_thread=False, factory=PooledConnection)
+        conn.row_factory = sqlite3.Row
+        return configure_connection(conn, self.profile)
+
+    def acquire(self, timeout=None):
+        """
+        Borrow a connection for the current thread.
+
+        Args:
+            timeout (float): Seconds to wait for a free connection, or None to wait forever.
+
+        Returns:
+            sqlite3.Connection: The connection bound to the current thread.
+
+        Raises:
+            RuntimeError: If the pool is closed or no connection frees up in time.
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed.")
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.depth += 1
+            return conn
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if len(self._all) < self.size:
+                    conn = self._open()
+                    self._all.append(conn)
+            if conn is None:
+                try:
+                    conn = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    raise RuntimeError("Timed out waiting for a database connection.")
+        instrumentation.on_acquire(conn)
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self):
+        """
+        Give the current thread's connection back once its outermost borrow ends.
+
+        Any transaction left open by the borrower is rolled back so the next
+        thread never inherits uncommitted work.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._local.conn = None
+        if self._closed:
+            conn.close()
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Borrow a connection for the duration of a ``with`` block.
+
+        Yields:
+            sqlite3.Connection: The connection bound to the current thread.
+        """
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release()
+
+    def close(self):
+        """
+        Close every idle connection and refuse further borrows.
+
+        Connections still in use are closed when their thread releases them.
+        """
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """
+    Return the process-wide connection pool, creating it on first use.
+
+    Returns:
+        ConnectionPool: The pool bound to ``DATABASE_NAME`` and ``PROFILE``.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DATABASE_NAME, POOL_SIZE, PROFILE)
+    return _pool
+
+def db_connection():
+    """
+    Borrow a pooled connection, e.g. ``with db_connection() as connection: ...``.
+    """
+    return get_pool().connection()
+
+def iter_batches(sql, params=(), batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Stream the rows of a query through ``fetchmany``, one batch at a time.
+
+    The pooled connection is borrowed on the first ``next()`` and given back
+    when the generator is exhausted or closed, so consume it in the thread
+    that started it.
+
+    Args:
+        sql (str): The SELECT statement to run.
+        params (tuple): Parameters for the statement.
+        batch_size (int): The number of rows fetched from SQLite at a time.
+
+    Yields:
+        list: The next batch of at most ``batch_size`` rows.
+    """
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("Batch size must be a positive integer.")
+    with db_connection() as connection:
+        cursor = connection.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            cursor.close()
+
+def iter_rows(sql, params=(), batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Stream the rows of a query through ``fetchmany`` without building a list.
+
+    Args:
+        sql (str): The SELECT statement to run.
+        params (tuple): Parameters for the statement.
+        batch_size (int): The number of rows fetched from SQLite at a time.
+
+    Yields:
+        sqlite3.Row: The next row.
+    """
+    with closing(iter_batches(sql, params, batch_size)) as batches:
+        for rows in batches:
+            yield from rows
+
+def close_pool():
+    """
+    Close the process-wide pool. The next borrow opens a fresh pool, which
+    picks up any change to ``DATABASE_NAME`` or ``PROFILE``.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+atexit.register(close_pool)
@@ -0,0 +1,199 @@
+import bisect
+import functools
+import json
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+# Upper bounds, in milliseconds, of the latency histogram buckets.
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, float("inf"))
+
+_enabled = 0
+_lock = threading.Lock()
+_local = threading.local()
+_traced = weakref.WeakSet()
+_metrics = {}
+_trackers = []
+
+
+class MethodStats:
+    """
+    Call count, SQL statements, rows returned and latency of one model method.
+    """
+
+    __slots__ = ("calls", "statements", "rows", "seconds", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.statements = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self.histogram = [0] * len(LATENCY_BUCKETS_MS)
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "statements": self.statements,
+            "rows": self.rows,
+            "total_ms": self.seconds * 1000,
+            "mean_ms": self.seconds * 1000 / self.calls if self.calls else 0.0,
+            "histogram_ms": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram)
+            },
+        }
+
+
+class QueryTracker:
+    """
+    The statements run while a ``track_queries()`` block was active.
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+def enabled():
+    """
+    Return whether metrics are being collected.
+    """
+    return _enabled > 0
+
+def enable():
+    """
+    Start collecting metrics. Calls nest; each needs a matching ``disable()``.
+    """
+    global _enabled
+    with _lock:
+        _enabled += 1
+
+def disable():
+    """
+    Undo one ``enable()`` call.
+    """
+    global _enabled
+    with _lock:
+        _enabled = max(0, _enabled - 1)
+
+def reset():
+    """
+    Drop every collected metric.
+    """
+    with _lock:
+        _metrics.clear()
+
+def snapshot():
+    """
+    Return the metrics collected so far.
+
+    Returns:
+        dict: A mapping of method name to its counters and latency histogram.
+    """
+    with _lock:
+        return {name: stats.as_dict() for name, stats in sorted(_metrics.items())}
+
+def export_json(path=None):
+    """
+    Serialize ``snapshot()`` as JSON, optionally writing it to a file.
+
+    Args:
+        path (str): Where to write the JSON, or None to only return it.
+
+    Returns:
+        str: The JSON document.
+    """
+    document = json.dumps(snapshot(), indent=2)
+    if path is not None:
+        with open(path, "w") as handle:
+            handle.write(document)
+    return document
+
+@contextmanager
+def track_queries():
+    """
+    Collect metrics and record every SQL statement run inside the block.
+
+    Yields:
+        QueryTracker: Its ``statements`` list fills in as queries run.
+    """
+    tracker = QueryTracker()
+    with _lock:
+        _trackers.append(tracker)
+    enable()
+    try:
+        yield tracker
+    finally:
+        disable()
+        with _lock:
+            _trackers.remove(tracker)
+
+def on_acquire(connection):
+    """
+    Install or remove the statement trace on a connection as it is borrowed.
+
+    Called by the connection pool, so tracing costs nothing while disabled.
+    """
+    if _enabled:
+        if connection not in _traced:
+            connection.set_trace_callback(_record_statement)
+            _traced.add(connection)
+    elif _traced and connection in _traced:
+        connection.set_trace_callback(None)
+        _traced.discard(connection)
+
+def _record_statement(sql):
+    if not _enabled or sql.startswith("--"):
+        return
+    stack = getattr(_local, "stack", None)
+    with _lock:
+        for tracker in _trackers:
+            tracker.statements.append(sql)
+        if stack:
+            for name in set(stack):
+                _metrics.setdefault(name, MethodStats()).statements += 1
+
+def _count_rows(result):
+    if result is None:
+        return 0
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        # fetch_page style (items, cursor) results.
+        return len(result[0])
+    if isinstance(result, (list, dict)):
+        return len(result)
+    return 1
+
+def instrumented(func):
+    """
+    Record calls, statements, returned rows and latency of a model method.
+
+    While metrics are disabled the wrapper only checks a flag.
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(name)
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+        with _lock:
+            stats = _metrics.setdefault(name, MethodStats())
+            stats.calls += 1
+            stats.rows += _count_rows(result)
+            stats.seconds += elapsed
+            stats.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed * 1000)] += 1
+        return result
+    return wrapper
@@ -0,0 +1,350 @@
+from .bulk import immediate_transaction
+
+def _cascade_article_deletes(connection):
+    """
+    Rebuild ``articles`` with ``ON DELETE CASCADE`` foreign keys.
+
+    SQLite cannot alter a foreign key, so the table is copied into a new one
+    and its indexes and triggers are recreated from ``sqlite_master``. The
+    cascades only run on connections with ``PRAGMA foreign_keys`` on.
+    """
+    actions = {row["table"]: row["on_delete"] for row in _rows(connection, "PRAGMA foreign_key_list(articles)")}
+    if actions == {"authors": "CASCADE", "magazines": "CASCADE"}:
+        return
+    schema = [
+        row[0] for row in connection.execute(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = 'articles' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+        )
+    ]
+    sequence = connection.execute("SELECT seq FROM sqlite_sequence WHERE name = 'articles'").fetchone()
+    connection.execute("""
+        CREATE TABLE articles_rebuild (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            author_id INTEGER,
+            magazine_id INTEGER,
+            FOREIGN KEY (author_id) REFERENCES authors (id) ON DELETE CASCADE,
+            FOREIGN KEY (magazine_id) REFERENCES magazines (id) ON DELETE CASCADE
+        )
+    """)
+    connection.execute("""
+        INSERT INTO articles_rebuild (id, title, content, author_id, magazine_id)
+        SELECT id, title, content, author_id, magazine_id FROM articles
+    """)
+    connection.execute("DROP TABLE articles")
+    connection.execute("ALTER TABLE articles_rebuild RENAME TO articles")
+    if sequence is not None:
+        connection.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'articles'", (sequence[0],))
+    for sql in schema:
+        connection.execute(sql)
+
+def _change_log_triggers(table, columns, watched=()):
+    """
+    Build the triggers that record inserts, updates and deletes on ``table`` in ``change_log``.
+
+    ``columns`` are copied into the ``old_values``/``new_values`` JSON; an
+    update is logged when any of them or of ``watched`` changes.
+    """
+    def values(prefix):
+        return "json_object({})".format(", ".join(f"'{column}', {prefix}.{column}" for column in columns))
+
+    changed = " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in columns + watched)
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_log_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, operation, new_values)
+            VALUES ('{table}', NEW.id, 'insert', {values("NEW")});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_log_update AFTER UPDATE ON {table}
+        WHEN {changed}
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, operation, old_values, new_values)
+            VALUES ('{table}', NEW.id, 'update', {values("OLD")}, {values("NEW")});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_log_delete AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, operation, old_values)
+            VALUES ('{table}', OLD.id, 'delete', {values("OLD")});
+        END
+        """,
+    ]
+
+def _rows(connection, sql):
+    cursor = connection.execute(sql)
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
+
+# Ordered schema migrations: (version, description, steps). A step is either
+# an SQL statement or a callable taking the connection, for data migrations.
+# Never edit a released migration; append a new one instead.
+MIGRATIONS = [
+    (1, "Index article foreign keys", [
+        "CREATE INDEX IF NOT EXISTS idx_articles_author_magazine ON articles (author_id, magazine_id)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_magazine_author ON articles (magazine_id, author_id)",
+    ]),
+    (2, "Cover magazine article title lookups", [
+        "CREATE INDEX IF NOT EXISTS idx_articles_magazine_title ON articles (magazine_id, title)",
+    ]),
+    (3, "Index keyset pagination orderings", [
+        "CREATE INDEX IF NOT EXISTS idx_authors_name ON authors (name)",
+        "CREATE INDEX IF NOT EXISTS idx_magazines_name ON magazines (name)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_title ON articles (title)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_author ON articles (author_id)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_magazine ON articles (magazine_id)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_author_title ON articles (author_id, title)",
+    ]),
+    (4, "Maintain article counters with triggers", [
+        """
+        CREATE TABLE IF NOT EXISTS author_stats (
+            author_id INTEGER PRIMARY KEY,
+            article_count INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS magazine_stats (
+            magazine_id INTEGER PRIMARY KEY,
+            article_count INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS magazine_author_stats (
+            magazine_id INTEGER NOT NULL,
+            author_id INTEGER NOT NULL,
+            article_count INTEGER NOT NULL,
+            PRIMARY KEY (magazine_id, author_id)
+        ) WITHOUT ROWID
+        """,
+        "DELETE FROM author_stats",
+        "DELETE FROM magazine_stats",
+        "DELETE FROM magazine_author_stats",
+        """
+        INSERT INTO author_stats (author_id, article_count)
+        SELECT author_id, COUNT(*) FROM articles
+        WHERE author_id IS NOT NULL GROUP BY author_id
+        """,
+        """
+        INSERT INTO magazine_stats (magazine_id, article_count)
+        SELECT magazine_id, COUNT(*) FROM articles
+        WHERE magazine_id IS NOT NULL GROUP BY magazine_id
+        """,
+        """
+        INSERT INTO magazine_author_stats (magazine_id, author_id, article_count)
+        SELECT magazine_id, author_id, COUNT(*) FROM articles
+        WHERE magazine_id IS NOT NULL AND author_id IS NOT NULL
+        GROUP BY magazine_id, author_id
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_articles_count_insert AFTER INSERT ON articles
+        BEGIN
+            INSERT INTO author_stats (author_id, article_count)
+            SELECT NEW.author_id, 1 WHERE NEW.author_id IS NOT NULL
+            ON CONFLICT (author_id) DO UPDATE SET article_count = article_count + 1;
+            INSERT INTO magazine_stats (magazine_id, article_count)
+            SELECT NEW.magazine_id, 1 WHERE NEW.magazine_id IS NOT NULL
+            ON CONFLICT (magazine_id) DO UPDATE SET article_count = article_count + 1;
+            INSERT INTO magazine_author_stats (magazine_id, author_id, article_count)
+            SELECT NEW.magazine_id, NEW.author_id, 1
+            WHERE NEW.magazine_id IS NOT NULL AND NEW.author_id IS NOT NULL
+            ON CONFLICT (magazine_id, author_id) DO UPDATE SET article_count = article_count + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_articles_count_delete AFTER DELETE ON articles
+        BEGIN
+            UPDATE author_stats SET article_count = article_count - 1
+            WHERE author_id = OLD.author_id;
+            DELETE FROM author_stats WHERE author_id = OLD.author_id AND article_count <= 0;
+            UPDATE magazine_stats SET article_count = article_count - 1
+            WHERE magazine_id = OLD.magazine_id;
+            DELETE FROM magazine_stats WHERE magazine_id = OLD.magazine_id AND article_count <= 0;
+            UPDATE magazine_author_stats SET article_count = article_count - 1
+            WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id;
+            DELETE FROM magazine_author_stats
+            WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id AND article_count <= 0;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_articles_count_update
+        AFTER UPDATE OF author_id, magazine_id ON articles
+        WHEN OLD.author_id IS NOT NEW.author_id OR OLD.magazine_id IS NOT NEW.magazine_id
+        BEGIN
+            UPDATE author_stats SET article_count = article_count - 1
+            WHERE author_id = OLD.author_id AND OLD.author_id IS NOT NEW.author_id;
+            DELETE FROM author_stats WHERE author_id = OLD.author_id AND article_count <= 0;
+            INSERT INTO author_stats (author_id, article_count)
+            SELECT NEW.author_id, 1
+            WHERE NEW.author_id IS NOT NULL AND OLD.author_id IS NOT NEW.author_id
+            ON CONFLICT (author_id) DO UPDATE SET article_count = article_count + 1;
+            UPDATE magazine_stats SET article_count = article_count - 1
+            WHERE magazine_id = OLD.magazine_id AND OLD.magazine_id IS NOT NEW.magazine_id;
+            DELETE FROM magazine_stats WHERE magazine_id = OLD.magazine_id AND article_count <= 0;
+            INSERT INTO magazine_stats (magazine_id, article_count)
+            SELECT NEW.magazine_id, 1
+            WHERE NEW.magazine_id IS NOT NULL AND OLD.magazine_id IS NOT NEW.magazine_id
+            ON CONFLICT (magazine_id) DO UPDATE SET article_count = article_count + 1;
+            UPDATE magazine_author_stats SET article_count = article_count - 1
+            WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id;
+            DELETE FROM magazine_author_stats
+            WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id AND article_count <= 0;
+            INSERT INTO magazine_author_stats (magazine_id, author_id, article_count)
+            SELECT NEW.magazine_id, NEW.author_id, 1
+            WHERE NEW.magazine_id IS NOT NULL AND NEW.author_id IS NOT NULL
+            ON CONFLICT (magazine_id, author_id) DO UPDATE SET article_count = article_count + 1;
+        END
+        """,
+    ]),
+    (5, "Index article titles and content for full-text search", [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+            title, content, content='articles', content_rowid='id'
+        )
+        """,
+        "INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')",
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_articles_fts_insert AFTER INSERT ON articles
+        BEGIN
+            INSERT INTO articles_fts (rowid, title, content)
+            VALUES (NEW.id, NEW.title, NEW.content);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_articles_fts_delete AFTER DELETE ON articles
+        BEGIN
+            INSERT INTO articles_fts (articles_fts, rowid, title, content)
+            VALUES ('delete', OLD.id, OLD.title, OLD.content);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_articles_fts_update AFTER UPDATE OF title, content ON articles
+        BEGIN
+            INSERT INTO articles_fts (articles_fts, rowid, title, content)
+            VALUES ('delete', OLD.id, OLD.title, OLD.content);
+            INSERT INTO articles_fts (rowid, title, content)
+            VALUES (NEW.id, NEW.title, NEW.content);
+        END
+        """,
+    ]),
+    (6, "Merge duplicate authors and magazines and make names unique", [
+        """
+        UPDATE articles SET author_id = (
+            SELECT MIN(keep.id) FROM authors AS keep
+            JOIN authors AS duplicate ON duplicate.name = keep.name
+            WHERE duplicate.id = articles.author_id
+        )
+        WHERE author_id NOT IN (SELECT MIN(id) FROM authors GROUP BY name)
+        AND author_id IN (SELECT id FROM authors)
+        """,
+        "DELETE FROM authors WHERE id NOT IN (SELECT MIN(id) FROM authors GROUP BY name)",
+        """
+        UPDATE articles SET magazine_id = (
+            SELECT MIN(keep.id) FROM magazines AS keep
+            JOIN magazines AS duplicate ON duplicate.name = keep.name
+            WHERE duplicate.id = articles.magazine_id
+        )
+        WHERE magazine_id NOT IN (SELECT MIN(id) FROM magazines GROUP BY name)
+        AND magazine_id IN (SELECT id FROM magazines)
+        """,
+        "DELETE FROM magazines WHERE id NOT IN (SELECT MIN(id) FROM magazines GROUP BY name)",
+        "DROP INDEX IF EXISTS idx_authors_name",
+        "DROP INDEX IF EXISTS idx_magazines_name",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_authors_name ON authors (name)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_magazines_name ON magazines (name)",
+    ]),
+    (7, "Track resumable imports", [
+        """
+        CREATE TABLE IF NOT EXISTS import_progress (
+            job TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            rows INTEGER NOT NULL,
+            PRIMARY KEY (job, table_name)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS import_id_map (
+            job TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            old_id INTEGER NOT NULL,
+            new_id INTEGER NOT NULL,
+            PRIMARY KEY (job, table_name, old_id)
+        ) WITHOUT ROWID
+        """,
+    ]),
+    (8, "Cascade author and magazine deletes to their articles", [
+        _cascade_article_deletes,
+    ]),
+    (9, "Log row changes for incremental consumers", [
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            operation TEXT NOT NULL,
+            old_values TEXT,
+            new_values TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS change_consumers (
+            name TEXT PRIMARY KEY,
+            seq INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """,
+        *_change_log_triggers("authors", ("name",)),
+        *_change_log_triggers("magazines", ("name", "category")),
+        # Article content is left out of the log to keep it small; consumers read it by row_id.
+        *_change_log_triggers("articles", ("title", "author_id", "magazine_id"), watched=("content",)),
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def schema_version(connection):
+    """
+    Read the schema version stored in ``PRAGMA user_version``.
+
+    Args:
+        connection (sqlite3.Connection): The connection to inspect.
+
+    Returns:
+        int: The version of the last migration applied.
+    """
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(connection, target=LATEST_VERSION):
+    """
+    Apply every pending migration up to ``target``, each in its own transaction.
+
+    Args:
+        connection (sqlite3.Connection): The connection to migrate through.
+        target (int): The version to stop at.
+
+    Returns:
+        list: The versions applied, in order.
+
+    Raises:
+        ValueError: If the database is newer than this code knows about.
+    """
+    current = schema_version(connection)
+    if current > LATEST_VERSION:
+        raise ValueError(
+            f"Database schema version {current} is newer than supported version {LATEST_VERSION}."
+        )
+    applied = []
+    for version, _description, steps in MIGRATIONS:
+        if version <= current or version > target:
+            continue
+        with immediate_transaction(connection):
+            for step in steps:
+                if callable(step):
+                    step(connection)
+                else:
+                    connection.execute(step)
+            connection.execute(f"PRAGMA user_version = {int(version)}")
+        applied.append(version)
+    return applied
@@ -0,0 +1,92 @@
+import base64
+import json
+
+from .connection import db_connection
+
+DEFAULT_PAGE_SIZE = 50
+
+def encode_cursor(order_by, row):
+    """
+    Build the opaque cursor that resumes a page after ``row``.
+
+    Args:
+        order_by (str): The column the page is ordered by.
+        row (sqlite3.Row): The last row of the page.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    payload = json.dumps([order_by, row[order_by], row["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor, order_by):
+    """
+    Unpack a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor (str): The cursor returned with the previous page.
+        order_by (str): The ordering the caller is paging by.
+
+    Returns:
+        tuple: The ``(order_by value, id)`` of the last row already seen.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another ordering.
+    """
+    try:
+        column, value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError("Invalid page cursor.")
+    if column != order_by:
+        raise ValueError(f"Page cursor was issued for ordering by {column!r}, not {order_by!r}.")
+    return value, last_id
+
+def fetch_page(table, order_by, allowed, after=None, limit=DEFAULT_PAGE_SIZE, where=None, params=()):
+    """
+    Fetch one keyset page of ``table`` ordered by ``(order_by, id)``.
+
+    Rather than skipping rows with OFFSET, each page seeks straight past the
+    last key of the previous one, so every page costs the same index probe
+    however deep it is.
+
+    Args:
+        table (str): The table to page through.
+        order_by (str): The column to order by; ``id`` breaks ties.
+        allowed (tuple): The columns that have a supporting index.
+        after (str): The cursor returned with the previous page, or None for the first page.
+        limit (int): The maximum number of rows in the page.
+        where (str): An optional extra filter, e.g. ``"author_id = ?"``.
+        params (tuple): Parameters for ``where``.
+
+    Returns:
+        tuple: The page rows and the cursor for the next page, or None on the last page.
+
+    Raises:
+        ValueError: If ``order_by`` is not allowed or ``limit`` is not positive.
+    """
+    if order_by not in allowed:
+        raise ValueError(f"Cannot order {table} by {order_by!r}; choose from {', '.join(allowed)}.")
+    if not isinstance(limit, int) or limit < 1:
+        raise ValueError("Page limit must be a positive integer.")
+    conditions = [where] if where else []
+    params = list(params)
+    if after is not None:
+        value, last_id = decode_cursor(after, order_by)
+        if order_by == "id":
+            conditions.append("id > ?")
+            params.append(last_id)
+        else:
+            conditions.append(f"({order_by}, id) > (?, ?)")
+            params.extend([value, last_id])
+    order = "id" if order_by == "id" else f"{order_by}, id"
+    sql = f"SELECT * FROM {table}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {order} LIMIT ?"
+    params.append(limit + 1)
+    with db_connection() as connection:
+        rows = connection.execute(sql, params).fetchall()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(order_by, rows[-1])
+    return rows, None
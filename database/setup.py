@@ -1,33 +1,62 @@
-from .connection import get_db_connection
+from .connection import db_connection
+from .migrations import migrate
 
 def create_tables():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS authors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS magazines (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            category TEXT NOT NULL
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS articles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            content TEXT NOT NULL,
-            author_id INTEGER,
-            magazine_id INTEGER,
-            FOREIGN KEY (author_id) REFERENCES authors (id),
-            FOREIGN KEY (magazine_id) REFERENCES magazines (id)
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
+    """
+    Create the base tables if needed and apply any pending schema migrations.
+    """
+    with db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS authors (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS magazines (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                category TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                author_id INTEGER,
+                magazine_id INTEGER,
+                FOREIGN KEY (author_id) REFERENCES authors (id) ON DELETE CASCADE,
+                FOREIGN KEY (magazine_id) REFERENCES magazines (id) ON DELETE CASCADE
+            )
+        ''')
+
+        conn.commit()
+        migrate(conn)
+
+def rebuild_search_index():
+    """
+    Rebuild the full-text search index from the articles table.
+
+    Use this after bulk changes made with the triggers disabled, or to
+    repair an index that has drifted from its content.
+    """
+    with db_connection() as conn:
+        conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+        conn.commit()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Create or upgrade the magazine database.")
+    parser.add_argument(
+        "--rebuild-search", action="store_true",
+        help="rebuild the full-text search index after migrating",
+    )
+    args = parser.parse_args()
+    create_tables()
+    if args.rebuild_search:
+        rebuild_search_index()
@@ -0,0 +1,404 @@
+"""
+An in-memory author x magazine adjacency index in CSR form.
+
+Every author row lists the magazines they wrote for and every magazine row
+its authors, with article counts, as flat typed arrays:
+
+    keys[i]                        the author (or magazine) of row i
+    targets[indptr[i]:indptr[i+1]] its magazines (or authors), ascending
+    counts[indptr[i]:indptr[i+1]]  the articles behind each edge
+
+The index is read from the trigger-maintained ``magazine_author_stats``
+table, so building it never scans ``articles``, and is then kept current
+from ``change_log``. Multi-hop traversal, co-occurrence counts and
+similarity scores run without a query per hop.
+"""
+import math
+import threading
+import weakref
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from database.change_log import changes_since, latest_seq
+from database.connection import db_connection
+from database.instrumentation import instrumented
+
+SIMILARITY_METRICS = ("jaccard", "cosine")
+
+
+class _CSR:
+    """
+    One orientation of the index: sorted row keys, row offsets, targets and counts.
+    """
+
+    def __init__(self, edges=()):
+        """
+        Build the rows from ``(row, target, count)`` triples sorted by row and target.
+        """
+        self.keys = array("q")
+        self.indptr = array("q", [0])
+        self.targets = array("q")
+        self.counts = array("q")
+        for row, target, count in edges:
+            if not self.keys or self.keys[-1] != row:
+                if self.keys:
+                    self.indptr.append(len(self.targets))
+                self.keys.append(row)
+            self.targets.append(target)
+            self.counts.append(count)
+        if self.keys:
+            self.indptr.append(len(self.targets))
+
+    @property
+    def nbytes(self):
+        return sum(len(column) * column.itemsize for column in (self.keys, self.indptr, self.targets, self.counts))
+
+    def span(self, key):
+        """
+        Return the ``(start, end)`` offsets of a row, or ``(0, 0)`` if it has none.
+        """
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return 0, 0
+        return self.indptr[i], self.indptr[i + 1]
+
+    def find(self, key, target):
+        """
+        Return the offset of an edge, or None if the row has no such target.
+        """
+        start, end = self.span(key)
+        i = bisect_left(self.targets, target, start, end)
+        if i < end and self.targets[i] == target:
+            return i
+        return None
+
+    def edges(self):
+        """
+        Yield every ``(row, target, count)`` triple in order.
+        """
+        for i, key in enumerate(self.keys):
+            for j in range(self.indptr[i], self.indptr[i + 1]):
+                yield key, self.targets[j], self.counts[j]
+
+
+class AdjacencyIndex:
+    """
+    Authors and magazines linked by the articles between them.
+
+    ``refresh`` replays the article changes logged since the index was
+    built through ``apply``: counts of existing edges are patched in both
+    orientations and new edges go to a small overlay that is merged once it
+    grows. The index is only rebuilt if those changes were compacted away.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty index; call ``refresh`` to load it.
+        """
+        self.by_author = _CSR()
+        self.by_magazine = _CSR()
+        self.rebuilds = 0
+        self.seq = None
+        self._author_overlay = {}
+        self._magazine_overlay = {}
+        self._overlay_size = 0
+        self._seen = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    @instrumented
+    def load():
+        """
+        Build an index from ``magazine_author_stats``.
+
+        Returns:
+            AdjacencyIndex: The loaded index.
+        """
+        index = AdjacencyIndex()
+        index.refresh()
+        return index
+
+    def __len__(self):
+        return sum(1 for _ in self.edges())
+
+    @property
+    def nbytes(self):
+        return self.by_author.nbytes + self.by_magazine.nbytes
+
+    @instrumented
+    def refresh(self):
+        """
+        Bring the index up to date with the database.
+
+        Article changes logged after ``seq`` are applied incrementally. The
+        index is rebuilt on first load, or if those changes were compacted
+        away. The ``ResultCache`` check on ``PRAGMA data_version`` and
+        ``total_changes`` skips reading the log when nothing was written.
+
+        Returns:
+            bool: Whether the index was rebuilt.
+        """
+        with db_connection() as connection:
+            token = _token(connection)
+            with self._lock:
+                if self._seen.get(connection) == token:
+                    return False
+                if self.seq is not None and self._catch_up():
+                    self._seen[connection] = token
+                    return False
+                if connection.in_transaction:
+                    connection.commit()
+                # One read transaction, so the counts and the log position agree.
+                connection.execute("BEGIN")
+                try:
+                    seq = latest_seq(connection)
+                    edges = connection.execute(
+                        """
+                        SELECT magazine_id, author_id, article_count
+                        FROM magazine_author_stats
+                        WHERE article_count > 0
+                        ORDER BY magazine_id, author_id
+                        """
+                    ).fetchall()
+                finally:
+                    connection.commit()
+                self._build([tuple(edge) for edge in edges])
+                self.seq = seq
+                self._seen = weakref.WeakKeyDictionary({connection: token})
+        return True
+
+    def apply(self, author_id, magazine_id, delta):
+        """
+        Add ``delta`` articles to the edge between an author and a magazine.
+
+        ``refresh`` calls this with ``+1`` for a saved article, ``-1`` for a
+        deleted one and both for one moved to another author or magazine.
+        Articles without an author or magazine are ignored.
+
+        Args:
+            author_id (int): The author of the article.
+            magazine_id (int): The magazine of the article.
+            delta (int): The change in the number of articles.
+        """
+        if author_id is None or magazine_id is None or not delta:
+            return
+        with self._lock:
+            i = self.by_author.find(author_id, magazine_id)
+            if i is not None:
+                self.by_author.counts[i] += delta
+                self.by_magazine.counts[self.by_magazine.find(magazine_id, author_id)] += delta
+                return
+            row = self._author_overlay.setdefault(author_id, {})
+            count = row.get(magazine_id, 0) + delta
+            if count:
+                self._overlay_size += magazine_id not in row
+                row[magazine_id] = count
+                self._magazine_overlay.setdefault(magazine_id, {})[author_id] = count
+            else:
+                self._overlay_size -= 1
+                del row[magazine_id]
+                del self._magazine_overlay[magazine_id][author_id]
+            if self._overlay_size > max(1024, len(self.by_author.targets) // 8):
+                self.compact()
+
+    def compact(self):
+        """
+        Merge the overlay into the CSR arrays and drop edges whose count reached zero.
+        """
+        with self._lock:
+            self._build(sorted(
+                (magazine_id, author_id, count) for author_id, magazine_id, count in self.edges()
+            ))
+
+    def edges(self):
+        """
+        Yield every ``(author_id, magazine_id, count)`` edge with a positive count.
+        """
+        with self._lock:
+            merged = {}
+            for author_id, magazine_id, count in self.by_author.edges():
+                merged[author_id, magazine_id] = count
+            for author_id, row in self._author_overlay.items():
+                for magazine_id, count in row.items():
+                    merged[author_id, magazine_id] = merged.get((author_id, magazine_id), 0) + count
+        for (author_id, magazine_id), count in sorted(merged.items()):
+            if count > 0:
+                yield author_id, magazine_id, count
+
+    def magazines(self, author_id):
+        """
+        List the magazines an author wrote for.
+
+        Returns:
+            dict: A mapping of magazine ID to the author's article count, in ID order.
+        """
+        return self._row(self.by_author, self._author_overlay, author_id)
+
+    def authors(self, magazine_id):
+        """
+        List the authors who wrote for a magazine.
+
+        Returns:
+            dict: A mapping of author ID to their article count, in ID order.
+        """
+        return self._row(self.by_magazine, self._magazine_overlay, magazine_id)
+
+    def reachable(self, author_ids, hops=1):
+        """
+        Find the authors within ``hops`` shared magazines of some authors.
+
+        One hop is author -> magazine -> author, so ``hops=1`` gives everyone
+        who shares a magazine with one of ``author_ids``.
+
+        Args:
+            author_ids (iterable): The authors to start from.
+            hops (int): The maximum number of hops.
+
+        Returns:
+            dict: A mapping of author ID to the hop at which it was first
+            reached; the starting authors are at 0.
+        """
+        distances = {author_id: 0 for author_id in author_ids}
+        frontier = list(distances)
+        seen_magazines = set()
+        for hop in range(1, hops + 1):
+            following = []
+            for author_id in frontier:
+                for magazine_id in self.magazines(author_id):
+                    if magazine_id in seen_magazines:
+                        continue
+                    seen_magazines.add(magazine_id)
+                    for other in self.authors(magazine_id):
+                        if other not in distances:
+                            distances[other] = hop
+                            following.append(other)
+            if not following:
+                break
+            frontier = following
+        return distances
+
+    def co_occurrences(self, author_id):
+        """
+        Count the magazines an author shares with every other author.
+
+        Returns:
+            dict: A mapping of author ID to the number of shared magazines.
+        """
+        shared = Counter()
+        for magazine_id in self.magazines(author_id):
+            shared.update(self.authors(magazine_id).keys())
+        shared.pop(author_id, None)
+        return dict(shared)
+
+    def similarity(self, author_id, other_id, metric="jaccard"):
+        """
+        Score how alike two authors' magazines are.
+
+        ``jaccard`` compares the sets of magazines; ``cosine`` compares the
+        article counts per magazine.
+
+        Args:
+            author_id (int): One author.
+            other_id (int): The other author.
+            metric (str): ``jaccard`` or ``cosine``.
+
+        Returns:
+            float: A score between 0 and 1.
+
+        Raises:
+            ValueError: If the metric is not supported.
+        """
+        _check_metric(metric)
+        return _score(self.magazines(author_id), self.magazines(other_id), metric)
+
+    def most_similar(self, author_ids, limit=10, metric="jaccard"):
+        """
+        Rank the authors most like each of ``author_ids``.
+
+        Only authors sharing at least one magazine are scored.
+
+        Args:
+            author_ids (iterable): The authors to find neighbours for.
+            limit (int): The number of neighbours per author.
+            metric (str): ``jaccard`` or ``cosine``.
+
+        Returns:
+            dict: A mapping of author ID to ``(other_id, score)`` pairs, best
+            first, ties by ID.
+
+        Raises:
+            ValueError: If the metric is not supported.
+        """
+        _check_metric(metric)
+        rows = {}
+        ranked = {}
+        for author_id in author_ids:
+            row = self.magazines(author_id)
+            scores = []
+            for other in self.co_occurrences(author_id):
+                if other not in rows:
+                    rows[other] = self.magazines(other)
+                scores.append((other, _score(row, rows[other], metric)))
+            scores.sort(key=lambda item: (-item[1], item[0]))
+            ranked[author_id] = scores[:limit]
+        return ranked
+
+    def _catch_up(self):
+        # Returns False if the changes after ``seq`` were compacted away.
+        while True:
+            try:
+                changes = changes_since(self.seq, tables=("articles",))
+            except ValueError:
+                return False
+            if not changes:
+                return True
+            for change in changes:
+                old, new = change["old"], change["new"]
+                if old is not None and new is not None and _pair(old) == _pair(new):
+                    pass
+                else:
+                    if old is not None:
+                        self.apply(*_pair(old), -1)
+                    if new is not None:
+                        self.apply(*_pair(new), 1)
+                self.seq = change["seq"]
+
+    def _row(self, csr, overlay, key):
+        with self._lock:
+            start, end = csr.span(key)
+            row = dict(zip(csr.targets[start:end], csr.counts[start:end]))
+            extra = overlay.get(key)
+            if extra:
+                for target, count in extra.items():
+                    row[target] = row.get(target, 0) + count
+                row = dict(sorted(row.items()))
+        return {target: count for target, count in row.items() if count > 0}
+
+    def _build(self, edges):
+        # ``edges`` are (magazine, author, count) in magazine order.
+        self.by_magazine = _CSR(edges)
+        self.by_author = _CSR(sorted((author_id, magazine_id, count) for magazine_id, author_id, count in edges))
+        self._author_overlay = {}
+        self._magazine_overlay = {}
+        self._overlay_size = 0
+        self.rebuilds += 1
+
+
+def _pair(values):
+    return values["author_id"], values["magazine_id"]
+
+def _token(connection):
+    return connection.execute("PRAGMA data_version").fetchone()[0], connection.total_changes
+
+def _check_metric(metric):
+    if metric not in SIMILARITY_METRICS:
+        raise ValueError(f"Unsupported similarity metric: {metric}.")
+
+def _score(row, other, metric):
+    if metric == "jaccard":
+        union = len(row.keys() | other.keys())
+        return len(row.keys() & other.keys()) / union if union else 0.0
+    dot = sum(count * other[key] for key, count in row.items() if key in other)
+    norm = math.sqrt(sum(c * c for c in row.values())) * math.sqrt(sum(c * c for c in other.values()))
+    return dot / norm if norm else 0.0
@@ -0,0 +1,160 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import database.connection as db
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """
+    Return the worker-thread executor that runs every database call.
+
+    It has one worker per pooled connection, so a worker never waits for a
+    connection and the event loop never touches sqlite3 itself.
+
+    Returns:
+        ThreadPoolExecutor: The shared executor.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=db.POOL_SIZE, thread_name_prefix="db-worker"
+                )
+    return _executor
+
+async def run(func, *args, **kwargs):
+    """
+    Run a blocking model call on the database executor and await its result.
+
+    Args:
+        func (callable): The function to run.
+        *args: Positional arguments for ``func``.
+        **kwargs: Keyword arguments for ``func``.
+
+    Returns:
+        The value returned by ``func``.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+def shutdown(wait=True):
+    """
+    Stop the database executor. The next call starts a fresh one.
+
+    Args:
+        wait (bool): Whether to wait for queued calls to finish.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+def _awaitable(method, articles=None):
+    if articles is not None:
+        # Deferred columns would otherwise be queried on the event loop when first read.
+        def call(*args, **kwargs):
+            result = method(*args, **kwargs)
+            Article.load_deferred(articles(result))
+            return result
+    else:
+        call = method
+
+    async def wrapper(*args, **kwargs):
+        return await run(call, *args, **kwargs)
+    functools.update_wrapper(wrapper, method)
+    return staticmethod(wrapper)
+
+def _articles(result):
+    return result
+
+def _search_articles(results):
+    return [article for article, _snippet in results]
+
+
+class AsyncAuthor:
+    """
+    Awaitable versions of the Author methods. Instance methods take the
+    author as their first argument, e.g. ``await AsyncAuthor.articles(author)``.
+    """
+
+    fetch_all = _awaitable(Author.fetch_all)
+    fetch_by_id = _awaitable(Author.fetch_by_id)
+    fetch_many_by_ids = _awaitable(Author.fetch_many_by_ids)
+    get_or_create = _awaitable(Author.get_or_create)
+    fetch_page = _awaitable(Author.fetch_page)
+    save_many = _awaitable(Author.save_many)
+    update_many = _awaitable(Author.update_many)
+    delete_many = _awaitable(Author.delete_many)
+    delete_where = _awaitable(Author.delete_where)
+    save_to_db = _awaitable(Author.save_to_db)
+    update_to_db = _awaitable(Author.update_to_db)
+    delete_from_db = _awaitable(Author.delete_from_db)
+    articles = _awaitable(Author.articles, articles=_articles)
+    articles_page = _awaitable(Author.articles_page)
+    article_count = _awaitable(Author.article_count)
+    magazines = _awaitable(Author.magazines)
+
+
+class AsyncMagazine:
+    """
+    Awaitable versions of the Magazine methods. Instance methods take the
+    magazine as their first argument, e.g. ``await AsyncMagazine.contributors(magazine)``.
+    """
+
+    fetch_all = _awaitable(Magazine.fetch_all)
+    fetch_by_id = _awaitable(Magazine.fetch_by_id)
+    fetch_many_by_ids = _awaitable(Magazine.fetch_many_by_ids)
+    get_or_create = _awaitable(Magazine.get_or_create)
+    upsert = _awaitable(Magazine.upsert)
+    fetch_page = _awaitable(Magazine.fetch_page)
+    save_many = _awaitable(Magazine.save_many)
+    update_many = _awaitable(Magazine.update_many)
+    delete_many = _awaitable(Magazine.delete_many)
+    update_where = _awaitable(Magazine.update_where)
+    delete_where = _awaitable(Magazine.delete_where)
+    contributing_authors_for_all = _awaitable(Magazine.contributing_authors_for_all)
+    save_to_db = _awaitable(Magazine.save_to_db)
+    update_to_db = _awaitable(Magazine.update_to_db)
+    delete_from_db = _awaitable(Magazine.delete_from_db)
+    articles = _awaitable(Magazine.articles, articles=_articles)
+    articles_page = _awaitable(Magazine.articles_page)
+    article_count = _awaitable(Magazine.article_count)
+    contributors = _awaitable(Magazine.contributors)
+    article_titles = _awaitable(Magazine.article_titles)
+    contributing_authors = _awaitable(Magazine.contributing_authors)
+
+
+class AsyncArticle:
+    """
+    Awaitable versions of the Article methods. Instance methods take the
+    article as their first argument, e.g. ``await AsyncArticle.author(article)``.
+
+    Columns left out with ``only``/``defer``, and the content of search
+    results, are loaded on the executor before the articles are returned,
+    so reading them never runs a query on the event loop.
+    """
+
+    fetch_all = _awaitable(Article.fetch_all, articles=_articles)
+    fetch_by_id = _awaitable(Article.fetch_by_id)
+    fetch_page = _awaitable(Article.fetch_page)
+    search = _awaitable(Article.search, articles=_search_articles)
+    prefetch = _awaitable(Article.prefetch)
+    save_many = _awaitable(Article.save_many)
+    update_many = _awaitable(Article.update_many)
+    delete_many = _awaitable(Article.delete_many)
+    update_where = _awaitable(Article.update_where)
+    delete_where = _awaitable(Article.delete_where)
+    save_to_db = _awaitable(Article.save_to_db)
+    update_to_db = _awaitable(Article.update_to_db)
+    delete_from_db = _awaitable(Article.delete_from_db)
+    author = _awaitable(Article.author.fget)
+    magazine = _awaitable(Article.magazine.fget)
@@ -0,0 +1,295 @@
+"""
+A columnar in-memory snapshot of who wrote what for which magazine.
+
+The snapshot holds ``articles(id, author_id, magazine_id)`` as three typed
+arrays (8 bytes per value) plus article counts per magazine and author, and
+answers aggregate questions over the whole graph without a query per author
+or magazine. The aggregation is plain Python over those arrays with
+``collections.Counter``; nothing here is vectorized.
+"""
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from database.change_log import changes_since, latest_seq
+from database.connection import DEFAULT_BATCH_SIZE, db_connection, iter_batches
+from database.instrumentation import instrumented
+
+# Missing author or magazine IDs are stored as 0, which AUTOINCREMENT never assigns.
+MISSING = 0
+# Deleted articles keep their slot, marked with -1, until the arrays are compacted.
+DELETED = -1
+
+
+class ArticleSnapshot:
+    def __init__(self):
+        """
+        Initialize an empty snapshot; call ``refresh`` to load it.
+        """
+        self.ids = array("q")
+        self.author_ids = array("q")
+        self.magazine_ids = array("q")
+        self.seq = None
+        self.deleted = 0
+        self._pairs = {}
+
+    @staticmethod
+    @instrumented
+    def load(batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Read every article's ID, author ID and magazine ID in one pass.
+
+        Args:
+            batch_size (int): The number of rows fetched from SQLite at a time.
+
+        Returns:
+            ArticleSnapshot: The loaded snapshot.
+        """
+        snapshot = ArticleSnapshot()
+        snapshot.refresh(batch_size)
+        return snapshot
+
+    def __len__(self):
+        return len(self.ids) - self.deleted
+
+    @property
+    def last_id(self):
+        return self.ids[-1] if self.ids else 0
+
+    @property
+    def nbytes(self):
+        return sum(len(column) * column.itemsize for column in (self.ids, self.author_ids, self.magazine_ids))
+
+    @instrumented
+    def refresh(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Bring the snapshot up to date with the database.
+
+        Article inserts, deletes and author or magazine changes logged in
+        ``change_log`` after ``seq`` are applied in place, so the cost follows
+        the number of changes, not the size of the table. The snapshot is
+        read in full on first load, if those changes were compacted away, or
+        if an article was inserted with an ID below ``last_id``.
+
+        Args:
+            batch_size (int): The number of rows or changes read at a time.
+
+        Returns:
+            int: The number of articles read by a full load, otherwise the
+            number of logged changes applied.
+        """
+        if self.seq is not None:
+            applied = self._catch_up(batch_size)
+            if applied is not None:
+                return applied
+        return self._reload(batch_size)
+
+    def author_article_counts(self):
+        """
+        Count the articles of every author.
+
+        Returns:
+            dict: A mapping of author ID to article count.
+        """
+        return _totals(self.author_ids)
+
+    def magazine_article_counts(self):
+        """
+        Count the articles of every magazine.
+
+        Returns:
+            dict: A mapping of magazine ID to article count.
+        """
+        return _totals(self.magazine_ids)
+
+    def contributor_counts(self):
+        """
+        Count the distinct authors of every magazine.
+
+        Returns:
+            dict: A mapping of magazine ID to the number of its authors.
+        """
+        return {magazine_id: len(authors) for magazine_id, authors in sorted(self._pairs.items())}
+
+    def magazine_counts(self):
+        """
+        Count the distinct magazines of every author.
+
+        Returns:
+            dict: A mapping of author ID to the number of magazines they wrote for.
+        """
+        counts = Counter(author_id for authors in self._pairs.values() for author_id in authors)
+        return dict(sorted(counts.items()))
+
+    def contributors(self, magazine_id):
+        """
+        List the authors who wrote for a magazine.
+
+        Returns:
+            list: Author IDs, in ascending order.
+        """
+        return sorted(self._pairs.get(magazine_id, ()))
+
+    def authors_with_more_than(self, count, magazine_id=None):
+        """
+        Find the authors with more than ``count`` articles in a magazine.
+
+        Args:
+            count (int): The number of articles an author must exceed.
+            magazine_id (int): Only this magazine, or None for every magazine.
+
+        Returns:
+            dict: A mapping of magazine ID to author IDs in ascending order, or
+            just the list of author IDs when ``magazine_id`` is given.
+        """
+        if magazine_id is not None:
+            authors = self._pairs.get(magazine_id, {})
+            return sorted(author_id for author_id, articles in authors.items() if articles > count)
+        found = {}
+        for magazine, authors in sorted(self._pairs.items()):
+            matching = sorted(author_id for author_id, articles in authors.items() if articles > count)
+            if matching:
+                found[magazine] = matching
+        return found
+
+    def top_authors(self, limit=10, magazine_id=None):
+        """
+        Rank authors by article count, overall or within one magazine.
+
+        Args:
+            limit (int): The number of authors to return.
+            magazine_id (int): Rank within this magazine, or None for all of them.
+
+        Returns:
+            list: ``(author_id, count)`` pairs, most articles first, ties by ID.
+        """
+        if magazine_id is None:
+            counts = self.author_article_counts()
+        else:
+            counts = self._pairs.get(magazine_id, {})
+        return _top(counts, limit)
+
+    def top_magazines(self, limit=10):
+        """
+        Rank magazines by article count.
+
+        Returns:
+            list: ``(magazine_id, count)`` pairs, most articles first, ties by ID.
+        """
+        return _top(self.magazine_article_counts(), limit)
+
+    def pair_counts(self):
+        """
+        Count the articles of every (magazine, author) pair.
+
+        Returns:
+            Counter: A new mapping of ``(magazine_id, author_id)`` to article count.
+        """
+        return Counter({
+            (magazine_id, author_id): articles
+            for magazine_id, authors in self._pairs.items()
+            for author_id, articles in authors.items()
+        })
+
+    def _reload(self, batch_size):
+        ids, author_ids, magazine_ids = array("q"), array("q"), array("q")
+        with db_connection() as connection:
+            if connection.in_transaction:
+                connection.commit()
+            # One read transaction, so the rows and the log position agree.
+            connection.execute("BEGIN")
+            try:
+                seq = latest_seq(connection)
+                batches = iter_batches(
+                    f"""
+                    SELECT id, COALESCE(author_id, {MISSING}), COALESCE(magazine_id, {MISSING})
+                    FROM articles
+                    ORDER BY id
+                    """,
+                    (),
+                    batch_size,
+                )
+                for rows in batches:
+                    ids.extend(row[0] for row in rows)
+                    author_ids.extend(row[1] for row in rows)
+                    magazine_ids.extend(row[2] for row in rows)
+            finally:
+                connection.commit()
+        self.ids, self.author_ids, self.magazine_ids = ids, author_ids, magazine_ids
+        self.seq = seq
+        self.deleted = 0
+        self._pairs = {}
+        for (magazine_id, author_id), articles in Counter(zip(magazine_ids, author_ids)).items():
+            if magazine_id > MISSING and author_id > MISSING:
+                self._pairs.setdefault(magazine_id, Counter())[author_id] = articles
+        return len(ids)
+
+    def _catch_up(self, batch_size):
+        # Returns None if the snapshot has to be read in full instead.
+        applied = 0
+        while True:
+            try:
+                changes = changes_since(self.seq, batch_size, tables=("articles",))
+            except ValueError:
+                return None
+            if not changes:
+                break
+            for change in changes:
+                if not self._apply(change):
+                    return None
+                self.seq = change["seq"]
+                applied += 1
+        if self.deleted > len(self.ids) // 8:
+            self._compact()
+        return applied
+
+    def _apply(self, change):
+        new = change["new"]
+        if change["operation"] == "insert":
+            if change["row_id"] <= self.last_id:
+                return False
+            self.ids.append(change["row_id"])
+            self.author_ids.append(_id(new["author_id"]))
+            self.magazine_ids.append(_id(new["magazine_id"]))
+            self._add_pair(self.magazine_ids[-1], self.author_ids[-1], 1)
+            return True
+        i = bisect_left(self.ids, change["row_id"])
+        if i == len(self.ids) or self.ids[i] != change["row_id"] or self.author_ids[i] == DELETED:
+            return True
+        if change["operation"] == "delete":
+            author_id = magazine_id = DELETED
+            self.deleted += 1
+        else:
+            author_id, magazine_id = _id(new["author_id"]), _id(new["magazine_id"])
+        if (author_id, magazine_id) != (self.author_ids[i], self.magazine_ids[i]):
+            self._add_pair(self.magazine_ids[i], self.author_ids[i], -1)
+            self._add_pair(magazine_id, author_id, 1)
+            self.author_ids[i], self.magazine_ids[i] = author_id, magazine_id
+        return True
+
+    def _add_pair(self, magazine_id, author_id, articles):
+        if magazine_id <= MISSING or author_id <= MISSING:
+            return
+        authors = self._pairs.setdefault(magazine_id, Counter())
+        authors[author_id] += articles
+        if authors[author_id] <= 0:
+            del authors[author_id]
+            if not authors:
+                del self._pairs[magazine_id]
+
+    def _compact(self):
+        live = [i for i, author_id in enumerate(self.author_ids) if author_id != DELETED]
+        self.ids = array("q", (self.ids[i] for i in live))
+        self.author_ids = array("q", (self.author_ids[i] for i in live))
+        self.magazine_ids = array("q", (self.magazine_ids[i] for i in live))
+        self.deleted = 0
+
+
+def _id(value):
+    return MISSING if value is None else value
+
+def _totals(column):
+    return {key: value for key, value in sorted(Counter(column).items()) if key > MISSING}
+
+def _top(counts, limit):
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
@@ -1,6 +1,76 @@
-from database.connection import get_db_connection
+import sqlite3
+import weakref
+
+from database.bulk import (
+    DEFAULT_CHUNK_SIZE, chunked, delete_where, execute_many, insert_many, select_in, update_where,
+)
+from database.connection import DEFAULT_BATCH_SIZE, db_connection, iter_batches
+from database.instrumentation import instrumented
+from database.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from models import write_behind
+from models.changes import (
+    WriteCounters, changed_columns, mark_all_changed, mark_changed, validate_values,
+    write_changes,
+)
+from models.identity_map import IdentityMap
+
+PREFETCH_RELATIONS = ("author", "magazine")
+PAGE_ORDERINGS = ("id", "title")
+COLUMNS = ("id", "title", "content", "author_id", "magazine_id")
+DEFAULT_SEARCH_LIMIT = 20
+
+# Placeholder for a column left out of the query that loaded an article.
+_DEFERRED = object()
+# Starts of the messages SQLite raises for a malformed FTS5 query.
+_QUERY_ERRORS = ("fts5: ", "unterminated string", "unknown special query", "expected integer")
+
+
+class _DeferredColumns:
+    """
+    The columns one query left out, loaded for all of its articles on first access.
+
+    Articles are held through weak references, so keeping one article of a
+    streamed batch does not keep the rest of the batch alive.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.members = []
+
+    def add(self, article):
+        self.members.append(weakref.ref(article))
+
+    def load(self):
+        members, self.members = self.members, []
+        articles = [article for article in (member() for member in members) if article is not None]
+        by_id = {article.id: article for article in articles}
+        rows = select_in(
+            "SELECT id, {} FROM articles WHERE id IN ({{}})".format(", ".join(self.columns)),
+            by_id,
+        )
+        for row in rows:
+            article = by_id[row["id"]]
+            for column in self.columns:
+                if getattr(article, "_" + column) is _DEFERRED:
+                    setattr(article, "_" + column, row[column])
+        for article in articles:
+            article._deferred = None
+            for column in self.columns:
+                if getattr(article, "_" + column) is _DEFERRED:
+                    setattr(article, "_" + column, None)
+
 
 class Article:
+    __slots__ = (
+        "id", "_title", "_content", "_author_id", "_magazine_id", "_deferred", "_prefetched", "_changed",
+        "__weakref__",
+    )
+
+    identity_map = IdentityMap()
+    write_counters = WriteCounters()
+    _table = "articles"
+    _write_columns = ("title", "content", "author_id", "magazine_id")
+
     def __init__(self, id, title, content, author_id, magazine_id):
         """
         Initialize an Article instance.
@@ -15,11 +85,39 @@ class Article:
         if id is not None and not isinstance(id, int):
             raise ValueError("ID must be None or an integer.")
         self.id = id
+        mark_all_changed(self)
+        self._deferred = None
         self._validate_title(title)
         self._title = title
-        self.content = content
-        self.author_id = author_id
-        self.magazine_id = magazine_id
+        self._content = content
+        self._author_id = author_id
+        self._magazine_id = magazine_id
+        self._prefetched = {}
+
+    @staticmethod
+    def from_row(row):
+        """
+        Build an Article from a database row without re-running validation.
+
+        Rows read back from the database already passed validation when they
+        were written, so this skips ``__init__`` and fills the slots directly.
+
+        Args:
+            row (sqlite3.Row or tuple): The columns (id, title, content, author_id, magazine_id), in that order.
+
+        Returns:
+            Article: The Article instance.
+        """
+        article = Article.__new__(Article)
+        article.id = row[0]
+        article._title = row[1]
+        article._content = row[2]
+        article._author_id = row[3]
+        article._magazine_id = row[4]
+        article._deferred = None
+        article._prefetched = {}
+        article._changed = None
+        return article
 
     def __repr__(self):
         return f'<Article {getattr(self, "title", "No Title")}>'
@@ -37,9 +135,94 @@ class Article:
         if not isinstance(title, str) or not (5 <= len(title) <= 50):
             raise ValueError("Title must be a string between 5 and 50 characters.")
 
+    @staticmethod
+    def projection(only=None, defer=None):
+        """
+        Resolve ``only=``/``defer=`` options into the columns to select and to defer.
+
+        Args:
+            only (iterable): The columns to load; ``id`` is always loaded.
+            defer (iterable): The columns to leave out.
+
+        Returns:
+            tuple: The selected columns and the deferred columns.
+
+        Raises:
+            ValueError: If both options are given or a column is unknown.
+        """
+        if only is not None and defer is not None:
+            raise ValueError("Pass either only= or defer=, not both.")
+        requested = only if only is not None else defer or ()
+        if isinstance(requested, str):
+            requested = (requested,)
+        unknown = set(requested) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown article columns: {', '.join(sorted(unknown))}.")
+        if only is not None:
+            deferred = tuple(c for c in COLUMNS if c != "id" and c not in requested)
+        else:
+            if "id" in requested:
+                raise ValueError("The id column cannot be deferred.")
+            deferred = tuple(c for c in COLUMNS if c in requested)
+        return tuple(c for c in COLUMNS if c not in deferred), deferred
+
+    @staticmethod
+    def hydrate(rows, deferred=()):
+        """
+        Build articles from query rows, leaving deferred columns to load lazily.
+
+        All articles built in one call share a single deferred loader, so the
+        first access to a deferred column fetches it for every one of them
+        with one ``IN (...)`` query.
+
+        Args:
+            rows (list): Rows holding ``id`` and every column not deferred.
+            deferred (tuple): The columns the rows leave out.
+
+        Returns:
+            list: A list of Article instances.
+        """
+        if not deferred:
+            return [Article.from_row(article) for article in rows]
+        group = _DeferredColumns(deferred)
+        articles = []
+        for row in rows:
+            article = Article.__new__(Article)
+            article.id = row["id"]
+            article._deferred = group
+            article._prefetched = {}
+            article._changed = None
+            for column in COLUMNS[1:]:
+                setattr(article, "_" + column, _DEFERRED if column in deferred else row[column])
+            group.add(article)
+            articles.append(article)
+        return articles
+
+    @staticmethod
+    def load_deferred(articles):
+        """
+        Load the deferred columns of articles now instead of on first access.
+
+        Articles hydrated by the same query share one loader, so each group
+        costs a single ``IN (...)`` query.
+
+        Args:
+            articles (iterable): Article instances, with or without deferred columns.
+        """
+        for article in articles:
+            if article._deferred is not None:
+                article._deferred.load()
+
+    def _loaded(self, column):
+        value = getattr(self, "_" + column)
+        if value is _DEFERRED:
+            self._deferred.load()
+            value = getattr(self, "_" + column)
+        return value
+
     @property
     def title(self):
-        return self._title
+        return self._loaded("title")
 
     @title.setter
     def title(self, value):
@@ -50,73 +233,159 @@ class Article:
             value (str): The new title of the article.
         """
         self._validate_title(value)  # Validate the new title
-        self._title = value  # Update the title
+        if value != self._title:
+            self._title = value  # Update the title
+            mark_changed(self, "title")
+
+    @property
+    def content(self):
+        return self._loaded("content")
 
+    @content.setter
+    def content(self, value):
+        if value != self._content:
+            self._content = value
+            mark_changed(self, "content")
+
+    @property
+    def author_id(self):
+        return self._loaded("author_id")
+
+    @author_id.setter
+    def author_id(self, value):
+        if value != self._author_id:
+            self._author_id = value
+            mark_changed(self, "author_id")
+
+    @property
+    def magazine_id(self):
+        return self._loaded("magazine_id")
+
+    @magazine_id.setter
+    def magazine_id(self, value):
+        if value != self._magazine_id:
+            self._magazine_id = value
+            mark_changed(self, "magazine_id")
+
+    @instrumented
     def save_to_db(self):
         """
         Save the article to the database. If the article already has an ID, it raises an error.
 
+        When write-behind mode is enabled the write is queued instead and a
+        Future resolving to the ID is returned.
+
         Raises:
             AttributeError: If the article has already been saved.
         """
         if hasattr(self, 'id') and self.id is not None:
             raise AttributeError("Article already saved to the database.")
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            INSERT INTO articles (title, content, author_id, magazine_id)
-            VALUES (?, ?, ?, ?)
-            """,
-            (self.title, self.content, self.author_id, self.magazine_id),
-        )
-        connection.commit()
-        self.id = cursor.lastrowid
-        connection.close()
+        writer = write_behind.active_writer()
+        if writer is not None:
+            return writer.save(self)
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                """
+                INSERT INTO articles (title, content, author_id, magazine_id)
+                VALUES (?, ?, ?, ?)
+                """,
+                (self.title, self.content, self.author_id, self.magazine_id),
+            )
+            connection.commit()
+            self.id = cursor.lastrowid
 
+    @instrumented
     def update_to_db(self):
         """
         Update the article details in the database.
 
+        Only the columns changed since the article was loaded or last written
+        are sent, so an unchanged ``content`` is never rewritten. If nothing
+        changed, nothing is written or queued and the skip is counted in
+        ``Article.write_counters``.
+
+        When write-behind mode is enabled the write is queued instead and a
+        Future resolving to the ID is returned. The changes stay marked until
+        the write commits, so a failed one can be retried; a skipped update
+        returns a Future that has already resolved.
+
         Raises:
             ValueError: If the article does not exist in the database.
         """
         if not self.id:
             raise ValueError("Article must exist in the database to update.")
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            UPDATE articles
-            SET title = ?, content = ?, author_id = ?, magazine_id = ?
-            WHERE id = ?
-            """,
-            (self.title, self.content, self.author_id, self.magazine_id, self.id),
-        )
-        connection.commit()
-        connection.close()
+        columns = changed_columns(self)
+        writer = write_behind.active_writer()
+        if writer is not None:
+            if not columns:
+                Article.write_counters.record(())
+                return write_behind.completed(self.id)
+            return writer.update(self, columns=columns)
+        write_changes(Article, [self])
 
     @staticmethod
-    def fetch_all():
+    @instrumented
+    def fetch_all(prefetch=(), only=None, defer=None):
         """
         Fetch all articles from the database.
 
+        Args:
+            prefetch (tuple): Relations to load eagerly, any of "author" and "magazine".
+            only (tuple): Load just these columns; the rest load lazily on first access.
+            defer (tuple): Columns to load lazily on first access, e.g. ("content",).
+
         Returns:
             list: A list of Article instances.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("SELECT * FROM articles")
-        articles = cursor.fetchall()
-        connection.close()
+        columns, deferred = Article.projection(only, defer)
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT {', '.join(columns)} FROM articles")
+            articles = cursor.fetchall()
+        articles = Article.hydrate(articles, deferred)
+        return Article.prefetch(articles, prefetch)
+
+    @staticmethod
+    def iter_all(batch_size=DEFAULT_BATCH_SIZE, only=None, defer=None):
+        """
+        Stream all articles from the database without loading them into a list.
+
+        Args:
+            batch_size (int): The number of rows fetched from SQLite at a time.
+            only (tuple): Load just these columns; the rest load lazily per batch.
+            defer (tuple): Columns to load lazily per batch, e.g. ("content",).
+
+        Yields:
+            Article: The next Article instance.
+        """
+        columns, deferred = Article.projection(only, defer)
+        for rows in iter_batches(f"SELECT {', '.join(columns)} FROM articles", batch_size=batch_size):
+            yield from Article.hydrate(rows, deferred)
+
+    @staticmethod
+    @instrumented
+    def fetch_page(after=None, limit=DEFAULT_PAGE_SIZE, order_by="id"):
+        """
+        Fetch one page of articles using keyset pagination.
+
+        Args:
+            after (str): The cursor returned with the previous page, or None for the first page.
+            limit (int): The maximum number of articles in the page.
+            order_by (str): One of id, title; ties are broken by id.
+
+        Returns:
+            tuple: A list of Article instances and the cursor for the next page,
+            or None when this is the last page.
+        """
+        rows, cursor = fetch_page("articles", order_by, PAGE_ORDERINGS, after, limit)
         return [
-            Article(
-                article["id"], article["title"], article["content"],
-                article["author_id"], article["magazine_id"]
-            ) for article in articles
-        ]
+            Article.from_row(article)
+            for article in rows
+        ], cursor
 
     @staticmethod
+    @instrumented
     def fetch_by_id(article_id):
         """
         Fetch an article by its ID.
@@ -127,34 +396,270 @@ class Article:
         Returns:
             Article: The Article instance or None if not found.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("SELECT * FROM articles WHERE id = ?", (article_id,))
-        article_data = cursor.fetchone()
-        connection.close()
+        cached = Article.identity_map.get(article_id)
+        if cached is not None:
+            return cached
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT * FROM articles WHERE id = ?", (article_id,))
+            article_data = cursor.fetchone()
         if article_data:
-            return Article(
-                article_data["id"], article_data["title"], article_data["content"],
-                article_data["author_id"], article_data["magazine_id"]
-            )
+            return Article.identity_map.add(Article.from_row(article_data))
         return None
 
+    @instrumented
     def delete_from_db(self):
         """
         Delete the article from the database.
 
+        When write-behind mode is enabled the write is queued instead and a
+        Future resolving to the ID is returned.
+
         Raises:
             ValueError: If the article has not been saved to the database.
         """
         if not self.id:
             raise ValueError("Article must exist in the database to be deleted.")
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("DELETE FROM articles WHERE id = ?", (self.id,))
-        connection.commit()
-        connection.close()
+        writer = write_behind.active_writer()
+        if writer is not None:
+            return writer.delete(self)
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("DELETE FROM articles WHERE id = ?", (self.id,))
+            connection.commit()
+        Article.identity_map.invalidate(self.id)
+
+    @staticmethod
+    @instrumented
+    def save_many(articles, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Save many new articles with one INSERT transaction per chunk.
+
+        Args:
+            articles (iterable): Unsaved Article instances.
+            chunk_size (int): The number of rows written per transaction.
+
+        Returns:
+            list: The saved Article instances, with their IDs filled in.
+
+        Raises:
+            AttributeError: If any article has already been saved.
+        """
+        articles = list(articles)
+        if any(article.id is not None for article in articles):
+            raise AttributeError("Article already saved to the database.")
+        for chunk in chunked(articles, chunk_size):
+            ids = insert_many(
+                "articles", ("title", "content", "author_id", "magazine_id"),
+                [(article.title, article.content, article.author_id, article.magazine_id,) for article in chunk],
+            )
+            for article, article_id in zip(chunk, ids):
+                article.id = article_id
+        return articles
+
+    @staticmethod
+    @instrumented
+    def update_many(articles, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Update many saved articles with one UPDATE transaction per chunk.
+
+        Only changed columns are written; unchanged articles are skipped.
+
+        Args:
+            articles (iterable): Saved Article instances.
+            chunk_size (int): The number of rows written per transaction.
+
+        Returns:
+            int: The number of rows updated.
+
+        Raises:
+            ValueError: If any article does not exist in the database.
+        """
+        articles = list(articles)
+        if not all(article.id for article in articles):
+            raise ValueError("Article must exist in the database to update.")
+        updated = 0
+        for chunk in chunked(articles, chunk_size):
+            updated += write_changes(Article, chunk)
+        return updated
+
+    @staticmethod
+    @instrumented
+    def delete_many(article_ids, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Delete many articles by ID with one DELETE transaction per chunk.
+
+        Args:
+            article_ids (iterable): The IDs of the articles to delete.
+            chunk_size (int): The number of rows deleted per transaction.
+
+        Returns:
+            int: The number of rows deleted.
+        """
+        deleted = 0
+        for chunk in chunked(article_ids, chunk_size):
+            deleted += execute_many(
+                "DELETE FROM articles WHERE id = ?",
+                [(article_id,) for article_id in chunk],
+            )
+            for article_id in chunk:
+                Article.identity_map.invalidate(article_id)
+        return deleted
+
+    @staticmethod
+    @instrumented
+    def update_where(values, **conditions):
+        """
+        Set columns on every article matching the conditions with a single UPDATE statement.
+
+        For example ``Article.update_where({"author_id": new_id}, author_id=old_id)``
+        reassigns all of an author's articles.
+
+        Args:
+            values (dict): A mapping of column to its new value; each value is validated.
+            **conditions: ``column=value`` filters, ANDed together; a list, tuple
+                or set matches any of its values and None matches NULL.
+
+        Returns:
+            int: The number of articles updated.
+
+        Raises:
+            ValueError: If there are no conditions, a column is unknown or a value is invalid.
+        """
+        validate_values(Article, values)
+        writer = write_behind.active_writer()
+        if writer is not None:
+            writer.flush()
+        updated = update_where("articles", COLUMNS, values, conditions)
+        Article.identity_map.clear()
+        return updated
+
+    @staticmethod
+    @instrumented
+    def delete_where(**conditions):
+        """
+        Delete every article matching the conditions with a single DELETE statement.
+
+        For example ``Article.delete_where(magazine_id=magazine.id)``.
+
+        Args:
+            **conditions: ``column=value`` filters, ANDed together; a list, tuple
+                or set matches any of its values and None matches NULL.
+
+        Returns:
+            int: The number of articles deleted.
+
+        Raises:
+            ValueError: If there are no conditions or a column is unknown.
+        """
+        writer = write_behind.active_writer()
+        if writer is not None:
+            writer.flush()
+        deleted = delete_where("articles", COLUMNS, conditions)
+        Article.identity_map.clear()
+        return deleted
+
+    @staticmethod
+    @instrumented
+    def search(query, limit=DEFAULT_SEARCH_LIMIT, magazine_id=None, author_id=None):
+        """
+        Find articles whose title or content match a full-text query.
+
+        Results come from the ``articles_fts`` index ordered by relevance
+        (BM25); article content is deferred until first accessed.
+
+        Args:
+            query (str): An FTS5 query, e.g. ``'python AND sqlite'`` or ``'data*'``.
+            limit (int): The maximum number of results.
+            magazine_id (int): Only match articles in this magazine.
+            author_id (int): Only match articles by this author.
+
+        Returns:
+            list: ``(Article, snippet)`` tuples, best match first, where the
+            snippet highlights matches in ``[`` and ``]``.
+
+        Raises:
+            ValueError: If the query is not valid FTS5 syntax.
+        """
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError("Search limit must be a positive integer.")
+        conditions = ["articles_fts MATCH ?"]
+        params = [query]
+        if magazine_id is not None:
+            conditions.append("articles.magazine_id = ?")
+            params.append(magazine_id)
+        if author_id is not None:
+            conditions.append("articles.author_id = ?")
+            params.append(author_id)
+        params.append(limit)
+        try:
+            with db_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(
+                    f"""
+                    SELECT articles.id, articles.title, articles.author_id, articles.magazine_id,
+                           snippet(articles_fts, -1, '[', ']', '...', 16) AS snippet
+                    FROM articles_fts
+                    JOIN articles ON articles.id = articles_fts.rowid
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY articles_fts.rank
+                    LIMIT ?
+                    """,
+                    params,
+                )
+                rows = cursor.fetchall()
+        except sqlite3.OperationalError as error:
+            if not _is_query_error(error, query):
+                raise
+            raise ValueError(f"Invalid search query: {error}")
+        articles = Article.hydrate(rows, ("content",))
+        return [(article, row["snippet"]) for article, row in zip(articles, rows)]
+
+    @staticmethod
+    @instrumented
+    def prefetch(articles, relations=PREFETCH_RELATIONS):
+        """
+        Load the related authors and/or magazines of many articles at once.
+
+        Each relation costs one ``IN (...)`` query per parameter-limit chunk
+        instead of one query per article; afterwards the ``author`` and
+        ``magazine`` properties answer without touching the database.
+
+        Args:
+            articles (list): Article instances.
+            relations (tuple): Any of "author" and "magazine".
+
+        Returns:
+            list: The same articles.
+
+        Raises:
+            ValueError: If an unknown relation is requested.
+        """
+        from models.author import Author
+        from models.magazine import Magazine
+        if isinstance(relations, str):
+            relations = (relations,)
+        unknown = set(relations) - set(PREFETCH_RELATIONS)
+        if unknown:
+            raise ValueError(f"Cannot prefetch unknown relations: {', '.join(sorted(unknown))}.")
+        if "author" in relations:
+            authors = Author.fetch_many_by_ids(article.author_id for article in articles)
+            for article in articles:
+                article._prefetched["author"] = (article.author_id, authors.get(article.author_id))
+        if "magazine" in relations:
+            magazines = Magazine.fetch_many_by_ids(article.magazine_id for article in articles)
+            for article in articles:
+                article._prefetched["magazine"] = (article.magazine_id, magazines.get(article.magazine_id))
+        return articles
+
+    def _cached_relation(self, relation, key):
+        loaded = self._prefetched.get(relation)
+        if loaded is not None and loaded[0] == key:
+            return True, loaded[1]
+        return False, None
 
     @property
+    @instrumented
     def author(self):
         """
         Fetch the author of the article.
@@ -162,24 +667,28 @@ class Article:
         Returns:
             Author: The Author instance associated with this article.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            SELECT authors.id, authors.name
-            FROM authors
-            JOIN articles ON authors.id = articles.author_id
-            WHERE articles.id = ?
-            """,
-            (self.id,),
-        )
-        author_data = cursor.fetchone()
-        connection.close()
+        from models.author import Author
+        loaded, author = self._cached_relation("author", self.author_id)
+        if loaded:
+            return author
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                """
+                SELECT authors.id, authors.name
+                FROM authors
+                JOIN articles ON authors.id = articles.author_id
+                WHERE articles.id = ?
+                """,
+                (self.id,),
+            )
+            author_data = cursor.fetchone()
         if author_data:
-            return Author(author_data["id"], author_data["name"])
+            return Author.from_row(author_data)
         return None
 
     @property
+    @instrumented
     def magazine(self):
         """
         Fetch the magazine of the article.
@@ -187,21 +696,31 @@ class Article:
         Returns:
             Magazine: The Magazine instance associated with this article.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            SELECT magazines.id, magazines.name, magazines.category
-            FROM magazines
-            JOIN articles ON magazines.id = articles.magazine_id
-            WHERE articles.id = ?
-            """,
-            (self.id,),
-        )
-        magazine_data = cursor.fetchone()
-        connection.close()
-        if magazine_data:
-            return Magazine(
-                magazine_data["id"], magazine_data["name"], magazine_data["category"]
+        from models.magazine import Magazine
+        loaded, magazine = self._cached_relation("magazine", self.magazine_id)
+        if loaded:
+            return magazine
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                """
+                SELECT magazines.id, magazines.name, magazines.category
+                FROM magazines
+                JOIN articles ON magazines.id = articles.magazine_id
+                WHERE articles.id = ?
+                """,
+                (self.id,),
             )
+            magazine_data = cursor.fetchone()
+        if magazine_data:
+            return Magazine.from_row(magazine_data)
         return None
+
+
+def _is_query_error(error, query):
+    message = str(error)
+    if message.startswith(_QUERY_ERRORS):
+        return True
+    # A ``column:term`` filter naming an unknown column, e.g. ``author:smith``.
+    prefix = "no such column: "
+    return message.startswith(prefix) and message[len(prefix):] in query
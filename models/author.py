@@ -1,6 +1,29 @@
-from database.connection import get_db_connection
+from contextlib import nullcontext
+
+from database.bulk import (
+    DEFAULT_CHUNK_SIZE, chunked, delete_where, execute_many, foreign_keys, immediate_transaction, insert_many,
+    select_in,
+)
+from database.connection import DEFAULT_BATCH_SIZE, db_connection, iter_batches, iter_rows
+from database.instrumentation import instrumented
+from database.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from models import write_behind
+from models.changes import WriteCounters, changed_columns, mark_all_changed, write_changes
+from models.identity_map import IdentityMap, LRUCache
+from models.result_cache import cached_result
+
+PAGE_ORDERINGS = ("id", "name")
+ARTICLE_PAGE_ORDERINGS = ("id", "title")
 
 class Author:
+    __slots__ = ("id", "_name", "_changed")
+
+    identity_map = IdentityMap()
+    name_cache = LRUCache()
+    write_counters = WriteCounters()
+    _table = "authors"
+    _write_columns = ("name",)
+
     def __init__(self, id, name):
         """
         Initialize an Author instance.
@@ -12,9 +35,30 @@ class Author:
         if id is not None and not isinstance(id, int):
             raise ValueError("ID must be None or an integer.")
         self.id = id
+        mark_all_changed(self)
         self._validate_name(name)
         self._name = name
 
+    @staticmethod
+    def from_row(row):
+        """
+        Build an Author from a database row without re-running validation.
+
+        Rows read back from the database already passed validation when they
+        were written, so this skips ``__init__`` and fills the slots directly.
+
+        Args:
+            row (sqlite3.Row or tuple): The columns (id, name), in that order.
+
+        Returns:
+            Author: The Author instance.
+        """
+        author = Author.__new__(Author)
+        author.id = row[0]
+        author._name = row[1]
+        author._changed = None
+        return author
+
     def __repr__(self):
         return f'<Author {self.name}>'
 
@@ -52,43 +96,60 @@ class Author:
         self._name = value
 
 #CREATE
+    @instrumented
     def save_to_db(self):
         """
         Save the author to the database. If the author already has an ID, it raises an error.
 
+        When write-behind mode is enabled the write is queued instead and a
+        Future resolving to the ID is returned.
+
         Raises:
             AttributeError: If the author has already been saved.
         """
         if hasattr(self, 'id') and self.id is not None:
             raise AttributeError("Author already saved to the database.")
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("INSERT INTO authors (name) VALUES (?)", (self.name,))
-        connection.commit()
-        self.id = cursor.lastrowid
-        connection.close()
+        writer = write_behind.active_writer()
+        if writer is not None:
+            return writer.save(self)
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("INSERT INTO authors (name) VALUES (?)", (self.name,))
+            connection.commit()
+            self.id = cursor.lastrowid
 
 #UPDATE
+    @instrumented
     def update_to_db(self):
         """
         Update the author's details in the database.
 
+        Only the columns changed since the author was loaded or last written
+        are sent. If nothing changed, nothing is written or queued and the
+        skip is counted in ``Author.write_counters``.
+
+        When write-behind mode is enabled the write is queued instead and a
+        Future resolving to the ID is returned. The changes stay marked until
+        the write commits, so a failed one can be retried; a skipped update
+        returns a Future that has already resolved.
+
         Raises:
             ValueError: If the author does not exist in the database.
         """
         if not self.id:
             raise ValueError("Author must exist in the database to update.")
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            "UPDATE authors SET name = ? WHERE id = ?",
-            (self.name, self.id),
-        )
-        connection.commit()
-        connection.close()
+        columns = changed_columns(self)
+        writer = write_behind.active_writer()
+        if writer is not None:
+            if not columns:
+                Author.write_counters.record(())
+                return write_behind.completed(self.id)
+            return writer.update(self, columns=columns)
+        write_changes(Author, [self])
 
 #READ ALL 
     @staticmethod
+    @instrumented
     def fetch_all():
         """
         Fetch all authors from the database.
@@ -96,15 +157,50 @@ class Author:
         Returns:
             list: A list of Author instances.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("SELECT * FROM authors")
-        authors = cursor.fetchall()
-        connection.close()
-        return [Author(author["id"], author["name"]) for author in authors]
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT * FROM authors")
+            authors = cursor.fetchall()
+        return [Author.from_row(author) for author in authors]
+
+    @staticmethod
+    def iter_all(batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Stream all authors from the database without loading them into a list.
+
+        Args:
+            batch_size (int): The number of rows fetched from SQLite at a time.
+
+        Yields:
+            Author: The next Author instance.
+        """
+        for author in iter_rows("SELECT * FROM authors", batch_size=batch_size):
+            yield Author.from_row(author)
+
+    @staticmethod
+    @instrumented
+    def fetch_page(after=None, limit=DEFAULT_PAGE_SIZE, order_by="id"):
+        """
+        Fetch one page of authors using keyset pagination.
+
+        Args:
+            after (str): The cursor returned with the previous page, or None for the first page.
+            limit (int): The maximum number of authors in the page.
+            order_by (str): One of id, name; ties are broken by id.
+
+        Returns:
+            tuple: A list of Author instances and the cursor for the next page,
+            or None when this is the last page.
+        """
+        rows, cursor = fetch_page("authors", order_by, PAGE_ORDERINGS, after, limit)
+        return [
+            Author.from_row(author)
+            for author in rows
+        ], cursor
 
 #READ SINGLE
     @staticmethod
+    @instrumented
     def fetch_by_id(author_id):
         """
         Fetch an author by their ID.
@@ -115,56 +211,329 @@ class Author:
         Returns:
             Author: The Author instance or None if not found.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("SELECT * FROM authors WHERE id = ?", (author_id,))
-        author_data = cursor.fetchone()
-        connection.close()
+        cached = Author.identity_map.get(author_id)
+        if cached is not None:
+            return cached
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT * FROM authors WHERE id = ?", (author_id,))
+            author_data = cursor.fetchone()
         if author_data:
-            return Author(author_data["id"], author_data["name"])
+            return Author.identity_map.add(Author.from_row(author_data))
         return None
+
+    @staticmethod
+    @instrumented
+    def fetch_many_by_ids(author_ids):
+        """
+        Fetch many authors by ID with one ``IN (...)`` query per parameter-limit chunk.
+
+        Authors already in the identity map are not queried again.
+
+        Args:
+            author_ids (iterable): The IDs of the authors to fetch.
+
+        Returns:
+            dict: A mapping of ID to Author instance for every ID that exists.
+        """
+        found = {}
+        missing = []
+        for author_id in dict.fromkeys(author_ids):
+            if author_id is None:
+                continue
+            cached = Author.identity_map.get(author_id)
+            if cached is not None:
+                found[author_id] = cached
+            else:
+                missing.append(author_id)
+        for row in select_in("SELECT * FROM authors WHERE id IN ({})", missing):
+            found[row["id"]] = Author.identity_map.add(Author.from_row(row))
+        return found
+
+    @staticmethod
+    @instrumented
+    def get_or_create(name):
+        """
+        Fetch the author with this name, inserting it first if there is none.
+
+        Names are unique, so concurrent callers converge on the same row via
+        ``INSERT ... ON CONFLICT DO NOTHING``. Resolved IDs are kept in a
+        bounded name -> ID cache, so repeat lookups skip the name query.
+
+        Args:
+            name (str): The name of the author.
+
+        Returns:
+            Author: The saved Author instance.
+
+        Raises:
+            ValueError: If the name is not valid.
+        """
+        Author(None, name)
+        author_id = Author.name_cache.get(name)
+        if author_id is not None:
+            author = Author.fetch_by_id(author_id)
+            if author is not None and author.name == name:
+                return author
+            Author.name_cache.invalidate(name)
+        with db_connection() as connection:
+            with immediate_transaction(connection):
+                connection.execute(
+                    "INSERT INTO authors (name) VALUES (?) ON CONFLICT (name) DO NOTHING",
+                    (name,),
+                )
+                row = connection.execute("SELECT * FROM authors WHERE name = ?", (name,)).fetchone()
+        Author.name_cache.put(name, row["id"])
+        return Author.identity_map.add(Author.from_row(row))
 #DELETE
-    def delete_from_db(self):
+    @instrumented
+    def delete_from_db(self, cascade=False):
         """
         Delete the author from the database.
 
+        With ``cascade=True`` its articles are deleted by the same statement
+        through ``ON DELETE CASCADE``; otherwise they are left in place.
+
+        When write-behind mode is enabled the write is queued instead and a
+        Future resolving to the ID is returned. Cascading deletes are not
+        queued: pending writes are flushed and the delete runs at once.
+
+        Args:
+            cascade (bool): Also delete the author's articles.
+
         Raises:
             ValueError: If the author has not been saved to the database.
         """
         if not self.id:
             raise ValueError("Author must exist in the database to be deleted.")
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("DELETE FROM authors WHERE id = ?", (self.id,))
-        connection.commit()
-        connection.close()
+        writer = write_behind.active_writer()
+        if writer is not None:
+            if not cascade:
+                return writer.delete(self)
+            writer.flush()
+        with db_connection() as connection:
+            with foreign_keys(connection) if cascade else nullcontext():
+                cursor = connection.cursor()
+                cursor.execute("DELETE FROM authors WHERE id = ?", (self.id,))
+                connection.commit()
+        Author.identity_map.invalidate(self.id)
+        Author.name_cache.invalidate(self.name)
+        if cascade:
+            from models.article import Article
+            Article.identity_map.clear()
+
+#BULK
+    @staticmethod
+    @instrumented
+    def save_many(authors, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Save many new authors with one INSERT transaction per chunk.
+
+        Args:
+            authors (iterable): Unsaved Author instances.
+            chunk_size (int): The number of rows written per transaction.
+
+        Returns:
+            list: The saved Author instances, with their IDs filled in.
+
+        Raises:
+            AttributeError: If any author has already been saved.
+        """
+        authors = list(authors)
+        if any(author.id is not None for author in authors):
+            raise AttributeError("Author already saved to the database.")
+        for chunk in chunked(authors, chunk_size):
+            ids = insert_many(
+                "authors", ("name",),
+                [(author.name,) for author in chunk],
+            )
+            for author, author_id in zip(chunk, ids):
+                author.id = author_id
+        return authors
+
+    @staticmethod
+    @instrumented
+    def update_many(authors, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Update many saved authors with one UPDATE transaction per chunk.
+
+        Only changed columns are written; unchanged authors are skipped.
+
+        Args:
+            authors (iterable): Saved Author instances.
+            chunk_size (int): The number of rows written per transaction.
+
+        Returns:
+            int: The number of rows updated.
+
+        Raises:
+            ValueError: If any author does not exist in the database.
+        """
+        authors = list(authors)
+        if not all(author.id for author in authors):
+            raise ValueError("Author must exist in the database to update.")
+        updated = 0
+        for chunk in chunked(authors, chunk_size):
+            updated += write_changes(Author, chunk)
+        return updated
+
+    @staticmethod
+    @instrumented
+    def delete_many(author_ids, chunk_size=DEFAULT_CHUNK_SIZE, cascade=False):
+        """
+        Delete many authors by ID with one DELETE transaction per chunk.
+
+        Args:
+            author_ids (iterable): The IDs of the authors to delete.
+            chunk_size (int): The number of rows deleted per transaction.
+            cascade (bool): Also delete their articles through ``ON DELETE CASCADE``.
+
+        Returns:
+            int: The number of authors deleted.
+        """
+        deleted = 0
+        for chunk in chunked(author_ids, chunk_size):
+            deleted += execute_many(
+                "DELETE FROM authors WHERE id = ?",
+                [(author_id,) for author_id in chunk],
+                cascade=cascade,
+            )
+            for author_id in chunk:
+                Author.identity_map.invalidate(author_id)
+        if cascade:
+            from models.article import Article
+            Article.identity_map.clear()
+        return deleted
+
+    @staticmethod
+    @instrumented
+    def delete_where(cascade=False, **conditions):
+        """
+        Delete every author matching the conditions with a single DELETE statement.
+
+        Args:
+            cascade (bool): Also delete their articles through ``ON DELETE CASCADE``.
+            **conditions: ``column=value`` filters, ANDed together; a list, tuple
+                or set matches any of its values and None matches NULL.
+
+        Returns:
+            int: The number of authors deleted.
 
-    def articles(self):
+        Raises:
+            ValueError: If there are no conditions or a column is unknown.
+        """
+        writer = write_behind.active_writer()
+        if writer is not None:
+            writer.flush()
+        deleted = delete_where("authors", ("id",) + Author._write_columns, conditions, cascade=cascade)
+        Author.identity_map.clear()
+        Author.name_cache.clear()
+        if cascade:
+            from models.article import Article
+            Article.identity_map.clear()
+        return deleted
+
+    @instrumented
+    def articles(self, only=None, defer=None):
         """
         Fetch all articles written by this author.
 
+        Args:
+            only (tuple): Load just these article columns; the rest load lazily on first access.
+            defer (tuple): Article columns to load lazily on first access, e.g. ("content",).
+
         Returns:
             list: A list of Article instances.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            SELECT articles.id, articles.title, articles.content, articles.author_id, articles.magazine_id
+        from models.article import Article
+        columns, deferred = Article.projection(only, defer)
+        return Article.hydrate(self._article_rows(columns), deferred)
+
+    @cached_result
+    def _article_rows(self, columns):
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                f"""
+                SELECT {", ".join("articles." + column for column in columns)}
+                FROM articles
+                WHERE articles.author_id = ?
+                """,
+                (self.id,),
+            )
+            return cursor.fetchall()
+
+    def iter_articles(self, batch_size=DEFAULT_BATCH_SIZE, only=None, defer=None):
+        """
+        Stream all articles written by this author without loading them into a list.
+
+        Args:
+            batch_size (int): The number of rows fetched from SQLite at a time.
+            only (tuple): Load just these article columns; the rest load lazily per batch.
+            defer (tuple): Article columns to load lazily per batch, e.g. ("content",).
+
+        Yields:
+            Article: The next Article instance.
+        """
+        from models.article import Article
+        columns, deferred = Article.projection(only, defer)
+        batches = iter_batches(
+            f"""
+            SELECT {", ".join("articles." + column for column in columns)}
             FROM articles
             WHERE articles.author_id = ?
             """,
             (self.id,),
+            batch_size,
+        )
+        for rows in batches:
+            yield from Article.hydrate(rows, deferred)
+
+    @instrumented
+    def articles_page(self, after=None, limit=DEFAULT_PAGE_SIZE, order_by="id"):
+        """
+        Fetch one page of the articles written by this author using keyset pagination.
+
+        Args:
+            after (str): The cursor returned with the previous page, or None for the first page.
+            limit (int): The maximum number of articles in the page.
+            order_by (str): One of id, title; ties are broken by id.
+
+        Returns:
+            tuple: A list of Article instances and the cursor for the next page,
+            or None when this is the last page.
+        """
+        from models.article import Article
+        rows, cursor = fetch_page(
+            "articles", order_by, ARTICLE_PAGE_ORDERINGS, after, limit,
+            where="author_id = ?", params=(self.id,),
         )
-        articles = cursor.fetchall()
-        connection.close()
         return [
-            Article(
-                article["id"], article["title"], article["content"],
-                article["author_id"], article["magazine_id"]
-            ) for article in articles
-        ]
+            Article.from_row(article)
+            for article in rows
+        ], cursor
+
+    @instrumented
+    def article_count(self):
+        """
+        Count the articles written by this author.
+
+        Reads the trigger-maintained ``author_stats`` counter instead of
+        aggregating over ``articles``.
 
+        Returns:
+            int: The number of articles.
+        """
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                "SELECT article_count FROM author_stats WHERE author_id = ?",
+                (self.id,),
+            )
+            row = cursor.fetchone()
+        return row["article_count"] if row else 0
+
+    @instrumented
     def magazines(self):
         """
         Fetch all magazines to which this author has contributed articles.
@@ -172,20 +541,23 @@ class Author:
         Returns:
             list: A list of Magazine instances.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            SELECT DISTINCT magazines.id, magazines.name, magazines.category
-            FROM magazines
-            JOIN articles ON magazines.id = articles.magazine_id
-            WHERE articles.author_id = ?
-            """,
-            (self.id,),
-        )
-        magazines = cursor.fetchall()
-        connection.close()
+        from models.magazine import Magazine
         return [
-            Magazine(magazine["id"], magazine["name"], magazine["category"])
-            for magazine in magazines
+            Magazine.from_row(magazine)
+            for magazine in self._magazine_rows()
         ]
+
+    @cached_result
+    def _magazine_rows(self):
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                """
+                SELECT DISTINCT magazines.id, magazines.name, magazines.category
+                FROM magazines
+                JOIN articles ON magazines.id = articles.magazine_id
+                WHERE articles.author_id = ?
+                """,
+                (self.id,),
+            )
+            return cursor.fetchall()
@@ -0,0 +1,174 @@
+import threading
+
+from database.bulk import immediate_transaction
+from database.connection import db_connection
+
+
+class WriteCounters:
+    """
+    UPDATE statements sent, columns written and no-op updates skipped for one model.
+    """
+
+    def __init__(self):
+        self.updates = 0
+        self.columns = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def record(self, columns):
+        """
+        Count one update of ``columns``, or one skipped update if there are none.
+
+        Args:
+            columns (tuple): The columns written.
+        """
+        with self._lock:
+            if columns:
+                self.updates += 1
+                self.columns += len(columns)
+            else:
+                self.skipped += 1
+
+    def clear(self):
+        """
+        Reset every counter.
+        """
+        with self._lock:
+            self.updates = 0
+            self.columns = 0
+            self.skipped = 0
+
+    def stats(self):
+        """
+        Report the counters.
+
+        Returns:
+            dict: ``updates``, ``columns`` and ``skipped``.
+        """
+        return {"updates": self.updates, "columns": self.columns, "skipped": self.skipped}
+
+
+def mark_changed(instance, column):
+    """
+    Record that a column of a saved instance was set to a new value.
+
+    Unsaved instances are not tracked, since their INSERT writes every column.
+    """
+    if instance.id is None:
+        return
+    if instance._changed is None:
+        instance._changed = set()
+    instance._changed.add(column)
+
+def mark_all_changed(instance):
+    """
+    Record every column of an instance built with a known ID as changed.
+
+    Such an instance did not come from the database, so its values are not
+    known to match the row and ``update_to_db`` must write all of them.
+    """
+    instance._changed = set(type(instance)._write_columns) if instance.id is not None else None
+
+def changed_columns(instance):
+    """
+    Return the columns changed since the instance was loaded or last written.
+
+    Returns:
+        tuple: Column names, in the model's ``_write_columns`` order.
+    """
+    changed = instance._changed
+    if not changed:
+        return ()
+    return tuple(column for column in type(instance)._write_columns if column in changed)
+
+def clear_changes(instance, columns):
+    """
+    Forget the changes to ``columns`` once they have been written.
+    """
+    changed = instance._changed
+    if changed:
+        changed.difference_update(columns)
+        if not changed:
+            instance._changed = None
+
+def update_statement(model, columns):
+    """
+    Build an ``UPDATE ... WHERE id = ?`` of just ``columns`` for a model's table.
+    """
+    return "UPDATE {} SET {} WHERE id = ?".format(
+        model._table, ", ".join(f"{column} = ?" for column in columns)
+    )
+
+def group_by_changes(instances):
+    """
+    Group saved instances by the set of columns they changed.
+
+    Returns:
+        dict: A mapping of column tuple to the instances that changed exactly
+        those columns; unchanged instances are under the empty tuple.
+    """
+    groups = {}
+    for instance in instances:
+        groups.setdefault(changed_columns(instance), []).append(instance)
+    return groups
+
+def write_changes(model, instances):
+    """
+    Write just the changed columns of saved instances in one transaction.
+
+    Instances are grouped by the columns they changed, with one
+    ``executemany`` per group. Unchanged instances send nothing and are
+    counted as skipped in ``model.write_counters``. If the transaction
+    fails, the instances keep their changes for a retry but are dropped
+    from ``model.identity_map``, so later fetches read the stored row.
+
+    Args:
+        model (type): The model class of the instances.
+        instances (list): Saved instances of ``model``.
+
+    Returns:
+        int: The number of rows updated.
+    """
+    groups = group_by_changes(instances)
+    unchanged = groups.pop((), [])
+    updated = 0
+    if groups:
+        try:
+            with db_connection() as connection:
+                with immediate_transaction(connection):
+                    for columns, group in groups.items():
+                        rows = [tuple(getattr(instance, column) for column in columns) + (instance.id,)
+                                for instance in group]
+                        cursor = connection.executemany(update_statement(model, columns), rows)
+                        updated += cursor.rowcount
+        except Exception:
+            # The identity map must not keep values the database rejected.
+            for group in groups.values():
+                for instance in group:
+                    model.identity_map.invalidate(instance.id)
+            raise
+    for columns, group in groups.items():
+        for instance in group:
+            model.write_counters.record(columns)
+            clear_changes(instance, columns)
+            model.identity_map.invalidate(instance.id)
+    for _ in unchanged:
+        model.write_counters.record(())
+    return updated
+
+def validate_values(model, values):
+    """
+    Run a model's ``_validate_<column>`` checks over new column values.
+
+    Args:
+        model (type): The model class.
+        values (dict): A mapping of column to its new value.
+
+    Raises:
+        ValueError: If a value is not valid for its column.
+    """
+    probe = model.__new__(model)
+    for column, value in values.items():
+        validator = getattr(probe, f"_validate_{column}", None)
+        if validator is not None:
+            validator(value)
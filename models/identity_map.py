@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 1024
+
+class LRUCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        """
+        Initialize a bounded key -> value cache with least-recently-used eviction.
+
+        Args:
+            maxsize (int): The maximum number of entries kept.
+        """
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("Cache size must be a positive integer.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Look up a value and mark it as recently used.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The cached value or None if the key is not cached.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Cache a value, evicting the least recently used entry if full.
+
+        Args:
+            key: The cache key.
+            value: The value to cache; None is never cached.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """
+        Drop the entry for a key, if any.
+
+        Args:
+            key: The cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Drop every entry and reset the hit/miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Report the size and hit/miss counters of the cache.
+
+        Returns:
+            dict: ``size``, ``maxsize``, ``hits`` and ``misses``.
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class IdentityMap(LRUCache):
+    """
+    A bounded id -> instance map, so one id resolves to one live instance.
+    """
+
+    def add(self, instance):
+        """
+        Register an instance under its ID, evicting the least recently used entry if full.
+
+        Args:
+            instance: A saved model instance.
+
+        Returns:
+            The instance already registered for that ID, or the given instance.
+        """
+        with self._lock:
+            existing = self._entries.get(instance.id)
+            if existing is not None:
+                self._entries.move_to_end(instance.id)
+                return existing
+            self._entries[instance.id] = instance
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return instance
@@ -1,6 +1,33 @@
-from database.connection import get_db_connection
+import sqlite3
+from contextlib import nullcontext
+
+from database.bulk import (
+    DEFAULT_CHUNK_SIZE, chunked, delete_where, execute_many, foreign_keys, immediate_transaction, insert_many,
+    select_in, update_where,
+)
+from database.connection import DEFAULT_BATCH_SIZE, db_connection, iter_batches, iter_rows
+from database.instrumentation import instrumented
+from database.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from models import write_behind
+from models.changes import (
+    WriteCounters, changed_columns, mark_all_changed, mark_changed, validate_values,
+    write_changes,
+)
+from models.identity_map import IdentityMap, LRUCache
+from models.result_cache import cached_result
+
+PAGE_ORDERINGS = ("id", "name")
+ARTICLE_PAGE_ORDERINGS = ("id", "title")
 
 class Magazine:
+    __slots__ = ("id", "_name", "_category", "_changed")
+
+    identity_map = IdentityMap()
+    name_cache = LRUCache()
+    write_counters = WriteCounters()
+    _table = "magazines"
+    _write_columns = ("name", "category")
+
     def __init__(self, id, name, category):
         """
         Initialize a Magazine instance.
@@ -13,11 +40,33 @@ class Magazine:
         if id is not None and not isinstance(id, int):
             raise ValueError("ID must be None or an integer.")
         self.id = id
+        mark_all_changed(self)
         self._validate_name(name)
         self._validate_category(category)
         self._name = name
         self._category = category
 
+    @staticmethod
+    def from_row(row):
+        """
+        Build a Magazine from a database row without re-running validation.
+
+        Rows read back from the database already passed validation when they
+        were written, so this skips ``__init__`` and fills the slots directly.
+
+        Args:
+            row (sqlite3.Row or tuple): The columns (id, name, category), in that order.
+
+        Returns:
+            Magazine: The Magazine instance.
+        """
+        magazine = Magazine.__new__(Magazine)
+        magazine.id = row[0]
+        magazine._name = row[1]
+        magazine._category = row[2]
+        magazine._changed = None
+        return magazine
+
     def __repr__(self):
         return f'<Magazine {self.name}>'
 
@@ -60,7 +109,9 @@ class Magazine:
             value (str): The new name of the magazine.
         """
         self._validate_name(value)
-        self._name = value
+        if value != self._name:
+            self._name = value
+            mark_changed(self, "name")
 
     @property
     def category(self):
@@ -75,46 +126,65 @@ class Magazine:
             value (str): The new category of the magazine.
         """
         self._validate_category(value)
-        self._category = value
+        if value != self._category:
+            self._category = value
+            mark_changed(self, "category")
 
+    @instrumented
     def save_to_db(self):
         """
         Save the magazine to the database. If the magazine already has an ID, it raises an error.
 
+        When write-behind mode is enabled the write is queued instead and a
+        Future resolving to the ID is returned.
+
         Raises:
             AttributeError: If the magazine has already been saved.
         """
         if hasattr(self, 'id') and self.id is not None:
             raise AttributeError("Magazine already saved to the database.")
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            "INSERT INTO magazines (name, category) VALUES (?, ?)",
-            (self.name, self.category),
-        )
-        connection.commit()
-        self.id = cursor.lastrowid
-        connection.close()
+        writer = write_behind.active_writer()
+        if writer is not None:
+            return writer.save(self)
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                "INSERT INTO magazines (name, category) VALUES (?, ?)",
+                (self.name, self.category),
+            )
+            connection.commit()
+            self.id = cursor.lastrowid
 
+    @instrumented
     def update_to_db(self):
         """
         Update the magazine details in the database.
 
+        Only the columns changed since the magazine was loaded or last written
+        are sent. If nothing changed, nothing is written or queued and the
+        skip is counted in ``Magazine.write_counters``.
+
+        When write-behind mode is enabled the write is queued instead and a
+        Future resolving to the ID is returned. The changes stay marked until
+        the write commits, so a failed one can be retried; a skipped update
+        returns a Future that has already resolved.
+
         Raises:
             ValueError: If the magazine does not exist in the database.
         """
         if not self.id:
             raise ValueError("Magazine must exist in the database to update.")
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            "UPDATE magazines SET name = ?, category = ? WHERE id = ?",
-            (self.name, self.category, self.id),
-        )
-        connection.commit()
-        connection.close()
+        columns = changed_columns(self)
+        writer = write_behind.active_writer()
+        if writer is not None:
+            if not columns:
+                Magazine.write_counters.record(())
+                return write_behind.completed(self.id)
+            return writer.update(self, columns=columns)
+        write_changes(Magazine, [self])
 
     @staticmethod
+    @instrumented
     def fetch_all():
         """
         Fetch all magazines from the database.
@@ -122,18 +192,53 @@ class Magazine:
         Returns:
             list: A list of Magazine instances.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("SELECT * FROM magazines")
-        magazines = cursor.fetchall()
-        connection.close()
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT * FROM magazines")
+            magazines = cursor.fetchall()
         return [
-            Magazine(magazine["id"],magazine["name"],magazine["category"])
+            Magazine.from_row(magazine)
             for magazine in magazines
 
         ]
 
     @staticmethod
+    def iter_all(batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Stream all magazines from the database without loading them into a list.
+
+        Args:
+            batch_size (int): The number of rows fetched from SQLite at a time.
+
+        Yields:
+            Magazine: The next Magazine instance.
+        """
+        for magazine in iter_rows("SELECT * FROM magazines", batch_size=batch_size):
+            yield Magazine.from_row(magazine)
+
+    @staticmethod
+    @instrumented
+    def fetch_page(after=None, limit=DEFAULT_PAGE_SIZE, order_by="id"):
+        """
+        Fetch one page of magazines using keyset pagination.
+
+        Args:
+            after (str): The cursor returned with the previous page, or None for the first page.
+            limit (int): The maximum number of magazines in the page.
+            order_by (str): One of id, name; ties are broken by id.
+
+        Returns:
+            tuple: A list of Magazine instances and the cursor for the next page,
+            or None when this is the last page.
+        """
+        rows, cursor = fetch_page("magazines", order_by, PAGE_ORDERINGS, after, limit)
+        return [
+            Magazine.from_row(magazine)
+            for magazine in rows
+        ], cursor
+
+    @staticmethod
+    @instrumented
     def fetch_by_id(magazine_id):
         """
         Fetch a magazine by its ID.
@@ -144,57 +249,377 @@ class Magazine:
         Returns:
             Magazine: The Magazine instance or None if not found.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("SELECT * FROM magazines WHERE id = ?", (magazine_id,))
-        magazine_data = cursor.fetchone()
-        connection.close()
+        cached = Magazine.identity_map.get(magazine_id)
+        if cached is not None:
+            return cached
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT * FROM magazines WHERE id = ?", (magazine_id,))
+            magazine_data = cursor.fetchone()
         if magazine_data:
-            return Magazine(magazine_data["id"], magazine_data["name"], magazine_data["category"])
+            return Magazine.identity_map.add(Magazine.from_row(magazine_data))
         return None
 
-    def delete_from_db(self):
+    @staticmethod
+    @instrumented
+    def fetch_many_by_ids(magazine_ids):
+        """
+        Fetch many magazines by ID with one ``IN (...)`` query per parameter-limit chunk.
+
+        Magazines already in the identity map are not queried again.
+
+        Args:
+            magazine_ids (iterable): The IDs of the magazines to fetch.
+
+        Returns:
+            dict: A mapping of ID to Magazine instance for every ID that exists.
+        """
+        found = {}
+        missing = []
+        for magazine_id in dict.fromkeys(magazine_ids):
+            if magazine_id is None:
+                continue
+            cached = Magazine.identity_map.get(magazine_id)
+            if cached is not None:
+                found[magazine_id] = cached
+            else:
+                missing.append(magazine_id)
+        for row in select_in("SELECT * FROM magazines WHERE id IN ({})", missing):
+            found[row["id"]] = Magazine.identity_map.add(Magazine.from_row(row))
+        return found
+
+    @staticmethod
+    @instrumented
+    def get_or_create(name, category):
+        """
+        Fetch the magazine with this name, inserting it first if there is none.
+
+        An existing magazine keeps its category; use ``upsert`` to overwrite it.
+        Resolved IDs are kept in a bounded name -> ID cache, so repeat lookups
+        skip the name query.
+
+        Args:
+            name (str): The name of the magazine.
+            category (str): The category used if the magazine is created.
+
+        Returns:
+            Magazine: The saved Magazine instance.
+
+        Raises:
+            ValueError: If the name or category is not valid.
+        """
+        Magazine(None, name, category)
+        magazine_id = Magazine.name_cache.get(name)
+        if magazine_id is not None:
+            magazine = Magazine.fetch_by_id(magazine_id)
+            if magazine is not None and magazine.name == name:
+                return magazine
+            Magazine.name_cache.invalidate(name)
+        return Magazine._write_by_name(
+            "INSERT INTO magazines (name, category) VALUES (?, ?) ON CONFLICT (name) DO NOTHING",
+            name, category,
+        )
+
+    @staticmethod
+    @instrumented
+    def upsert(name, category):
+        """
+        Insert a magazine, or set the category of the existing one with this name.
+
+        Args:
+            name (str): The name of the magazine.
+            category (str): The category to store.
+
+        Returns:
+            Magazine: The saved Magazine instance.
+
+        Raises:
+            ValueError: If the name or category is not valid.
+        """
+        Magazine(None, name, category)
+        return Magazine._write_by_name(
+            """
+            INSERT INTO magazines (name, category) VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET category = excluded.category
+            WHERE category != excluded.category
+            """,
+            name, category,
+        )
+
+    @staticmethod
+    def _write_by_name(sql, name, category):
+        """
+        Run an ``INSERT ... ON CONFLICT`` for one name and return the resulting row.
+        """
+        with db_connection() as connection:
+            with immediate_transaction(connection):
+                connection.execute(sql, (name, category))
+                row = connection.execute("SELECT * FROM magazines WHERE name = ?", (name,)).fetchone()
+        Magazine.name_cache.put(name, row["id"])
+        Magazine.identity_map.invalidate(row["id"])
+        return Magazine.identity_map.add(Magazine.from_row(row))
+
+    @instrumented
+    def delete_from_db(self, cascade=False):
         """
         Delete the magazine from the database.
 
+        With ``cascade=True`` its articles are deleted by the same statement
+        through ``ON DELETE CASCADE``; otherwise they are left in place.
+
+        When write-behind mode is enabled the write is queued instead and a
+        Future resolving to the ID is returned. Cascading deletes are not
+        queued: pending writes are flushed and the delete runs at once.
+
+        Args:
+            cascade (bool): Also delete the magazine's articles.
+
         Raises:
             ValueError: If the magazine has not been saved to the database.
         """
         if not self.id:
             raise ValueError("Magazine must exist in the database to be deleted.")
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("DELETE FROM magazines WHERE id = ?", (self.id,))
-        connection.commit()
-        connection.close()
+        writer = write_behind.active_writer()
+        if writer is not None:
+            if not cascade:
+                return writer.delete(self)
+            writer.flush()
+        with db_connection() as connection:
+            with foreign_keys(connection) if cascade else nullcontext():
+                cursor = connection.cursor()
+                cursor.execute("DELETE FROM magazines WHERE id = ?", (self.id,))
+                connection.commit()
+        Magazine.identity_map.invalidate(self.id)
+        Magazine.name_cache.invalidate(self.name)
+        if cascade:
+            from models.article import Article
+            Article.identity_map.clear()
+
+    @staticmethod
+    @instrumented
+    def save_many(magazines, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Save many new magazines with one INSERT transaction per chunk.
+
+        Args:
+            magazines (iterable): Unsaved Magazine instances.
+            chunk_size (int): The number of rows written per transaction.
+
+        Returns:
+            list: The saved Magazine instances, with their IDs filled in.
+
+        Raises:
+            AttributeError: If any magazine has already been saved.
+        """
+        magazines = list(magazines)
+        if any(magazine.id is not None for magazine in magazines):
+            raise AttributeError("Magazine already saved to the database.")
+        for chunk in chunked(magazines, chunk_size):
+            ids = insert_many(
+                "magazines", ("name", "category"),
+                [(magazine.name, magazine.category,) for magazine in chunk],
+            )
+            for magazine, magazine_id in zip(chunk, ids):
+                magazine.id = magazine_id
+        return magazines
+
+    @staticmethod
+    @instrumented
+    def update_many(magazines, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Update many saved magazines with one UPDATE transaction per chunk.
+
+        Only changed columns are written; unchanged magazines are skipped.
+
+        Args:
+            magazines (iterable): Saved Magazine instances.
+            chunk_size (int): The number of rows written per transaction.
+
+        Returns:
+            int: The number of rows updated.
+
+        Raises:
+            ValueError: If any magazine does not exist in the database.
+        """
+        magazines = list(magazines)
+        if not all(magazine.id for magazine in magazines):
+            raise ValueError("Magazine must exist in the database to update.")
+        updated = 0
+        for chunk in chunked(magazines, chunk_size):
+            updated += write_changes(Magazine, chunk)
+        return updated
+
+    @staticmethod
+    @instrumented
+    def delete_many(magazine_ids, chunk_size=DEFAULT_CHUNK_SIZE, cascade=False):
+        """
+        Delete many magazines by ID with one DELETE transaction per chunk.
+
+        Args:
+            magazine_ids (iterable): The IDs of the magazines to delete.
+            chunk_size (int): The number of rows deleted per transaction.
+            cascade (bool): Also delete their articles through ``ON DELETE CASCADE``.
 
-    def articles(self):
+        Returns:
+            int: The number of magazines deleted.
+        """
+        deleted = 0
+        for chunk in chunked(magazine_ids, chunk_size):
+            deleted += execute_many(
+                "DELETE FROM magazines WHERE id = ?",
+                [(magazine_id,) for magazine_id in chunk],
+                cascade=cascade,
+            )
+            for magazine_id in chunk:
+                Magazine.identity_map.invalidate(magazine_id)
+        if cascade:
+            from models.article import Article
+            Article.identity_map.clear()
+        return deleted
+
+    @staticmethod
+    @instrumented
+    def update_where(values, **conditions):
+        """
+        Set columns on every magazine matching the conditions with a single UPDATE statement.
+
+        For example ``Magazine.update_where({"category": "Science"}, category="Sci")``.
+
+        Args:
+            values (dict): A mapping of column to its new value; each value is validated.
+            **conditions: ``column=value`` filters, ANDed together; a list, tuple
+                or set matches any of its values and None matches NULL.
+
+        Returns:
+            int: The number of magazines updated.
+
+        Raises:
+            ValueError: If there are no conditions, a column is unknown, a value
+                is invalid or a new name is already used by another magazine.
+        """
+        validate_values(Magazine, values)
+        writer = write_behind.active_writer()
+        if writer is not None:
+            writer.flush()
+        try:
+            updated = update_where("magazines", ("id",) + Magazine._write_columns, values, conditions)
+        except sqlite3.IntegrityError as error:
+            if "name" not in values:
+                raise
+            raise ValueError("A magazine with that name already exists.") from error
+        Magazine.identity_map.clear()
+        Magazine.name_cache.clear()
+        return updated
+
+    @staticmethod
+    @instrumented
+    def delete_where(cascade=False, **conditions):
+        """
+        Delete every magazine matching the conditions with a single DELETE statement.
+
+        Args:
+            cascade (bool): Also delete their articles through ``ON DELETE CASCADE``.
+            **conditions: ``column=value`` filters, ANDed together; a list, tuple
+                or set matches any of its values and None matches NULL.
+
+        Returns:
+            int: The number of magazines deleted.
+
+        Raises:
+            ValueError: If there are no conditions or a column is unknown.
+        """
+        writer = write_behind.active_writer()
+        if writer is not None:
+            writer.flush()
+        deleted = delete_where("magazines", ("id",) + Magazine._write_columns, conditions, cascade=cascade)
+        Magazine.identity_map.clear()
+        Magazine.name_cache.clear()
+        if cascade:
+            from models.article import Article
+            Article.identity_map.clear()
+        return deleted
+
+    @instrumented
+    def articles(self, only=None, defer=None):
         """
         Fetch all articles associated with this magazine.
 
+        Args:
+            only (tuple): Load just these article columns; the rest load lazily on first access.
+            defer (tuple): Article columns to load lazily on first access, e.g. ("content",).
+
         Returns:
             list: A list of Article instances.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            SELECT articles.id, articles.title, articles.content, articles.author_id, articles.magazine_id
+        from models.article import Article
+        columns, deferred = Article.projection(only, defer)
+        return Article.hydrate(self._article_rows(columns), deferred)
+
+    @cached_result
+    def _article_rows(self, columns):
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                f"""
+                SELECT {", ".join("articles." + column for column in columns)}
+                FROM articles
+                WHERE articles.magazine_id = ?
+                """,
+                (self.id,),
+            )
+            return cursor.fetchall()
+
+    def iter_articles(self, batch_size=DEFAULT_BATCH_SIZE, only=None, defer=None):
+        """
+        Stream all articles associated with this magazine without loading them into a list.
+
+        Args:
+            batch_size (int): The number of rows fetched from SQLite at a time.
+            only (tuple): Load just these article columns; the rest load lazily per batch.
+            defer (tuple): Article columns to load lazily per batch, e.g. ("content",).
+
+        Yields:
+            Article: The next Article instance.
+        """
+        from models.article import Article
+        columns, deferred = Article.projection(only, defer)
+        batches = iter_batches(
+            f"""
+            SELECT {", ".join("articles." + column for column in columns)}
             FROM articles
             WHERE articles.magazine_id = ?
             """,
             (self.id,),
+            batch_size,
+        )
+        for rows in batches:
+            yield from Article.hydrate(rows, deferred)
+
+    @instrumented
+    def articles_page(self, after=None, limit=DEFAULT_PAGE_SIZE, order_by="id"):
+        """
+        Fetch one page of the articles associated with this magazine using keyset pagination.
+
+        Args:
+            after (str): The cursor returned with the previous page, or None for the first page.
+            limit (int): The maximum number of articles in the page.
+            order_by (str): One of id, title; ties are broken by id.
+
+        Returns:
+            tuple: A list of Article instances and the cursor for the next page,
+            or None when this is the last page.
+        """
+        from models.article import Article
+        rows, cursor = fetch_page(
+            "articles", order_by, ARTICLE_PAGE_ORDERINGS, after, limit,
+            where="magazine_id = ?", params=(self.id,),
         )
-        articles = cursor.fetchall()
-        connection.close()
         return [
-            Article(
-                article["id"], article["title"], article["content"],
-                article["author_id"], article["magazine_id"]
-            )
-            for article in articles
-        ]
+            Article.from_row(article)
+            for article in rows
+        ], cursor
 
+    @instrumented
     def contributors(self):
         """
         Fetch all unique authors who have written for this magazine.
@@ -202,23 +627,28 @@ class Magazine:
         Returns:
             list: A list of Author instances.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            SELECT DISTINCT authors.id, authors.name
-            FROM authors
-            JOIN articles ON authors.id = articles.author_id
-            WHERE articles.magazine_id = ?
-            """,
-            (self.id,),
-        )
-        authors = cursor.fetchall()
-        connection.close()
+        from models.author import Author
         return [
-            Author(author["id"], author["name"]) for author in authors
+            Author.from_row(author) for author in self._contributor_rows()
         ]
 
+    @cached_result
+    def _contributor_rows(self):
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                """
+                SELECT DISTINCT authors.id, authors.name
+                FROM authors
+                JOIN articles ON authors.id = articles.author_id
+                WHERE articles.magazine_id = ?
+                """,
+                (self.id,),
+            )
+            return cursor.fetchall()
+
+    @instrumented
+    @cached_result
     def article_titles(self):
         """
         Fetch all article titles associated with this magazine.
@@ -226,20 +656,40 @@ class Magazine:
         Returns:
             list: A list of article titles or None if there are no articles.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            SELECT articles.title
-            FROM articles
-            WHERE articles.magazine_id = ?
-            """,
-            (self.id,),
-        )
-        titles = cursor.fetchall()
-        connection.close()
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                """
+                SELECT articles.title
+                FROM articles
+                WHERE articles.magazine_id = ?
+                """,
+                (self.id,),
+            )
+            titles = cursor.fetchall()
         return [title["title"] for title in titles] or None
 
+    @instrumented
+    def article_count(self):
+        """
+        Count the articles associated with this magazine.
+
+        Reads the trigger-maintained ``magazine_stats`` counter instead of
+        aggregating over ``articles``.
+
+        Returns:
+            int: The number of articles.
+        """
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                "SELECT article_count FROM magazine_stats WHERE magazine_id = ?",
+                (self.id,),
+            )
+            row = cursor.fetchone()
+        return row["article_count"] if row else 0
+
+    @instrumented
     def contributing_authors(self):
         """
         Fetch all authors who have contributed more than 2 articles to this magazine.
@@ -247,23 +697,61 @@ class Magazine:
         Returns:
             list: A list of Author instances or None if no such authors exist.
         """
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            SELECT authors.id, authors.name
-            FROM authors
-            JOIN articles ON authors.id = articles.author_id
-            WHERE articles.magazine_id = ?
-            GROUP BY authors.id, authors.name
-            HAVING COUNT(articles.id) > 2
-            """,
-            (self.id,),
-        )
-        authors = cursor.fetchall()
-        connection.close()
+        from models.author import Author
+        authors = self._contributing_author_rows()
         if not authors:
             return None
         return [
-            Author(author["id"], author["name"]) for author in authors
+            Author.from_row(author) for author in authors
         ]
+
+    @cached_result
+    def _contributing_author_rows(self):
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                """
+                SELECT authors.id, authors.name
+                FROM magazine_author_stats
+                JOIN authors ON authors.id = magazine_author_stats.author_id
+                WHERE magazine_author_stats.magazine_id = ?
+                AND magazine_author_stats.article_count > 2
+                ORDER BY magazine_author_stats.author_id
+                """,
+                (self.id,),
+            )
+            return cursor.fetchall()
+
+    @staticmethod
+    @instrumented
+    def contributing_authors_for_all(min_articles=3):
+        """
+        Fetch the contributing authors of every magazine with a single query.
+
+        Args:
+            min_articles (int): The minimum number of articles an author must
+                have in a magazine to count as contributing to it.
+
+        Returns:
+            dict: A mapping of magazine ID to a list of Author instances, in
+                magazine ID order. Magazines without contributing authors are left out.
+        """
+        from models.author import Author
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                """
+                SELECT magazines.id, authors.id, authors.name
+                FROM magazine_author_stats
+                JOIN magazines ON magazines.id = magazine_author_stats.magazine_id
+                JOIN authors ON authors.id = magazine_author_stats.author_id
+                WHERE magazine_author_stats.article_count >= ?
+                ORDER BY magazines.id, authors.id
+                """,
+                (min_articles,),
+            )
+            rows = cursor.fetchall()
+        contributors = {}
+        for row in rows:
+            contributors.setdefault(row[0], []).append(Author.from_row(row[1:3]))
+        return contributors
@@ -0,0 +1,111 @@
+import functools
+import weakref
+
+from database.connection import db_connection
+from models.identity_map import LRUCache
+
+
+class ResultCache(LRUCache):
+    """
+    A bounded (method, id, arguments) -> result cache that empties itself
+    whenever the database may have changed.
+
+    Each pooled connection is checked before a lookup. ``PRAGMA data_version``
+    changes when any other connection, in this process or another, commits;
+    ``total_changes`` changes when the connection itself writes. If either
+    moved since that connection was last checked, every entry is dropped.
+    """
+
+    def __init__(self, maxsize=4096):
+        """
+        Initialize an empty result cache.
+
+        Args:
+            maxsize (int): The maximum number of results kept.
+        """
+        super().__init__(maxsize)
+        self.generation = 0
+        self.invalidations = 0
+        self._seen = weakref.WeakKeyDictionary()
+
+    def validate(self, connection):
+        """
+        Drop every entry if the database changed since ``connection`` was last checked.
+
+        Args:
+            connection (sqlite3.Connection): The connection the next query will use.
+
+        Returns:
+            int: The current generation, to pass to ``store``.
+        """
+        token = (connection.execute("PRAGMA data_version").fetchone()[0], connection.total_changes)
+        with self._lock:
+            if self._seen.get(connection) != token:
+                # A connection seen for the first time also invalidates: its
+                # counters say nothing about writes made before it was checked.
+                self._seen[connection] = token
+                self._entries.clear()
+                self.generation += 1
+                self.invalidations += 1
+            return self.generation
+
+    def store(self, key, value, generation):
+        """
+        Cache a result unless the cache was invalidated while it was computed.
+
+        Args:
+            key: The cache key.
+            value: The result.
+            generation (int): The generation ``validate`` returned before the query ran.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+        self.put(key, value)
+
+    def stats(self):
+        """
+        Report the size, hit/miss and invalidation counters of the cache.
+
+        Returns:
+            dict: ``size``, ``maxsize``, ``hits``, ``misses`` and ``invalidations``.
+        """
+        return dict(super().stats(), invalidations=self.invalidations)
+
+
+relation_cache = ResultCache()
+
+def cached_result(method):
+    """
+    Serve repeat calls of a relationship method from ``relation_cache``.
+
+    Results are keyed by method, instance ID and arguments. Lists are copied
+    on the way in and out, so only wrap methods whose items are immutable,
+    such as ``sqlite3.Row`` lists: relationship methods cache their rows and
+    build new model instances on every call, so callers cannot change a
+    cached result. Unsaved instances and unhashable arguments bypass the cache.
+    """
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.id is None:
+            return method(self, *args, **kwargs)
+        key = (name, self.id, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+        with db_connection() as connection:
+            generation = relation_cache.validate(connection)
+            cached = relation_cache.get(key)
+            if cached is not None:
+                return _copy(cached[0])
+            result = method(self, *args, **kwargs)
+        # Wrapped, so that a None result is cached too.
+        relation_cache.store(key, (_copy(result),), generation)
+        return result
+    return wrapper
+
+def _copy(result):
+    return list(result) if isinstance(result, list) else result
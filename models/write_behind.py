@@ -0,0 +1,261 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from database.bulk import immediate_transaction
+from database.connection import db_connection
+from models.changes import clear_changes, update_statement
+
+DEFAULT_FLUSH_INTERVAL = 0.05
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_MAX_PENDING = 10000
+
+_SAVE, _UPDATE, _DELETE, _FLUSH, _STOP = "save", "update", "delete", "flush", "stop"
+
+
+class WriteBehindQueue:
+    def __init__(self, flush_interval=DEFAULT_FLUSH_INTERVAL, batch_size=DEFAULT_BATCH_SIZE,
+                 max_pending=DEFAULT_MAX_PENDING):
+        """
+        Start a background writer that commits queued model writes in batches.
+
+        Producers only enqueue; a single writer thread takes the SQLite write
+        lock, so they never contend for it, and many writes share one commit.
+
+        Args:
+            flush_interval (float): Seconds the writer waits to fill a batch.
+            batch_size (int): The maximum number of writes per transaction.
+            max_pending (int): Writes allowed in the queue before producers block.
+        """
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("Batch size must be a positive integer.")
+        if not isinstance(max_pending, int) or max_pending < 1:
+            raise ValueError("Max pending must be a positive integer.")
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.batches = 0
+        self.writes = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def save(self, instance, timeout=None):
+        """
+        Queue an INSERT of an unsaved model instance.
+
+        Args:
+            instance: An unsaved Author, Magazine or Article.
+            timeout (float): Seconds to wait for queue space, or None to wait forever.
+
+        Returns:
+            Future: Resolves to the new ID once committed; the instance's ``id`` is set too.
+        """
+        if instance.id is not None:
+            raise AttributeError(f"{type(instance).__name__} already saved to the database.")
+        return self._submit(_SAVE, instance, timeout)
+
+    def update(self, instance, timeout=None, columns=None):
+        """
+        Queue an UPDATE of a saved model instance.
+
+        Args:
+            instance: A saved Author, Magazine or Article.
+            timeout (float): Seconds to wait for queue space, or None to wait forever.
+            columns (tuple): The columns to write; defaults to all of them.
+
+        Returns:
+            Future: Resolves to the instance's ID once committed.
+        """
+        if not instance.id:
+            raise ValueError(f"{type(instance).__name__} must exist in the database to update.")
+        return self._submit(_UPDATE, instance, timeout, columns or type(instance)._write_columns)
+
+    def delete(self, instance, timeout=None):
+        """
+        Queue a DELETE of a saved model instance.
+
+        Returns:
+            Future: Resolves to the instance's ID once committed.
+        """
+        if not instance.id:
+            raise ValueError(f"{type(instance).__name__} must exist in the database to be deleted.")
+        return self._submit(_DELETE, instance, timeout)
+
+    def flush(self, timeout=None):
+        """
+        Block until every write queued so far has been committed.
+        """
+        self._submit(_FLUSH, None, timeout).result(timeout)
+
+    def close(self, timeout=None):
+        """
+        Commit the remaining writes and stop the writer thread.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((_STOP, None, Future(), None), timeout=timeout)
+        self._thread.join(timeout)
+
+    def _submit(self, action, instance, timeout, columns=None):
+        if self._closed:
+            raise RuntimeError("Write-behind queue is closed.")
+        future = Future()
+        try:
+            self._queue.put((action, instance, future, columns), timeout=timeout)
+        except queue.Full:
+            raise RuntimeError("Write-behind queue is full.")
+        return future
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._process(batch)
+            except Exception as error:
+                # Keep the writer alive; fail whatever this batch left unresolved.
+                for write in batch:
+                    if not write[2].done():
+                        _fail(write, error)
+            if batch[-1][0] == _STOP:
+                return
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1][0] not in (_FLUSH, _STOP):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _process(self, batch):
+        # Writes whose caller cancelled the future are dropped; the rest can no longer be cancelled.
+        writes = [
+            op for op in batch if op[0] not in (_FLUSH, _STOP) and op[2].set_running_or_notify_cancel()
+        ]
+        if writes:
+            self._commit(writes)
+        for action, _instance, future, _columns in batch:
+            if action in (_FLUSH, _STOP):
+                future.set_result(None)
+
+    def _commit(self, writes):
+        try:
+            with db_connection() as connection:
+                with immediate_transaction(connection):
+                    results = [
+                        _apply(connection, action, instance, columns) for action, instance, _, columns in writes
+                    ]
+        except Exception:
+            # One bad write must not sink the batch: retry each on its own.
+            for write in writes:
+                self._commit_one(write)
+            return
+        self._finish(writes, results)
+
+    def _commit_one(self, write):
+        action, instance, _future, columns = write
+        try:
+            with db_connection() as connection:
+                with immediate_transaction(connection):
+                    result = _apply(connection, action, instance, columns)
+        except Exception as error:
+            _fail(write, error)
+            return
+        self._finish([write], [result])
+
+    def _finish(self, writes, results):
+        self.batches += 1
+        self.writes += len(writes)
+        for (action, instance, future, columns), result in zip(writes, results):
+            model = type(instance)
+            if action == _SAVE:
+                instance.id = result
+            elif action == _UPDATE:
+                # As in ``write_changes``, changes are only forgotten once committed.
+                model.write_counters.record(columns)
+                clear_changes(instance, columns)
+                model.identity_map.invalidate(instance.id)
+            else:
+                model.identity_map.invalidate(instance.id)
+            future.set_result(result)
+
+
+def _apply(connection, action, instance, columns):
+    model = type(instance)
+    if action == _SAVE:
+        columns = model._write_columns
+        cursor = connection.execute(
+            "INSERT INTO {} ({}) VALUES ({})".format(
+                model._table, ", ".join(columns), ", ".join("?" for _ in columns)
+            ),
+            tuple(getattr(instance, column) for column in columns),
+        )
+        return cursor.lastrowid
+    if action == _UPDATE:
+        connection.execute(
+            update_statement(model, columns),
+            tuple(getattr(instance, column) for column in columns) + (instance.id,),
+        )
+    else:
+        connection.execute(f"DELETE FROM {model._table} WHERE id = ?", (instance.id,))
+    return instance.id
+
+def _fail(write, error):
+    action, instance, future, _columns = write
+    if action == _UPDATE:
+        # The instance keeps its change marks for a retry, but the map must not serve it.
+        type(instance).identity_map.invalidate(instance.id)
+    future.set_exception(error)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def enable_write_behind(**options):
+    """
+    Route ``save_to_db``, ``update_to_db`` and ``delete_from_db`` of every
+    model through a shared write-behind queue; they then return futures.
+
+    Args:
+        **options: Keyword arguments for ``WriteBehindQueue``.
+
+    Returns:
+        WriteBehindQueue: The active queue.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = WriteBehindQueue(**options)
+        return _writer
+
+def disable_write_behind():
+    """
+    Commit any queued writes and return the models to synchronous writes.
+    """
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
+
+def completed(result):
+    """
+    Return a Future that already resolved to ``result``, for writes that had nothing to queue.
+    """
+    future = Future()
+    future.set_result(result)
+    return future
+
+def active_writer():
+    """
+    Return the active write-behind queue, or None in synchronous mode.
+    """
+    return _writer
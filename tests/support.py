@@ -0,0 +1,40 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import database.connection as db
+from database.setup import create_tables
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+from models.result_cache import relation_cache
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Point the models at a throwaway database file for each test.
+    """
+
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self._original_database = db.DATABASE_NAME
+        db.close_pool()
+        db.DATABASE_NAME = os.path.join(self._tmpdir, 'test.db')
+        create_tables()
+        self.clear_identity_maps()
+
+    def tearDown(self):
+        self.clear_identity_maps()
+        db.close_pool()
+        db.DATABASE_NAME = self._original_database
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    @staticmethod
+    def clear_identity_maps():
+        for model in (Author, Magazine, Article):
+            model.identity_map.clear()
+            model.write_counters.clear()
+        Author.name_cache.clear()
+        Magazine.name_cache.clear()
+        relation_cache.clear()
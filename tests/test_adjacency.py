@@ -0,0 +1,91 @@
+import unittest
+
+from database.change_log import compact_changes
+from models.adjacency import AdjacencyIndex
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+from support import DatabaseTestCase
+
+
+class TestAdjacencyIndex(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.a, self.b, self.c, self.d = Author.save_many([Author(None, f"Author {i}") for i in range(4)])
+        self.m1, self.m2, self.m3 = Magazine.save_many([Magazine(None, f"Mag {i}", "Technology") for i in range(3)])
+        # a and b share m1, b and c share m2, d only writes for m3.
+        Article.save_many([
+            Article(None, title, "Body", author.id, magazine.id)
+            for title, author, magazine in (
+                ("Title A1", self.a, self.m1), ("Title A2", self.a, self.m1),
+                ("Title B1", self.b, self.m1), ("Title B2", self.b, self.m2),
+                ("Title C1", self.c, self.m2), ("Title D1", self.d, self.m3),
+            )
+        ])
+        Article(None, "Orphan", "Body", None, self.m1.id).save_to_db()
+        self.index = AdjacencyIndex.load()
+
+    def test_rows_match_model_queries(self):
+        for author in (self.a, self.b, self.c, self.d):
+            self.assertEqual(list(self.index.magazines(author.id)), sorted(m.id for m in author.magazines()))
+        for magazine in (self.m1, self.m2, self.m3):
+            self.assertEqual(list(self.index.authors(magazine.id)), sorted(a.id for a in magazine.contributors()))
+        self.assertEqual(self.index.magazines(self.a.id), {self.m1.id: 2})
+        self.assertEqual(self.index.magazines(12345), {})
+
+    def test_reachable(self):
+        self.assertEqual(self.index.reachable([self.a.id]), {self.a.id: 0, self.b.id: 1})
+        self.assertEqual(
+            self.index.reachable([self.a.id], hops=3),
+            {self.a.id: 0, self.b.id: 1, self.c.id: 2},
+        )
+
+    def test_co_occurrences_and_similarity(self):
+        self.assertEqual(self.index.co_occurrences(self.b.id), {self.a.id: 1, self.c.id: 1})
+        self.assertEqual(self.index.similarity(self.a.id, self.b.id), 0.5)
+        self.assertAlmostEqual(self.index.similarity(self.a.id, self.b.id, "cosine"), 2 / (2 * 2 ** 0.5))
+        self.assertEqual(self.index.similarity(self.a.id, self.d.id), 0.0)
+        self.assertEqual(
+            self.index.most_similar([self.b.id], metric="cosine"),
+            {self.b.id: [(self.a.id, self.index.similarity(self.a.id, self.b.id, "cosine")),
+                         (self.c.id, self.index.similarity(self.b.id, self.c.id, "cosine"))]},
+        )
+        with self.assertRaises(ValueError):
+            self.index.similarity(self.a.id, self.b.id, "euclidean")
+
+    def test_apply_updates_incrementally(self):
+        self.index.apply(self.a.id, self.m1.id, 1)
+        self.index.apply(self.d.id, self.m2.id, 1)
+        self.index.apply(self.c.id, self.m2.id, -1)
+        self.index.apply(None, self.m2.id, 1)
+        self.assertEqual(self.index.magazines(self.a.id), {self.m1.id: 3})
+        self.assertEqual(self.index.authors(self.m2.id), {self.b.id: 1, self.d.id: 1})
+        self.assertEqual(self.index.reachable([self.d.id], hops=2), {self.d.id: 0, self.b.id: 1, self.a.id: 2})
+        edges = list(self.index.edges())
+        self.index.compact()
+        self.assertEqual(list(self.index.edges()), edges)
+        self.assertEqual(self.index.authors(self.m2.id), {self.b.id: 1, self.d.id: 1})
+
+    def test_refresh_applies_logged_changes(self):
+        article = Article(None, "Title D2", "Body", self.d.id, self.m2.id)
+        article.save_to_db()
+        article.magazine_id = self.m1.id
+        article.update_to_db()
+        next(a for a in Article.fetch_all() if a.title == "Title C1").delete_from_db()
+        self.assertFalse(self.index.refresh())
+        self.assertEqual(self.index.rebuilds, 1)
+        self.assertEqual(list(self.index.edges()), list(AdjacencyIndex.load().edges()))
+        self.assertEqual(self.index.magazines(self.d.id), {self.m1.id: 1, self.m3.id: 1})
+
+    def test_refresh_rebuilds_after_compaction(self):
+        Article(None, "Title D2", "Body", self.d.id, self.m1.id).save_to_db()
+        compact_changes()
+        self.assertTrue(self.index.refresh())
+        self.assertEqual(self.index.co_occurrences(self.d.id), {self.a.id: 1, self.b.id: 1})
+
+    def test_refresh_skips_unchanged_database(self):
+        self.assertFalse(self.index.refresh())
+        self.assertEqual(self.index.rebuilds, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import contextlib
+import io
+import unittest
+
+import database.connection as db
+from app import print_all_records
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestContributingAuthorsForAll(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authors = Author.save_many([Author(None, f"Author {i}") for i in range(3)])
+        self.magazines = Magazine.save_many([Magazine(None, f"Mag {i}", "Tech") for i in range(3)])
+        counts = {(0, 0): 3, (1, 0): 2, (0, 1): 4, (2, 1): 3, (1, 2): 1}
+        Article.save_many([
+            Article(None, f"Title {n}", "Body", self.authors[a].id, self.magazines[m].id)
+            for (a, m), count in counts.items() for n in range(count)
+        ])
+
+    def test_matches_per_magazine_queries(self):
+        mapping = Magazine.contributing_authors_for_all(min_articles=3)
+        self.assertEqual(
+            {magazine_id: [a.id for a in authors] for magazine_id, authors in mapping.items()},
+            {
+                magazine.id: [a.id for a in magazine.contributing_authors()]
+                for magazine in self.magazines if magazine.contributing_authors()
+            },
+        )
+        self.assertEqual([a.name for a in mapping[self.magazines[1].id]], ["Author 0", "Author 2"])
+
+    def test_report_uses_constant_queries(self):
+        statements = []
+        with db.db_connection() as connection:
+            connection.set_trace_callback(statements.append)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            print_all_records()
+        self.assertEqual(len(statements), 4)
+        self.assertIn("Magazine: Mag 1", output.getvalue())
+        self.assertNotIn("Magazine: Mag 2", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import unittest
+
+import database.connection as db
+from models import aio
+from models.aio import AsyncArticle, AsyncAuthor, AsyncMagazine
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestAsyncFacade(DatabaseTestCase):
+    def tearDown(self):
+        aio.shutdown()
+        super().tearDown()
+
+    def test_crud_and_relationships(self):
+        async def scenario():
+            author = Author(None, "Jane Roe")
+            magazine = Magazine(None, "Tech Weekly", "Technology")
+            await asyncio.gather(AsyncAuthor.save_to_db(author), AsyncMagazine.save_to_db(magazine))
+            article = Article(None, "Async Title", "Body", author.id, magazine.id)
+            await AsyncArticle.save_to_db(article)
+            fetched = await AsyncArticle.fetch_by_id(article.id)
+            return (
+                (await AsyncArticle.author(fetched)).name,
+                [a.name for a in await AsyncMagazine.contributors(magazine)],
+                len(await AsyncAuthor.articles(author)),
+            )
+
+        self.assertEqual(asyncio.run(scenario()), ("Jane Roe", ["Jane Roe"], 1))
+
+    def test_deferred_columns_load_on_the_executor(self):
+        author = Author(None, "Jane Roe")
+        author.save_to_db()
+        Article(None, "Async Title", "Searchable body", author.id, None).save_to_db()
+
+        async def scenario():
+            return (
+                [article for article, _ in await AsyncArticle.search("searchable")],
+                await AsyncArticle.fetch_all(defer=("content",)),
+                await AsyncAuthor.articles(author, only=("title",)),
+            )
+
+        results = asyncio.run(scenario())
+        with db.db_connection() as connection:
+            statements = []
+            connection.set_trace_callback(statements.append)
+            try:
+                contents = [articles[0].content for articles in results]
+            finally:
+                connection.set_trace_callback(None)
+        self.assertEqual(contents, ["Searchable body"] * 3)
+        self.assertEqual(statements, [])
+
+    def test_calls_run_off_the_event_loop_thread(self):
+        async def scenario():
+            return await aio.run(threading.current_thread)
+
+        self.assertNotEqual(asyncio.run(scenario()), threading.main_thread())
+        self.assertEqual(AsyncAuthor.fetch_by_id.__name__, "fetch_by_id")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from database.change_log import compact_changes
+from models.analytics import ArticleSnapshot
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+from support import DatabaseTestCase
+
+
+class TestArticleSnapshot(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authors = Author.save_many([Author(None, f"Author {i}") for i in range(4)])
+        self.magazines = Magazine.save_many([Magazine(None, f"Mag {i}", "Technology") for i in range(3)])
+        # Author i writes i + 1 articles for each of the first i + 1 magazines (capped at 3).
+        articles = []
+        for i, author in enumerate(self.authors):
+            for magazine in self.magazines[:i + 1]:
+                articles.extend(
+                    Article(None, f"Title {author.id}-{magazine.id}-{n}", "Body", author.id, magazine.id)
+                    for n in range(i + 1)
+                )
+        articles.append(Article(None, "Orphan Title", "Body", None, self.magazines[0].id))
+        Article.save_many(articles)
+
+    def test_matches_model_queries(self):
+        snapshot = ArticleSnapshot.load(batch_size=7)
+        for magazine in self.magazines:
+            self.assertEqual(snapshot.contributors(magazine.id), sorted(a.id for a in magazine.contributors()))
+            expected = magazine.contributing_authors() or []
+            self.assertEqual(snapshot.authors_with_more_than(2, magazine.id), [a.id for a in expected])
+            self.assertEqual(snapshot.magazine_article_counts()[magazine.id], magazine.article_count())
+        for author in self.authors:
+            self.assertEqual(snapshot.magazine_counts()[author.id], len(author.magazines()))
+            self.assertEqual(snapshot.author_article_counts()[author.id], author.article_count())
+        self.assertEqual(
+            snapshot.authors_with_more_than(2),
+            {
+                magazine_id: [author.id for author in authors]
+                for magazine_id, authors in Magazine.contributing_authors_for_all(min_articles=3).items()
+            },
+        )
+        self.assertEqual(snapshot.contributor_counts(), {m.id: c for m, c in zip(self.magazines, (4, 3, 2))})
+
+    def test_rankings(self):
+        snapshot = ArticleSnapshot.load()
+        last = self.authors[-1].id
+        self.assertEqual(snapshot.top_authors(2), [(last, 12), (self.authors[2].id, 9)])
+        self.assertEqual(snapshot.top_authors(1, magazine_id=self.magazines[2].id), [(last, 4)])
+        self.assertEqual(snapshot.top_magazines(1), [(self.magazines[0].id, 11)])
+
+    def test_refresh_applies_logged_changes(self):
+        snapshot = ArticleSnapshot.load()
+        author, magazine = self.authors[0], self.magazines[2]
+        Article.save_many([Article(None, f"New Title {n}", "Body", author.id, magazine.id) for n in range(3)])
+        self.assertEqual(snapshot.refresh(), 3)
+        self.assertIn(author.id, snapshot.authors_with_more_than(2, magazine.id))
+        self.assertEqual(snapshot.refresh(), 0)
+
+        moved = Article.fetch_by_id(snapshot.ids[0])
+        moved.magazine_id = self.magazines[1].id
+        moved.update_to_db()
+        Article.delete_where(author_id=self.authors[-1].id)
+        snapshot.refresh()
+        self.assertNotIn(self.authors[-1].id, snapshot.author_article_counts())
+        fresh = ArticleSnapshot.load()
+        self.assertEqual(len(snapshot), len(fresh))
+        self.assertEqual(list(snapshot.ids), list(fresh.ids))
+        self.assertEqual(snapshot.pair_counts(), fresh.pair_counts())
+        self.assertEqual(snapshot.magazine_article_counts(), fresh.magazine_article_counts())
+
+    def test_refresh_reloads_after_compaction(self):
+        snapshot = ArticleSnapshot.load()
+        Article.delete_where(author_id=self.authors[-1].id)
+        compact_changes()
+        self.assertEqual(snapshot.refresh(), len(Article.fetch_all()))
+        self.assertNotIn(self.authors[-1].id, snapshot.author_article_counts())
+
+if __name__ == "__main__":
+    unittest.main()
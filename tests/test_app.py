@@ -0,0 +1,35 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+import app
+from models.magazine import Magazine
+from support import DatabaseTestCase
+
+
+class TestInteractiveUpdates(DatabaseTestCase):
+    def run_app(self, *answers):
+        output = io.StringIO()
+        with mock.patch.object(app, "clear_terminal"), \
+                mock.patch("builtins.input", side_effect=list(answers) + ["", "5"]), \
+                contextlib.redirect_stdout(output):
+            app.main()
+        return output.getvalue()
+
+    def test_renaming_a_magazine_to_a_used_name(self):
+        magazine = Magazine(None, "Tech Weekly", "Technology")
+        magazine.save_to_db()
+        Magazine(None, "Science Now", "Science").save_to_db()
+        output = self.run_app("2", "2", "1", str(magazine.id), "Science Now")
+        self.assertIn("A magazine with that name already exists.", output)
+        self.assertNotIn("Magazine updated successfully.", output)
+        self.assertEqual(Magazine.fetch_by_id(magazine.id).name, "Tech Weekly")
+
+        output = self.run_app("2", "2", "1", str(magazine.id), "Tech Daily")
+        self.assertIn("Magazine updated successfully.", output)
+        self.assertEqual(Magazine.fetch_by_id(magazine.id).name, "Tech Daily")
+
+
+if __name__ == "__main__":
+    unittest.main()
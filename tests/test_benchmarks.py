@@ -0,0 +1,51 @@
+import contextlib
+import hashlib
+import io
+import unittest
+
+import database.connection as db
+from benchmarks import suite
+from benchmarks.__main__ import main
+from benchmarks.generator import generate
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+from support import DatabaseTestCase
+
+
+class TestBenchmarkSuite(DatabaseTestCase):
+    def test_generator_skews_authorship(self):
+        counts = generate(500, authors=20, magazines=5, skew=1.5)
+        self.assertEqual(counts, {"authors": 20, "magazines": 5, "articles": 500})
+        authors = Author.fetch_all()
+        self.assertEqual(len(authors), 20)
+        self.assertGreater(authors[0].article_count(), authors[-1].article_count())
+        self.assertEqual(sum(m.article_count() for m in Magazine.fetch_all()), 500)
+
+    def test_every_benchmark_runs(self):
+        generate(300, authors=20, magazines=5)
+        results = suite.run(repeat=1)
+        self.assertEqual(set(results), set(suite.BENCHMARKS))
+        self.assertTrue(all(result["runs"] == 1 for result in results.values()))
+
+    def test_database_without_articles_is_rejected(self):
+        generate(20, authors=5, magazines=2)
+        Article.delete_where(id=[article.id for article in Article.fetch_all()])
+        with self.assertRaises(ValueError):
+            suite.run(["Article.update_to_db (title)"], repeat=1)
+
+    def test_database_option_leaves_the_file_unchanged(self):
+        generate(300, authors=20, magazines=5)
+        db.close_pool()
+        source = db.DATABASE_NAME
+        with open(source, "rb") as handle:
+            before = hashlib.sha256(handle.read()).hexdigest()
+        with contextlib.redirect_stdout(io.StringIO()):
+            main(["--database", source, "--only", "Article.update", "--repeat", "1"])
+        self.assertNotEqual(db.DATABASE_NAME, source)
+        with open(source, "rb") as handle:
+            self.assertEqual(hashlib.sha256(handle.read()).hexdigest(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestBulkWrites(DatabaseTestCase):
+    def test_save_many_assigns_ids_across_chunks(self):
+        authors = Author.save_many(
+            [Author(None, f"Author {i}") for i in range(7)], chunk_size=3
+        )
+        self.assertEqual([a.id for a in authors], list(range(1, 8)))
+        self.assertEqual(Author.fetch_by_id(5).name, "Author 4")
+
+    def test_save_many_rejects_saved_instances(self):
+        with self.assertRaises(AttributeError):
+            Magazine.save_many([Magazine(1, "Tech Weekly", "Technology")])
+
+    def test_update_many_and_delete_many(self):
+        magazine = Magazine(None, "Tech Weekly", "Technology")
+        magazine.save_to_db()
+        author = Author(None, "Jane Roe")
+        author.save_to_db()
+        articles = Article.save_many(
+            [Article(None, f"Title {i}", "Body", author.id, magazine.id) for i in range(5)],
+            chunk_size=2,
+        )
+        for article in articles:
+            article.content = "Edited"
+        self.assertEqual(Article.update_many(articles, chunk_size=2), 5)
+        self.assertEqual({a.content for a in Article.fetch_all()}, {"Edited"})
+
+        self.assertEqual(Article.delete_many([a.id for a in articles[:3]], chunk_size=2), 3)
+        self.assertEqual(len(Article.fetch_all()), 2)
+
+    def test_update_many_requires_saved_instances(self):
+        with self.assertRaises(ValueError):
+            Author.update_many([Author(None, "Jane Roe")])
+
+
+if __name__ == "__main__":
+    unittest.main()
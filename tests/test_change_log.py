@@ -0,0 +1,105 @@
+import unittest
+
+from database.change_log import (
+    changes_since, commit_offset, compact_changes, consume, consumer_offset,
+    drop_consumer, latest_seq, register_consumer,
+)
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+from support import DatabaseTestCase
+
+
+class TestChangeLog(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = Author(None, "Jane Roe")
+        self.author.save_to_db()
+        self.magazine = Magazine(None, "Tech Weekly", "Technology")
+        self.magazine.save_to_db()
+        self.article = Article(None, "First Title", "Body", self.author.id, self.magazine.id)
+        self.article.save_to_db()
+
+    def summary(self, changes):
+        return [(change["table"], change["row_id"], change["operation"]) for change in changes]
+
+    def test_logs_inserts_updates_and_deletes(self):
+        start = latest_seq()
+        self.article.content = "New body"
+        self.article.update_to_db()
+        self.article.update_to_db()
+        self.magazine.category = "Science"
+        self.magazine.update_to_db()
+        self.article.delete_from_db()
+        changes = changes_since(start)
+        self.assertEqual(self.summary(changes), [
+            ("articles", self.article.id, "update"),
+            ("magazines", self.magazine.id, "update"),
+            ("articles", self.article.id, "delete"),
+        ])
+        self.assertEqual(changes[1]["old"], {"name": "Tech Weekly", "category": "Technology"})
+        self.assertEqual(changes[1]["new"], {"name": "Tech Weekly", "category": "Science"})
+        self.assertIsNone(changes[2]["new"])
+        self.assertEqual(changes[2]["old"]["author_id"], self.author.id)
+        self.assertEqual([c["seq"] for c in changes_since(start, limit=2)], [c["seq"] for c in changes[:2]])
+
+    def test_filters_by_table(self):
+        self.assertEqual(self.summary(changes_since(0, tables=("authors",))), [("authors", self.author.id, "insert")])
+
+    def test_logs_cascaded_deletes(self):
+        start = latest_seq()
+        self.author.delete_from_db(cascade=True)
+        self.assertEqual(
+            sorted(self.summary(changes_since(start))),
+            [("articles", self.article.id, "delete"), ("authors", self.author.id, "delete")],
+        )
+
+    def test_consumer_offsets_are_durable(self):
+        self.assertEqual(register_consumer("search", seq=0), 0)
+        self.assertEqual(register_consumer("search"), 0)
+        batches = []
+        self.assertEqual(consume("search", batches.append, limit=2), 3)
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(consumer_offset("search"), latest_seq())
+        self.assertEqual(consume("search", batches.append), 0)
+
+        Author(None, "John Doe").save_to_db()
+        Article(None, "Second Title", "Body", self.author.id, self.magazine.id).save_to_db()
+        handled = []
+        self.assertEqual(consume("search", handled.extend, tables=("authors",)), 1)
+        self.assertEqual(consumer_offset("search"), latest_seq())
+
+        with self.assertRaises(ValueError):
+            consume("unknown", handled.extend)
+        with self.assertRaises(ValueError):
+            commit_offset("unknown", 1)
+        self.assertTrue(drop_consumer("search"))
+        self.assertIsNone(consumer_offset("search"))
+
+    def test_failed_handler_keeps_offset(self):
+        register_consumer("report", seq=0)
+
+        def fail(changes):
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            consume("report", fail)
+        self.assertEqual(consumer_offset("report"), 0)
+
+    def test_compaction_keeps_unconsumed_changes(self):
+        register_consumer("search", seq=1)
+        register_consumer("report")
+        self.assertEqual(compact_changes(), 1)
+        self.assertEqual(len(changes_since(1)), 2)
+        with self.assertRaises(ValueError):
+            changes_since(0)
+
+        drop_consumer("search")
+        self.assertEqual(compact_changes(), 2)
+        self.assertEqual(changes_since(latest_seq()), [])
+        with self.assertRaises(ValueError):
+            changes_since(latest_seq() - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import sqlite3
+import unittest
+
+import database.connection as db
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+from models.write_behind import disable_write_behind, enable_write_behind
+from support import DatabaseTestCase
+
+
+class TestDirtyTracking(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = Author(None, "Jane Roe")
+        self.author.save_to_db()
+        self.magazine = Magazine(None, "Tech Weekly", "Technology")
+        self.magazine.save_to_db()
+        self.article = Article(None, "First Title", "A long body", self.author.id, self.magazine.id)
+        self.article.save_to_db()
+
+    def updates(self, call):
+        with db.db_connection() as connection:
+            statements = []
+            connection.set_trace_callback(statements.append)
+            try:
+                call()
+            finally:
+                connection.set_trace_callback(None)
+        # The trace repeats a statement once per trigger step it runs.
+        return list(dict.fromkeys(sql for sql in statements if sql.startswith("UPDATE")))
+
+    def test_unchanged_update_is_skipped(self):
+        self.assertEqual(self.updates(self.article.update_to_db), [])
+        self.magazine.category = "Technology"
+        self.assertEqual(self.updates(self.magazine.update_to_db), [])
+        self.assertEqual(self.updates(self.author.update_to_db), [])
+        self.assertEqual(Article.write_counters.stats(), {"updates": 0, "columns": 0, "skipped": 1})
+        self.assertEqual(Magazine.write_counters.stats()["skipped"], 1)
+        self.assertEqual(Author.write_counters.stats()["skipped"], 1)
+
+    def test_only_changed_columns_are_written(self):
+        self.article.title = "Second Title"
+        updates = self.updates(self.article.update_to_db)
+        self.assertEqual(len(updates), 1)
+        self.assertIn("SET title =", updates[0])
+        self.assertNotIn("content", updates[0])
+        self.assertEqual(Article.fetch_by_id(self.article.id).title, "Second Title")
+
+        self.assertEqual(self.updates(self.article.update_to_db), [])
+        self.assertEqual(Article.write_counters.stats(), {"updates": 1, "columns": 1, "skipped": 1})
+
+    def test_deferred_content_is_not_loaded_or_written(self):
+        article = self.magazine.articles(defer=("content",))[0]
+        article.title = "Second Title"
+        updates = self.updates(article.update_to_db)
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn("content", updates[0])
+        self.assertEqual(Article.fetch_by_id(self.article.id).content, "A long body")
+
+    def test_changes_before_saving_are_not_tracked(self):
+        magazine = Magazine(None, "Science Now", "Science")
+        magazine.category = "Research"
+        magazine.save_to_db()
+        self.assertEqual(self.updates(magazine.update_to_db), [])
+        self.assertEqual(Magazine.fetch_by_id(magazine.id).category, "Research")
+
+    def test_instances_built_with_an_id_write_every_column(self):
+        Magazine(self.magazine.id, "Tech Monthly", "Science").update_to_db()
+        stored = Magazine.fetch_by_id(self.magazine.id)
+        self.assertEqual((stored.name, stored.category), ("Tech Monthly", "Science"))
+        article = Article(self.article.id, "Rebuilt Title", "Rebuilt body", self.author.id, self.magazine.id)
+        self.assertEqual(Article.update_many([article]), 1)
+        self.assertEqual(Article.fetch_by_id(self.article.id).content, "Rebuilt body")
+        self.assertEqual(Magazine.write_counters.stats(), {"updates": 1, "columns": 2, "skipped": 0})
+
+    def test_update_many_groups_by_changed_columns(self):
+        articles = Article.save_many([
+            Article(None, f"Title {i}", "Body", self.author.id, self.magazine.id) for i in range(4)
+        ])
+        articles[0].content = "Edited"
+        articles[1].content = "Edited"
+        articles[2].title = "Retitled"
+        updates = self.updates(lambda: self.assertEqual(Article.update_many(articles), 3))
+        self.assertEqual(sum("SET content =" in sql for sql in updates), 2)
+        self.assertEqual(sum("SET title =" in sql for sql in updates), 1)
+        self.assertEqual(Article.write_counters.stats(), {"updates": 3, "columns": 3, "skipped": 1})
+        self.assertEqual(Article.update_many(articles), 0)
+
+    def test_rejected_update_leaves_the_identity_map(self):
+        Magazine(None, "Science Now", "Science").save_to_db()
+        magazine = Magazine.fetch_by_id(self.magazine.id)
+        magazine.name = "Science Now"
+        with self.assertRaises(sqlite3.IntegrityError):
+            magazine.update_to_db()
+        self.assertEqual(magazine.name, "Science Now")
+        self.assertEqual(Magazine.fetch_by_id(self.magazine.id).name, "Tech Weekly")
+        self.assertEqual(Magazine.get_or_create("Tech Weekly", "Technology").id, self.magazine.id)
+
+        magazine.name = "Tech Daily"
+        magazine.update_to_db()
+        self.assertEqual(Magazine.fetch_by_id(self.magazine.id).name, "Tech Daily")
+
+    def test_write_behind_queues_only_changed_columns(self):
+        enable_write_behind()
+        try:
+            self.assertEqual(self.article.update_to_db().result(timeout=0), self.article.id)
+            self.article.content = "Queued body"
+            self.article.update_to_db().result()
+        finally:
+            disable_write_behind()
+        self.assertEqual(Article.fetch_by_id(self.article.id).content, "Queued body")
+        self.assertEqual(Article.write_counters.stats(), {"updates": 1, "columns": 1, "skipped": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import threading
+import unittest
+
+import database.connection as db
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestConnectionPool(DatabaseTestCase):
+    def test_nested_borrows_reuse_thread_connection(self):
+        pool = db.get_pool()
+        with pool.connection() as outer:
+            with pool.connection() as inner:
+                self.assertIs(outer, inner)
+
+    def test_threads_get_distinct_connections(self):
+        pool = db.ConnectionPool(db.DATABASE_NAME, size=2)
+        seen = []
+        barrier = threading.Barrier(2)
+
+        def borrow():
+            with pool.connection() as conn:
+                seen.append(id(conn))
+                barrier.wait()
+
+        threads = [threading.Thread(target=borrow) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pool.close()
+        self.assertEqual(len(set(seen)), 2)
+
+    def test_pool_size_is_bounded(self):
+        pool = db.ConnectionPool(db.DATABASE_NAME, size=1)
+        held = pool.acquire()
+        errors = []
+
+        def borrow():
+            try:
+                pool.acquire(timeout=0.05)
+            except RuntimeError as exc:
+                errors.append(exc)
+
+        thread = threading.Thread(target=borrow)
+        thread.start()
+        thread.join()
+        pool.release()
+        self.assertIs(pool.acquire(), held)
+        pool.release()
+        pool.close()
+        self.assertEqual(len(errors), 1)
+
+    def test_closed_pool_refuses_borrows(self):
+        pool = db.ConnectionPool(db.DATABASE_NAME, size=1)
+        pool.close()
+        with self.assertRaises(RuntimeError):
+            pool.acquire()
+
+    def test_models_round_trip_through_pool(self):
+        author = Author(None, "Jane Roe")
+        author.save_to_db()
+        magazine = Magazine(None, "Tech Weekly", "Technology")
+        magazine.save_to_db()
+        article = Article(None, "Pooled Title", "Body", author.id, magazine.id)
+        article.save_to_db()
+
+        self.assertEqual(Article.fetch_by_id(article.id).title, "Pooled Title")
+        self.assertEqual(article.author.name, "Jane Roe")
+        self.assertEqual([m.name for m in author.magazines()], ["Tech Weekly"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+import database.connection as db
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestArticleCounters(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authors = Author.save_many([Author(None, "Jane Roe"), Author(None, "John Doe")])
+        self.magazines = Magazine.save_many([
+            Magazine(None, "Tech Weekly", "Technology"), Magazine(None, "Art Daily", "Art"),
+        ])
+        self.articles = Article.save_many([
+            Article(None, f"Title {i}", "Body", self.authors[0].id, self.magazines[0].id)
+            for i in range(3)
+        ])
+
+    def pair_counts(self):
+        with db.db_connection() as connection:
+            return {
+                (row[0], row[1]): row[2]
+                for row in connection.execute("SELECT * FROM magazine_author_stats")
+            }
+
+    def test_counts_follow_inserts_updates_and_deletes(self):
+        self.assertEqual(self.authors[0].article_count(), 3)
+        self.assertEqual(self.magazines[0].article_count(), 3)
+        self.assertEqual([a.name for a in self.magazines[0].contributing_authors()], ["Jane Roe"])
+
+        moved = self.articles[0]
+        moved.author_id = self.authors[1].id
+        moved.magazine_id = self.magazines[1].id
+        moved.update_to_db()
+        self.assertEqual(self.authors[0].article_count(), 2)
+        self.assertEqual(self.authors[1].article_count(), 1)
+        self.assertEqual(self.magazines[1].article_count(), 1)
+        self.assertIsNone(self.magazines[0].contributing_authors())
+
+        Article.delete_many([a.id for a in self.articles])
+        self.assertEqual(self.authors[0].article_count(), 0)
+        self.assertEqual(self.pair_counts(), {})
+
+    def test_counts_match_group_by(self):
+        Article.save_many([
+            Article(None, f"Other {i}", "Body", self.authors[i % 2].id, self.magazines[i % 2].id)
+            for i in range(5)
+        ])
+        with db.db_connection() as connection:
+            expected = {
+                (row[0], row[1]): row[2]
+                for row in connection.execute(
+                    "SELECT magazine_id, author_id, COUNT(*) FROM articles GROUP BY 1, 2"
+                )
+            }
+        self.assertEqual(self.pair_counts(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import database.connection as db
+from database.migrations import migrate
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+from support import DatabaseTestCase
+
+DUPLICATED_SCHEMA = """
+    CREATE TABLE authors (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL);
+    CREATE TABLE magazines (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, category TEXT NOT NULL);
+    CREATE TABLE articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, content TEXT NOT NULL,
+        author_id INTEGER, magazine_id INTEGER
+    );
+    INSERT INTO authors (name) VALUES ('Jane Roe'), ('John Doe'), ('Jane Roe');
+    INSERT INTO magazines (name, category) VALUES ('Tech Weekly', 'Technology'), ('Tech Weekly', 'Science');
+    INSERT INTO articles (title, content, author_id, magazine_id) VALUES
+        ('First', 'Body', 1, 1), ('Second', 'Body', 3, 2), ('Third', 'Body', 2, 2);
+"""
+
+
+class TestDeduplicationMigration(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.connection = sqlite3.connect(os.path.join(self.tmpdir, "legacy.db"))
+        self.connection.executescript(DUPLICATED_SCHEMA)
+
+    def tearDown(self):
+        self.connection.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_merges_duplicates_and_repoints_articles(self):
+        migrate(self.connection)
+        self.assertEqual(
+            self.connection.execute("SELECT id, name FROM authors ORDER BY id").fetchall(),
+            [(1, "Jane Roe"), (2, "John Doe")],
+        )
+        self.assertEqual(
+            self.connection.execute("SELECT id, category FROM magazines").fetchall(), [(1, "Technology")]
+        )
+        self.assertEqual(
+            self.connection.execute("SELECT title, author_id, magazine_id FROM articles ORDER BY id").fetchall(),
+            [("First", 1, 1), ("Second", 1, 1), ("Third", 2, 1)],
+        )
+        self.assertEqual(
+            self.connection.execute("SELECT * FROM author_stats ORDER BY author_id").fetchall(), [(1, 2), (2, 1)]
+        )
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.connection.execute("INSERT INTO authors (name) VALUES ('Jane Roe')")
+
+
+class TestGetOrCreate(DatabaseTestCase):
+    def count(self, table):
+        with db.db_connection() as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_author_get_or_create_is_idempotent(self):
+        first = Author.get_or_create("Jane Roe")
+        self.assertIs(Author.get_or_create("Jane Roe"), first)
+        self.assertEqual(self.count("authors"), 1)
+        self.assertEqual(Author.name_cache.stats()["hits"], 1)
+
+    def test_finds_rows_saved_without_the_cache(self):
+        author = Author(None, "Jane Roe")
+        author.save_to_db()
+        self.assertEqual(Author.get_or_create("Jane Roe").id, author.id)
+        self.assertEqual(self.count("authors"), 1)
+
+    def test_cached_lookup_skips_name_query(self):
+        Author.get_or_create("Jane Roe")
+        with db.db_connection() as connection:
+            statements = []
+            connection.set_trace_callback(statements.append)
+            Author.get_or_create("Jane Roe")
+            connection.set_trace_callback(None)
+        self.assertEqual(statements, [])
+
+    def test_deleted_row_is_recreated(self):
+        author = Author.get_or_create("Jane Roe")
+        author.delete_from_db()
+        self.assertNotEqual(Author.get_or_create("Jane Roe").id, author.id)
+
+    def test_duplicate_save_is_rejected(self):
+        Author.get_or_create("Jane Roe")
+        with self.assertRaises(sqlite3.IntegrityError):
+            Author(None, "Jane Roe").save_to_db()
+
+    def test_magazine_get_or_create_keeps_category(self):
+        magazine = Magazine.get_or_create("Tech Weekly", "Technology")
+        again = Magazine.get_or_create("Tech Weekly", "Science")
+        self.assertEqual(again.id, magazine.id)
+        self.assertEqual(again.category, "Technology")
+
+    def test_magazine_upsert_updates_category(self):
+        magazine = Magazine.get_or_create("Tech Weekly", "Technology")
+        updated = Magazine.upsert("Tech Weekly", "Science")
+        self.assertEqual(updated.id, magazine.id)
+        self.assertEqual(Magazine.fetch_by_id(magazine.id).category, "Science")
+        self.assertEqual(self.count("magazines"), 1)
+
+    def test_renamed_magazine_is_not_returned_for_old_name(self):
+        magazine = Magazine.get_or_create("Tech Weekly", "Technology")
+        magazine.name = "Tech Monthly"
+        magazine.update_to_db()
+        self.assertNotEqual(Magazine.get_or_create("Tech Weekly", "Technology").id, magazine.id)
+
+    def test_related_articles_share_one_author(self):
+        magazine = Magazine.get_or_create("Tech Weekly", "Technology")
+        for title in ("First", "Second"):
+            author = Author.get_or_create("Jane Roe")
+            Article(None, title, "Body", author.id, magazine.id).save_to_db()
+        self.assertEqual(Author.get_or_create("Jane Roe").article_count(), 2)
+
+    def test_rejects_invalid_names(self):
+        with self.assertRaises(ValueError):
+            Author.get_or_create("")
+        with self.assertRaises(ValueError):
+            Magazine.upsert("X", "Technology")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestHydration(unittest.TestCase):
+    def test_from_row_skips_validation(self):
+        article = Article.from_row((7, "Hi", "Body", 1, 2))
+        self.assertEqual((article.id, article.title, article.magazine_id), (7, "Hi", 2))
+        self.assertEqual(Magazine.from_row((1, "X", "Tech")).name, "X")
+
+    def test_instances_have_no_dict(self):
+        for instance in (
+            Author(1, "John Doe"),
+            Magazine(1, "Tech Weekly", "Technology"),
+            Article(1, "Test Title", "Test Content", 1, 1),
+        ):
+            self.assertFalse(hasattr(instance, "__dict__"))
+
+
+class TestHydratedFetches(DatabaseTestCase):
+    def test_fetched_instances_behave_like_constructed_ones(self):
+        author = Author(None, "Jane Roe")
+        author.save_to_db()
+        fetched = Author.fetch_all()[0]
+        self.assertEqual((fetched.id, fetched.name), (author.id, "Jane Roe"))
+        with self.assertRaises(AttributeError):
+            fetched.name = "Someone Else"
+
+
+if __name__ == "__main__":
+    unittest.main()
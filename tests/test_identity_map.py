@@ -0,0 +1,54 @@
+import unittest
+
+from models.author import Author
+from models.magazine import Magazine
+from models.identity_map import IdentityMap
+from support import DatabaseTestCase
+
+
+class Record:
+    def __init__(self, id):
+        self.id = id
+
+
+class TestIdentityMap(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        identity_map = IdentityMap(maxsize=2)
+        identity_map.add(Record(1))
+        identity_map.add(Record(2))
+        identity_map.get(1)
+        identity_map.add(Record(3))
+        self.assertIn(1, identity_map)
+        self.assertNotIn(2, identity_map)
+        self.assertEqual(identity_map.stats()["hits"], 1)
+
+    def test_add_keeps_existing_instance(self):
+        identity_map = IdentityMap()
+        first = identity_map.add(Record(1))
+        self.assertIs(identity_map.add(Record(1)), first)
+
+
+class TestFetchByIdIdentity(DatabaseTestCase):
+    def test_same_id_returns_same_instance(self):
+        author = Author(None, "Jane Roe")
+        author.save_to_db()
+        self.assertIs(Author.fetch_by_id(author.id), Author.fetch_by_id(author.id))
+        self.assertEqual(Author.identity_map.stats()["hits"], 1)
+        self.assertEqual(Author.identity_map.stats()["misses"], 1)
+
+    def test_update_and_delete_invalidate(self):
+        magazine = Magazine(None, "Tech Weekly", "Technology")
+        magazine.save_to_db()
+        cached = Magazine.fetch_by_id(magazine.id)
+        magazine.category = "Science"
+        magazine.update_to_db()
+        refreshed = Magazine.fetch_by_id(magazine.id)
+        self.assertIsNot(refreshed, cached)
+        self.assertEqual(refreshed.category, "Science")
+
+        refreshed.delete_from_db()
+        self.assertIsNone(Magazine.fetch_by_id(magazine.id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import unittest
+
+from database import instrumentation
+from database.instrumentation import track_queries
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestInstrumentation(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        instrumentation.reset()
+        self.author = Author(None, "Jane Roe")
+        self.author.save_to_db()
+        self.magazine = Magazine(None, "Tech Weekly", "Technology")
+        self.magazine.save_to_db()
+        Article.save_many([
+            Article(None, f"Title {i}", "Body", self.author.id, self.magazine.id) for i in range(3)
+        ])
+
+    def tearDown(self):
+        instrumentation.reset()
+        super().tearDown()
+
+    def test_track_queries_counts_statements(self):
+        with track_queries() as queries:
+            contributors = self.magazine.contributors()
+        # The result cache checks PRAGMA data_version before the query.
+        self.assertEqual(queries.count, 2)
+        self.assertIn("FROM authors", queries.statements[1])
+
+        stats = instrumentation.snapshot()["Magazine.contributors"]
+        self.assertEqual((stats["calls"], stats["statements"], stats["rows"]), (1, 2, len(contributors)))
+        self.assertEqual(sum(stats["histogram_ms"].values()), 1)
+
+    def test_nested_calls_count_towards_outer_method(self):
+        with track_queries():
+            Article.fetch_all(prefetch=("author", "magazine"))
+        metrics = instrumentation.snapshot()
+        self.assertEqual(metrics["Article.fetch_all"]["statements"], 3)
+        self.assertEqual(metrics["Author.fetch_many_by_ids"]["statements"], 1)
+        self.assertEqual(metrics["Article.fetch_all"]["rows"], 3)
+
+    def test_nothing_recorded_while_disabled(self):
+        self.magazine.contributors()
+        self.assertEqual(instrumentation.snapshot(), {})
+
+    def test_export_json(self):
+        with track_queries():
+            Author.fetch_by_id(self.author.id)
+        self.assertIn("Author.fetch_by_id", json.loads(instrumentation.export_json()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from database.migrations import LATEST_VERSION, migrate, schema_version
+from support import DatabaseTestCase
+import database.connection as db
+
+BASELINE_SCHEMA = """
+    CREATE TABLE authors (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL);
+    CREATE TABLE magazines (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, category TEXT NOT NULL);
+    CREATE TABLE articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, content TEXT NOT NULL,
+        author_id INTEGER, magazine_id INTEGER,
+        FOREIGN KEY (author_id) REFERENCES authors (id),
+        FOREIGN KEY (magazine_id) REFERENCES magazines (id)
+    );
+    INSERT INTO authors (name) VALUES ('Jane Roe');
+    INSERT INTO magazines (name, category) VALUES ('Tech Weekly', 'Technology');
+    INSERT INTO articles (title, content, author_id, magazine_id) VALUES ('Old Title', 'Body', 1, 1);
+"""
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.connection = sqlite3.connect(os.path.join(self.tmpdir, "legacy.db"))
+        self.connection.executescript(BASELINE_SCHEMA)
+
+    def tearDown(self):
+        self.connection.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_upgrades_existing_database_in_place(self):
+        self.assertEqual(schema_version(self.connection), 0)
+        self.assertEqual(migrate(self.connection), list(range(1, LATEST_VERSION + 1)))
+        self.assertEqual(schema_version(self.connection), LATEST_VERSION)
+        self.assertEqual(
+            self.connection.execute("SELECT title FROM articles").fetchall(), [("Old Title",)]
+        )
+        self.assertEqual(
+            self.connection.execute("SELECT * FROM magazine_author_stats").fetchall(), [(1, 1, 1)]
+        )
+        self.assertEqual(migrate(self.connection), [])
+
+    def test_migrates_to_target_version(self):
+        self.assertEqual(migrate(self.connection, target=1), [1])
+        self.assertEqual(schema_version(self.connection), 1)
+
+    def test_rejects_newer_schema(self):
+        self.connection.execute(f"PRAGMA user_version = {LATEST_VERSION + 1}")
+        with self.assertRaises(ValueError):
+            migrate(self.connection)
+
+
+class TestRelationshipIndexes(DatabaseTestCase):
+    def plan(self, sql):
+        with db.db_connection() as connection:
+            return " ".join(row["detail"] for row in connection.execute("EXPLAIN QUERY PLAN " + sql, (1,)))
+
+    def test_relationship_queries_use_indexes(self):
+        self.assertIn("INDEX idx_articles_author", self.plan("SELECT * FROM articles WHERE author_id = ?"))
+        self.assertIn(
+            "COVERING INDEX idx_articles_magazine_title",
+            self.plan("SELECT title FROM articles WHERE magazine_id = ?"),
+        )
+        self.assertIn(
+            "COVERING INDEX idx_articles_magazine_author",
+            self.plan("SELECT DISTINCT author_id FROM articles WHERE magazine_id = ?"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from database.pagination import decode_cursor
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestKeysetPagination(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authors = Author.save_many(
+            [Author(None, name) for name in ["Cara", "Abe", "Bea", "Ada", "Dan"]]
+        )
+        self.magazine = Magazine(None, "Tech Weekly", "Technology")
+        self.magazine.save_to_db()
+        Article.save_many([
+            Article(None, f"Title {i % 4}", "Body", self.authors[i % 2].id, self.magazine.id)
+            for i in range(9)
+        ])
+
+    def collect(self, fetch, **kwargs):
+        pages, after = [], None
+        while True:
+            items, after = fetch(after=after, **kwargs)
+            pages.append(items)
+            if after is None:
+                return pages
+
+    def test_pages_cover_every_row_once_in_order(self):
+        pages = self.collect(Author.fetch_page, limit=2, order_by="name")
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        ordered = [(a.name, a.id) for page in pages for a in page]
+        self.assertEqual(ordered, sorted((a.name, a.id) for a in self.authors))
+
+    def test_relationship_pages(self):
+        pages = self.collect(self.magazine.articles_page, limit=4, order_by="title")
+        titles = [a.title for page in pages for a in page]
+        self.assertEqual(titles, sorted(a.title for a in self.magazine.articles()))
+        by_author = self.collect(self.authors[0].articles_page, limit=2)
+        self.assertEqual(
+            [a.id for page in by_author for a in page],
+            [a.id for a in self.authors[0].articles()],
+        )
+
+    def test_cursor_is_bound_to_ordering(self):
+        _, after = Article.fetch_page(limit=1, order_by="title")
+        with self.assertRaises(ValueError):
+            Article.fetch_page(after=after, order_by="id")
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor", "id")
+
+    def test_rejects_unindexed_ordering(self):
+        with self.assertRaises(ValueError):
+            Magazine.fetch_page(order_by="category")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+import database.bulk as bulk
+import database.connection as db
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestPrefetch(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authors = Author.save_many([Author(None, f"Author {i}") for i in range(3)])
+        self.magazines = Magazine.save_many([Magazine(None, f"Mag {i}", "Tech") for i in range(2)])
+        Article.save_many([
+            Article(None, f"Title {i}", "Body", self.authors[i % 3].id, self.magazines[i % 2].id)
+            for i in range(6)
+        ])
+
+    def record_queries(self):
+        statements = []
+        with db.db_connection() as connection:
+            connection.set_trace_callback(statements.append)
+        return statements
+
+    def test_fetch_all_prefetch_avoids_per_article_queries(self):
+        statements = self.record_queries()
+        articles = Article.fetch_all(prefetch=("author", "magazine"))
+        self.assertEqual(
+            [(a.author.name, a.magazine.name) for a in articles],
+            [(f"Author {i % 3}", f"Mag {i % 2}") for i in range(6)],
+        )
+        self.assertIs(articles[0].author, articles[3].author)
+        self.assertEqual(len(statements), 3)
+
+    def test_prefetch_chunks_by_parameter_limit(self):
+        articles = Article.fetch_all()
+        Author.identity_map.clear()
+        statements = self.record_queries()
+        original = bulk.MAX_VARIABLES
+        bulk.MAX_VARIABLES = 2
+        try:
+            Article.prefetch(articles, ("author",))
+        finally:
+            bulk.MAX_VARIABLES = original
+        self.assertEqual(len(statements), 2)
+        self.assertEqual(articles[2].author.name, "Author 2")
+
+    def test_unknown_relation_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Article.prefetch([], ("editor",))
+
+
+if __name__ == "__main__":
+    unittest.main()
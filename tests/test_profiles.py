@@ -0,0 +1,44 @@
+import sqlite3
+import unittest
+
+import database.connection as db
+from support import DatabaseTestCase
+
+
+class TestConnectionProfiles(DatabaseTestCase):
+    def pragma(self, name):
+        with db.db_connection() as connection:
+            return connection.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def test_default_profile_enables_wal(self):
+        self.assertEqual(self.pragma("journal_mode"), "wal")
+        self.assertEqual(self.pragma("busy_timeout"), db.PROFILES[db.PROFILE]["busy_timeout"])
+
+    def test_profile_is_chosen_per_pool(self):
+        original = db.PROFILE
+        db.close_pool()
+        db.PROFILE = "durable"
+        try:
+            self.assertEqual(self.pragma("synchronous"), 2)
+        finally:
+            db.close_pool()
+            db.PROFILE = original
+
+    def test_reporting_profile_is_read_only(self):
+        pool = db.ConnectionPool(db.DATABASE_NAME, size=1, profile="reporting")
+        with pool.connection() as connection:
+            with self.assertRaises(sqlite3.OperationalError):
+                connection.execute("INSERT INTO authors (name) VALUES ('Jane Roe')")
+        pool.close()
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            db.ConnectionPool(db.DATABASE_NAME, profile="fastest")
+        connection = sqlite3.connect(":memory:")
+        with self.assertRaises(ValueError):
+            db.configure_connection(connection, "fastest")
+        connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
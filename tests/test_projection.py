@@ -0,0 +1,76 @@
+import gc
+import unittest
+import weakref
+
+import database.connection as db
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestDeferredColumns(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = Author(None, "Jane Roe")
+        self.author.save_to_db()
+        self.magazine = Magazine(None, "Tech Weekly", "Technology")
+        self.magazine.save_to_db()
+        Article.save_many([
+            Article(None, f"Title {i}", f"Body {i}", self.author.id, self.magazine.id)
+            for i in range(4)
+        ])
+
+    def record_queries(self):
+        statements = []
+        with db.db_connection() as connection:
+            connection.set_trace_callback(statements.append)
+        return statements
+
+    def test_deferred_content_loads_once_for_the_whole_query(self):
+        articles = Article.fetch_all(defer=("content",))
+        statements = self.record_queries()
+        self.assertEqual([a.content for a in articles], [f"Body {i}" for i in range(4)])
+        self.assertEqual(len(statements), 1)
+        self.assertIn("content", statements[0])
+
+    def test_only_selects_requested_columns(self):
+        statements = self.record_queries()
+        articles = self.magazine.articles(only=("title",))
+        self.assertNotIn("content", statements[0])
+        self.assertEqual(articles[0].title, "Title 0")
+        self.assertEqual(articles[0].author_id, self.author.id)
+
+    def test_streamed_projection(self):
+        articles = list(self.author.iter_articles(batch_size=3, defer="content"))
+        self.assertEqual(articles[3].content, "Body 3")
+        self.assertEqual(len(list(Article.iter_all(only="title"))), 4)
+
+    def test_kept_article_does_not_keep_its_batch_alive(self):
+        articles = list(Article.iter_all(batch_size=4, defer="content"))
+        kept, others = articles[0], [weakref.ref(article) for article in articles[1:]]
+        del articles
+        gc.collect()
+        self.assertEqual([other() for other in others], [None, None, None])
+        statements = self.record_queries()
+        self.assertEqual(kept.content, "Body 0")
+        self.assertIn(f"IN ({kept.id})", statements[0])
+        self.assertIsNone(kept._deferred)
+
+    def test_assigning_a_deferred_column_skips_loading(self):
+        article = Article.fetch_all(only=("title",))[0]
+        article.content = "Replaced"
+        self.assertEqual(article.content, "Replaced")
+        self.assertEqual(article.magazine_id, self.magazine.id)
+
+    def test_invalid_projection(self):
+        with self.assertRaises(ValueError):
+            Article.fetch_all(only=("title",), defer=("content",))
+        with self.assertRaises(ValueError):
+            Article.fetch_all(defer=("body",))
+        with self.assertRaises(ValueError):
+            Article.fetch_all(defer=("id",))
+
+
+if __name__ == "__main__":
+    unittest.main()
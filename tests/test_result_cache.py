@@ -0,0 +1,85 @@
+import sqlite3
+import unittest
+
+import database.connection as db
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+from models.result_cache import ResultCache, relation_cache
+from support import DatabaseTestCase
+
+
+class TestResultCache(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = Author(None, "Jane Roe")
+        self.author.save_to_db()
+        self.magazine = Magazine(None, "Tech Weekly", "Technology")
+        self.magazine.save_to_db()
+        Article(None, "First Title", "Body", self.author.id, self.magazine.id).save_to_db()
+
+    def statements(self, call):
+        with db.db_connection() as connection:
+            statements = []
+            connection.set_trace_callback(statements.append)
+            try:
+                call()
+            finally:
+                connection.set_trace_callback(None)
+        return statements
+
+    def test_repeat_call_only_checks_data_version(self):
+        first = self.author.magazines()
+        self.assertEqual(self.statements(self.author.magazines), ["PRAGMA data_version"])
+        self.assertEqual([m.id for m in self.author.magazines()], [m.id for m in first])
+        self.assertGreaterEqual(relation_cache.stats()["hits"], 2)
+
+    def test_arguments_are_part_of_the_key(self):
+        full = self.author.articles()
+        deferred = self.author.articles(defer=("content",))
+        self.assertIsNot(full[0], deferred[0])
+
+    def test_model_writes_invalidate(self):
+        self.assertEqual(self.magazine.article_titles(), ["First Title"])
+        Article(None, "Second Title", "Body", self.author.id, self.magazine.id).save_to_db()
+        self.assertEqual(sorted(self.magazine.article_titles()), ["First Title", "Second Title"])
+
+    def test_other_connection_writes_invalidate(self):
+        self.assertEqual(len(self.magazine.articles()), 1)
+        other = sqlite3.connect(db.DATABASE_NAME)
+        with other:
+            other.execute(
+                "INSERT INTO articles (title, content, author_id, magazine_id) VALUES (?, ?, ?, ?)",
+                ("Second Title", "Body", self.author.id, self.magazine.id),
+            )
+        other.close()
+        self.assertEqual(len(self.magazine.articles()), 2)
+
+    def test_results_are_copies(self):
+        self.magazine.contributors().clear()
+        self.assertEqual(len(self.magazine.contributors()), 1)
+
+    def test_cached_instances_are_not_shared(self):
+        self.author.articles()[0].title = "Unsaved edit"
+        self.author.articles(defer=("content",))[0].title = "Unsaved edit"
+        self.assertEqual(self.author.articles()[0].title, "First Title")
+        self.assertEqual(self.author.articles(defer=("content",))[0].title, "First Title")
+        self.assertIsNot(self.magazine.contributors()[0], self.magazine.contributors()[0])
+
+    def test_none_results_are_cached(self):
+        self.assertIsNone(self.magazine.contributing_authors())
+        self.assertEqual(self.statements(self.magazine.contributing_authors), ["PRAGMA data_version"])
+
+    def test_results_computed_before_an_invalidation_are_not_stored(self):
+        cache = ResultCache(maxsize=2)
+        with db.db_connection() as connection:
+            generation = cache.validate(connection)
+            connection.execute("DELETE FROM articles")
+            cache.validate(connection)
+            connection.rollback()
+        cache.store("key", ("stale",), generation)
+        self.assertNotIn("key", cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import sqlite3
+import unittest
+
+import database.connection as db
+from database.setup import rebuild_search_index
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestArticleSearch(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authors = Author.save_many([Author(None, "Jane Roe"), Author(None, "John Doe")])
+        self.magazines = Magazine.save_many([
+            Magazine(None, "Tech Weekly", "Technology"), Magazine(None, "Art Daily", "Art"),
+        ])
+        self.articles = Article.save_many([
+            Article(None, "Indexing SQLite", "Covering indexes make sqlite fast.",
+                    self.authors[0].id, self.magazines[0].id),
+            Article(None, "Painting light", "Oil paint and sqlite have little in common.",
+                    self.authors[1].id, self.magazines[1].id),
+            Article(None, "Gardening notes", "Tomatoes need sun.",
+                    self.authors[1].id, self.magazines[1].id),
+        ])
+
+    def test_ranked_results_with_snippets(self):
+        results = Article.search("sqlite")
+        self.assertEqual([a.title for a, _ in results], ["Indexing SQLite", "Painting light"])
+        self.assertIn("[SQLite]", results[0][1])
+        self.assertEqual(results[0][0].content, "Covering indexes make sqlite fast.")
+
+    def test_filters_and_limit(self):
+        self.assertEqual(
+            [a.title for a, _ in Article.search("sqlite", magazine_id=self.magazines[1].id)],
+            ["Painting light"],
+        )
+        self.assertEqual(Article.search("sqlite", author_id=self.authors[0].id)[0][0].id,
+                         self.articles[0].id)
+        self.assertEqual(len(Article.search("sqlite", limit=1)), 1)
+
+    def test_index_follows_updates_and_deletes(self):
+        article = self.articles[2]
+        article.content = "Tomatoes love sqlite."
+        article.update_to_db()
+        self.assertEqual(len(Article.search("tomatoes AND sqlite")), 1)
+        article.delete_from_db()
+        self.assertEqual(Article.search("tomatoes"), [])
+
+    def test_rebuild_keeps_results(self):
+        rebuild_search_index()
+        self.assertEqual(len(Article.search("sqlite")), 2)
+
+    def test_invalid_query(self):
+        for query in ('"unbalanced', "AND", "author:smith"):
+            with self.subTest(query=query), self.assertRaises(ValueError):
+                Article.search(query)
+
+    def test_database_errors_are_not_reported_as_invalid_queries(self):
+        with db.db_connection() as connection:
+            connection.execute("DROP TABLE articles_fts")
+            connection.commit()
+        with self.assertRaises(sqlite3.OperationalError):
+            Article.search("sqlite")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import database.connection as db
+from database.migrations import migrate
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+from support import DatabaseTestCase
+
+LEGACY_SCHEMA = """
+    CREATE TABLE authors (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL);
+    CREATE TABLE magazines (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, category TEXT NOT NULL);
+    CREATE TABLE articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, content TEXT NOT NULL,
+        author_id INTEGER, magazine_id INTEGER,
+        FOREIGN KEY (author_id) REFERENCES authors (id),
+        FOREIGN KEY (magazine_id) REFERENCES magazines (id)
+    );
+    INSERT INTO authors (name) VALUES ('Jane Roe');
+    INSERT INTO magazines (name, category) VALUES ('Tech Weekly', 'Technology');
+    INSERT INTO articles (title, content, author_id, magazine_id) VALUES ('Kept Title', 'Body', 1, 1);
+    INSERT INTO articles (title, content, author_id, magazine_id) VALUES ('Gone Title', 'Body', 1, 1);
+    DELETE FROM articles WHERE title = 'Gone Title';
+"""
+
+
+class TestCascadeMigration(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.connection = sqlite3.connect(os.path.join(self.tmpdir, "legacy.db"))
+        self.connection.executescript(LEGACY_SCHEMA)
+
+    def tearDown(self):
+        self.connection.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_rebuilds_articles_with_cascading_foreign_keys(self):
+        migrate(self.connection)
+        actions = {row[2]: row[6] for row in self.connection.execute("PRAGMA foreign_key_list(articles)")}
+        self.assertEqual(actions, {"authors": "CASCADE", "magazines": "CASCADE"})
+        self.assertEqual(self.connection.execute("SELECT id, title FROM articles").fetchall(), [(1, "Kept Title")])
+        self.assertEqual(self.connection.execute("SELECT seq FROM sqlite_sequence WHERE name = 'articles'").fetchone(), (2,))
+
+        # Indexes, counter triggers and the search index survive the rebuild.
+        self.assertIn(
+            "idx_articles_author",
+            [row[1] for row in self.connection.execute("PRAGMA index_list(articles)")],
+        )
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("DELETE FROM authors WHERE id = 1")
+        self.assertEqual(self.connection.execute("SELECT COUNT(*) FROM articles").fetchone(), (0,))
+        self.assertEqual(self.connection.execute("SELECT COUNT(*) FROM magazine_stats").fetchone(), (0,))
+        self.assertEqual(
+            self.connection.execute("SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH 'kept'").fetchone(), (0,)
+        )
+
+
+class TestSetBasedWrites(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jane, self.john = Author.save_many([Author(None, "Jane Roe"), Author(None, "John Doe")])
+        self.tech, self.science = Magazine.save_many([
+            Magazine(None, "Tech Weekly", "Technology"), Magazine(None, "Science Now", "Science"),
+        ])
+        Article.save_many([
+            Article(None, f"Title {i}", "Body", (self.jane, self.john)[i % 2].id, (self.tech, self.science)[i % 3 == 0].id)
+            for i in range(6)
+        ])
+
+    def statements(self, call):
+        with db.db_connection() as connection:
+            statements = []
+            connection.set_trace_callback(statements.append)
+            try:
+                result = call()
+            finally:
+                connection.set_trace_callback(None)
+        return result, [sql for sql in dict.fromkeys(statements) if sql.startswith(("UPDATE", "DELETE"))]
+
+    def test_update_where_reassigns_articles_in_one_statement(self):
+        moved, statements = self.statements(
+            lambda: Article.update_where({"author_id": self.john.id}, author_id=self.jane.id)
+        )
+        self.assertEqual(moved, 3)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(self.jane.article_count(), 0)
+        self.assertEqual(self.john.article_count(), 6)
+
+    def test_delete_where_removes_a_magazines_articles(self):
+        deleted, statements = self.statements(lambda: Article.delete_where(magazine_id=self.tech.id))
+        self.assertEqual(deleted, 4)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(self.tech.articles(), [])
+        self.assertEqual(self.tech.article_count(), 0)
+
+    def test_conditions(self):
+        self.assertEqual(Article.delete_where(title=["Title 0", "Title 1", "Missing"]), 2)
+        self.assertEqual(Article.delete_where(author_id=None), 0)
+        self.assertEqual(Article.update_where({"content": "Edited"}, author_id=self.jane.id, magazine_id=self.tech.id), 2)
+        self.assertEqual(Magazine.update_where({"category": "Research"}, category="Science"), 1)
+        self.assertEqual(Magazine.fetch_by_id(self.science.id).category, "Research")
+
+    def test_rejects_invalid_predicates_and_values(self):
+        with self.assertRaises(ValueError):
+            Article.delete_where()
+        with self.assertRaises(ValueError):
+            Article.delete_where(body="Body")
+        with self.assertRaises(ValueError):
+            Article.update_where({"id": 1}, author_id=self.jane.id)
+        with self.assertRaises(ValueError):
+            Article.update_where({"title": "Hi"}, author_id=self.jane.id)
+        with self.assertRaises(ValueError):
+            Magazine.update_where({}, id=self.tech.id)
+
+    def test_update_where_rejects_duplicate_names(self):
+        with self.assertRaises(ValueError):
+            Magazine.update_where({"name": "Science Now"}, id=self.tech.id)
+        with self.assertRaises(ValueError):
+            Magazine.update_where({"name": "Merged"}, id=[self.tech.id, self.science.id])
+        self.assertEqual(sorted(m.name for m in Magazine.fetch_all()), ["Science Now", "Tech Weekly"])
+
+    def test_delete_keeps_articles_unless_cascading(self):
+        self.jane.delete_from_db()
+        self.assertEqual(len(Article.fetch_all()), 6)
+
+        _, statements = self.statements(lambda: self.john.delete_from_db(cascade=True))
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(sorted(a.author_id for a in Article.fetch_all()), [self.jane.id] * 3)
+        self.assertEqual(self.tech.article_count() + self.science.article_count(), 3)
+        with db.db_connection() as connection:
+            self.assertEqual(connection.execute("PRAGMA foreign_keys").fetchone()[0], 0)
+
+    def test_cascading_delete_where_and_delete_many(self):
+        self.assertEqual(Magazine.delete_where(cascade=True, category="Science"), 1)
+        self.assertEqual(len(Article.fetch_all()), 4)
+        self.assertEqual(Author.delete_many([self.jane.id], cascade=True), 1)
+        self.assertEqual(len(Article.fetch_all()), 2)
+        self.assertEqual(len(Article.search("Title")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import database.connection as db
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from support import DatabaseTestCase
+
+
+class TestStreaming(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = Author(None, "Jane Roe")
+        self.author.save_to_db()
+        self.magazine = Magazine(None, "Tech Weekly", "Technology")
+        self.magazine.save_to_db()
+        Article.save_many([
+            Article(None, f"Title {i}", "Body", self.author.id, self.magazine.id)
+            for i in range(10)
+        ])
+
+    def test_iter_all_matches_fetch_all(self):
+        streamed = [a.title for a in Article.iter_all(batch_size=3)]
+        self.assertEqual(streamed, [a.title for a in Article.fetch_all()])
+        self.assertEqual([a.name for a in Author.iter_all()], ["Jane Roe"])
+        self.assertEqual([m.name for m in Magazine.iter_all(batch_size=1)], ["Tech Weekly"])
+
+    def test_relationship_iterators(self):
+        self.assertEqual(len(list(self.author.iter_articles(batch_size=4))), 10)
+        self.assertEqual(len(list(self.magazine.iter_articles(batch_size=4))), 10)
+
+    def test_connection_released_when_generator_closed(self):
+        pool = db.get_pool()
+        stream = Article.iter_all(batch_size=2)
+        next(stream)
+        self.assertIsNotNone(pool._local.conn)
+        stream.close()
+        self.assertIsNone(pool._local.conn)
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            next(Article.iter_all(batch_size=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import unittest
+
+import database.connection as db
+from database.setup import create_tables
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+from support import DatabaseTestCase
+from transfer import dump_path, export_data, import_data
+
+
+class TestTransfer(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dump = os.path.join(self._tmpdir, "dump")
+        authors = Author.save_many([Author(None, f"Author {i}") for i in range(3)])
+        magazines = Magazine.save_many([Magazine(None, f"Mag {i}", "Technology") for i in range(2)])
+        Article.save_many([
+            Article(None, f"Article {i}", f"Body {i}", authors[i % 3].id, magazines[i % 2].id)
+            for i in range(10)
+        ])
+        # Leave a gap in the ids, so the import has to map them.
+        Author.delete_many([authors[0].id])
+
+    def switch_database(self, name):
+        db.close_pool()
+        db.DATABASE_NAME = os.path.join(self._tmpdir, name)
+        create_tables()
+        self.clear_identity_maps()
+
+    def graph(self):
+        with db.db_connection() as connection:
+            return sorted(tuple(row) for row in connection.execute(
+                """
+                SELECT articles.title, authors.name, magazines.name
+                FROM articles
+                LEFT JOIN authors ON authors.id = articles.author_id
+                LEFT JOIN magazines ON magazines.id = articles.magazine_id
+                """
+            ).fetchall())
+
+    def test_round_trip(self):
+        for fmt in ("csv", "jsonl"):
+            with self.subTest(fmt=fmt):
+                self.switch_database("test.db")
+                expected = self.graph()
+                stats = export_data(self.dump, fmt)
+                self.assertEqual(stats["articles"]["rows"], 10)
+                self.assertTrue(os.path.exists(dump_path(self.dump, "authors", fmt)))
+
+                self.switch_database(f"copy-{fmt}.db")
+                Author(None, "Author 2").save_to_db()
+                stats = import_data(self.dump, fmt, chunk_size=3)
+                self.assertEqual(stats["articles"]["rows"], 10)
+                self.assertEqual(self.graph(), expected)
+                self.assertEqual(len(Author.fetch_all()), 2)
+
+    def test_resumes_after_last_committed_chunk(self):
+        expected = self.graph()
+        export_data(self.dump, "jsonl")
+        self.switch_database("copy.db")
+
+        def interrupt(table, rows, seconds):
+            if table == "articles" and rows == 4:
+                raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            import_data(self.dump, "jsonl", chunk_size=2, progress=interrupt)
+        self.assertEqual(len(Article.fetch_all()), 4)
+
+        stats = import_data(self.dump, "jsonl", chunk_size=2)
+        self.assertEqual(stats["articles"], dict(stats["articles"], rows=6, skipped=4))
+        self.assertEqual(self.graph(), expected)
+        self.assertEqual(import_data(self.dump, "jsonl")["articles"]["rows"], 0)
+        self.assertEqual(import_data(self.dump, "jsonl", restart=True)["articles"]["rows"], 10)
+        self.assertEqual(len(Article.fetch_all()), 20)
+
+    def test_reports_invalid_rows(self):
+        export_data(self.dump, "csv")
+        with open(dump_path(self.dump, "magazines", "csv"), "a") as handle:
+            handle.write("99,X,Technology\n")
+        self.switch_database("copy.db")
+        with self.assertRaises(ValueError) as raised:
+            import_data(self.dump, "csv")
+        self.assertIn("row 3", str(raised.exception))
+
+    def test_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_data(self.dump, "xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import sqlite3
+import threading
+import unittest
+
+from models.author import Author
+from models.magazine import Magazine
+from models.article import Article
+from models.write_behind import WriteBehindQueue, disable_write_behind, enable_write_behind
+from support import DatabaseTestCase
+
+
+class TestWriteBehind(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = Author(None, "Jane Roe")
+        self.author.save_to_db()
+        self.magazine = Magazine(None, "Tech Weekly", "Technology")
+        self.magazine.save_to_db()
+
+    def tearDown(self):
+        disable_write_behind()
+        super().tearDown()
+
+    def test_concurrent_saves_are_group_committed(self):
+        writer = enable_write_behind(flush_interval=0.05, batch_size=1000)
+        futures = []
+        lock = threading.Lock()
+
+        def produce(worker):
+            for i in range(50):
+                article = Article(None, f"Title {worker}-{i}", "Body", self.author.id, self.magazine.id)
+                future = article.save_to_db()
+                with lock:
+                    futures.append((article, future))
+
+        threads = [threading.Thread(target=produce, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.flush()
+
+        self.assertTrue(all(article.id == future.result() for article, future in futures))
+        self.assertEqual(len({article.id for article, _ in futures}), 400)
+        self.assertLess(writer.batches, 400)
+        self.assertEqual(self.author.article_count(), 400)
+
+    def test_updates_and_deletes_are_queued(self):
+        enable_write_behind()
+        article = Article(None, "Queued Title", "Body", self.author.id, self.magazine.id)
+        article.save_to_db().result()
+        article.content = "Edited"
+        article.update_to_db()
+        self.magazine.delete_from_db()
+        disable_write_behind()
+
+        self.assertEqual(Article.fetch_by_id(article.id).content, "Edited")
+        self.assertIsNone(Magazine.fetch_by_id(self.magazine.id))
+
+    def test_failed_write_does_not_sink_the_batch(self):
+        writer = WriteBehindQueue(flush_interval=0.2)
+        good = writer.save(Author(None, "Good Name"))
+        bad = writer.save(Author.from_row((None, None)))
+        writer.close()
+        self.assertIsNotNone(Author.fetch_by_id(good.result()))
+        self.assertIsNotNone(bad.exception())
+
+    def test_cancelled_writes_are_skipped(self):
+        writer = enable_write_behind(flush_interval=0.5)
+        kept = Author(None, "Kept Author")
+        cancelled = Author(None, "Cancelled Author")
+        kept_future = kept.save_to_db()
+        cancelled_future = cancelled.save_to_db()
+        self.assertTrue(cancelled_future.cancel())
+        writer.flush()
+        self.assertEqual(kept_future.result(timeout=1), kept.id)
+        self.assertIsNone(cancelled.id)
+        self.assertEqual(sorted(a.name for a in Author.fetch_all()), ["Jane Roe", "Kept Author"])
+
+        later = Author(None, "Later Author")
+        self.assertEqual(later.save_to_db().result(timeout=1), later.id)
+
+    def test_writer_survives_unexpected_errors(self):
+        writer = WriteBehindQueue(flush_interval=0)
+
+        def fail(writes):
+            raise RuntimeError("Commit failed.")
+
+        try:
+            writer._commit = fail
+            broken = writer.save(Author(None, "Broken Author"))
+            with self.assertRaises(RuntimeError):
+                broken.result(timeout=1)
+            del writer._commit
+            author = Author(None, "Later Author")
+            self.assertEqual(writer.save(author).result(timeout=1), author.id)
+        finally:
+            writer.close()
+
+    def test_failed_update_keeps_its_changes(self):
+        other = Magazine(None, "Science Now", "Science")
+        other.save_to_db()
+        enable_write_behind(flush_interval=0)
+        magazine = Magazine.fetch_by_id(self.magazine.id)
+        magazine.name = "Science Now"
+        with self.assertRaises(sqlite3.IntegrityError):
+            magazine.update_to_db().result(timeout=1)
+        self.assertEqual(Magazine.fetch_by_id(self.magazine.id).name, "Tech Weekly")
+
+        other.name = "Science Weekly"
+        other.update_to_db().result(timeout=1)
+        self.assertEqual(magazine.update_to_db().result(timeout=1), magazine.id)
+        disable_write_behind()
+        self.assertEqual(Magazine.fetch_by_id(self.magazine.id).name, "Science Now")
+        self.assertEqual(Magazine.write_counters.stats(), {"updates": 2, "columns": 2, "skipped": 0})
+
+    def test_closed_queue_rejects_writes(self):
+        writer = WriteBehindQueue()
+        writer.close()
+        with self.assertRaises(RuntimeError):
+            writer.save(Author(None, "Late Name"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+"""
+Stream authors, magazines and articles to and from CSV or JSON Lines files.
+
+A dump is a directory holding authors, magazines and articles files in one
+format. Rows are streamed in both directions, so memory use does not grow
+with the size of the tables.
+
+Examples, from the repository root:
+
+    python transfer.py export backup --format jsonl
+    python transfer.py import backup --format jsonl
+
+Imports commit one transaction per chunk and record how far they got, so
+re-running an interrupted import resumes after the last committed chunk.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+import database.connection as db
+from database.bulk import DEFAULT_CHUNK_SIZE, chunked, immediate_transaction
+from database.setup import create_tables
+from models.article import Article
+from models.author import Author
+from models.magazine import Magazine
+
+FORMATS = ("csv", "jsonl")
+# Parents first, so foreign keys can be mapped while articles are imported.
+TABLES = ("authors", "magazines", "articles")
+COLUMNS = {
+    "authors": ("id", "name"),
+    "magazines": ("id", "name", "category"),
+    "articles": ("id", "title", "content", "author_id", "magazine_id"),
+}
+
+def dump_path(directory, table, fmt):
+    """
+    Return the file that holds one table of a dump.
+    """
+    return os.path.join(directory, f"{table}.{fmt}")
+
+def export_data(directory, fmt="csv", batch_size=db.DEFAULT_BATCH_SIZE):
+    """
+    Write every author, magazine and article to one file per table.
+
+    All three tables are read inside one transaction, so the files are a
+    consistent snapshot even while other connections write.
+
+    Args:
+        directory (str): The directory to write the files to; created if missing.
+        fmt (str): One of csv, jsonl.
+        batch_size (int): The number of rows fetched from SQLite at a time.
+
+    Returns:
+        dict: A mapping of table name to rows written, seconds and rows per second.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    _check_format(fmt)
+    os.makedirs(directory, exist_ok=True)
+    stats = {}
+    with db.db_connection() as connection:
+        connection.execute("BEGIN")
+        try:
+            for table in TABLES:
+                started = time.perf_counter()
+                rows = db.iter_rows(
+                    f"SELECT {', '.join(COLUMNS[table])} FROM {table} ORDER BY id", batch_size=batch_size
+                )
+                count = _write_rows(dump_path(directory, table, fmt), fmt, COLUMNS[table], rows)
+                stats[table] = _rate(count, time.perf_counter() - started)
+        finally:
+            connection.rollback()
+    return stats
+
+def import_data(directory, fmt="csv", chunk_size=DEFAULT_CHUNK_SIZE, job=None, restart=False, progress=None):
+    """
+    Load a dump written by ``export_data``, one transaction per chunk.
+
+    Authors and magazines are matched by their unique names, so existing
+    rows are reused instead of duplicated. The IDs in the files are mapped
+    to the IDs in this database through ``import_id_map``, and articles are
+    inserted with their mapped author and magazine IDs. Every chunk commits
+    together with its position in ``import_progress``. Running the same job
+    again skips the rows that are already committed.
+
+    Args:
+        directory (str): The directory holding the files.
+        fmt (str): One of csv, jsonl.
+        chunk_size (int): The number of rows written per transaction.
+        job (str): The name the progress is recorded under; defaults to the directory's absolute path.
+        restart (bool): Forget the recorded progress of the job and import every row again.
+        progress (callable): Called as ``progress(table, rows, seconds)`` after each committed chunk.
+
+    Returns:
+        dict: A mapping of table name to rows imported, rows skipped as already
+        imported, seconds and rows per second.
+
+    Raises:
+        ValueError: If the format is not supported or a row is not valid.
+    """
+    _check_format(fmt)
+    job = job or os.path.abspath(directory)
+    with db.db_connection() as connection:
+        with immediate_transaction(connection):
+            if restart:
+                connection.execute("DELETE FROM import_progress WHERE job = ?", (job,))
+                connection.execute("DELETE FROM import_id_map WHERE job = ?", (job,))
+            done = dict(connection.execute(
+                "SELECT table_name, rows FROM import_progress WHERE job = ?", (job,)
+            ).fetchall())
+
+    stats = {}
+    for table in TABLES:
+        path = dump_path(directory, table, fmt)
+        skipped = done.get(table, 0)
+        imported = 0
+        started = time.perf_counter()
+        rows = islice(_read_rows(path, fmt), skipped, None)
+        for chunk in chunked(rows, chunk_size):
+            position = skipped + imported
+            params = [_parse_row(table, row, job, path, position + offset + 1) for offset, row in enumerate(chunk)]
+            _import_chunk(table, params, job, position + len(chunk))
+            imported += len(chunk)
+            if progress is not None:
+                progress(table, imported, time.perf_counter() - started)
+        stats[table] = dict(_rate(imported, time.perf_counter() - started), skipped=skipped)
+    return stats
+
+def _check_format(fmt):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; choose from {', '.join(FORMATS)}.")
+
+def _rate(rows, seconds):
+    return {"rows": rows, "seconds": seconds, "rows_per_sec": rows / seconds if seconds else 0.0}
+
+def _write_rows(path, fmt, columns, rows):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        if fmt == "csv":
+            writer = csv.writer(handle)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(tuple(row))
+                count += 1
+        else:
+            for row in rows:
+                handle.write(json.dumps(dict(zip(columns, row))) + "\n")
+                count += 1
+    return count
+
+def _read_rows(path, fmt):
+    with open(path, newline="", encoding="utf-8") as handle:
+        if fmt == "csv":
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+def _optional_id(value):
+    # CSV writes NULL as an empty field.
+    return None if value in (None, "") else int(value)
+
+def _parse_row(table, row, job, path, line):
+    """
+    Validate one row through its model and return the statement parameters.
+    """
+    try:
+        old_id = int(row["id"])
+        if table == "authors":
+            author = Author(None, row["name"])
+            return (author.name,), (job, old_id, author.name)
+        if table == "magazines":
+            magazine = Magazine(None, row["name"], row["category"])
+            return (magazine.name, magazine.category), (job, old_id, magazine.name)
+        article = Article(
+            None, row["title"], row["content"],
+            _optional_id(row["author_id"]), _optional_id(row["magazine_id"]),
+        )
+        return (article.title, article.content, job, article.author_id, job, article.magazine_id), None
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"{path}, row {line}: {error!r}") from error
+
+_INSERTS = {
+    "authors": "INSERT INTO authors (name) VALUES (?) ON CONFLICT (name) DO NOTHING",
+    "magazines": "INSERT INTO magazines (name, category) VALUES (?, ?) ON CONFLICT (name) DO NOTHING",
+    "articles": """
+        INSERT INTO articles (title, content, author_id, magazine_id) VALUES (
+            ?, ?,
+            (SELECT new_id FROM import_id_map WHERE job = ? AND table_name = 'authors' AND old_id = ?),
+            (SELECT new_id FROM import_id_map WHERE job = ? AND table_name = 'magazines' AND old_id = ?)
+        )
+    """,
+}
+
+def _import_chunk(table, params, job, position):
+    with db.db_connection() as connection:
+        with immediate_transaction(connection):
+            connection.executemany(_INSERTS[table], [insert for insert, _ in params])
+            if table != "articles":
+                connection.executemany(
+                    f"""
+                    INSERT OR REPLACE INTO import_id_map (job, table_name, old_id, new_id)
+                    SELECT ?, '{table}', ?, id FROM {table} WHERE name = ?
+                    """,
+                    [mapping for _, mapping in params],
+                )
+            connection.execute(
+                """
+                INSERT INTO import_progress (job, table_name, rows) VALUES (?, ?, ?)
+                ON CONFLICT (job, table_name) DO UPDATE SET rows = excluded.rows
+                """,
+                (job, table, position),
+            )
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python transfer.py", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("directory", help="the directory holding the dump files")
+    parser.add_argument("--format", default="csv", choices=FORMATS)
+    parser.add_argument("--database", help="use this database file instead of the default one")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"rows per import transaction (default {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--job", help="name of the import to resume (default: the directory's absolute path)")
+    parser.add_argument("--restart", action="store_true", help="ignore the recorded progress of the import")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.database:
+        db.close_pool()
+        db.DATABASE_NAME = args.database
+    create_tables()
+    if args.command == "export":
+        stats = export_data(args.directory, args.format)
+    else:
+        stats = import_data(args.directory, args.format, args.chunk_size, job=args.job, restart=args.restart)
+    for table, result in stats.items():
+        skipped = f", {result['skipped']:,} already imported" if result.get("skipped") else ""
+        print(f"{table:10} {result['rows']:10,} rows in {result['seconds']:.2f}s "
+              f"({result['rows_per_sec']:,.0f} rows/s){skipped}")
+    db.close_pool()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())